@@ -0,0 +1 @@
+# benchmarks - 性能基准测试
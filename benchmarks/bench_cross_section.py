@@ -0,0 +1,42 @@
+import sys
+import time
+import numpy as np
+from src.core.cross_section import CrossSectionEngine
+from src.models.panel import BarPanel
+
+
+def synthetic_panel(n_symbols: int, n_dates: int, dtype, seed: int = 42) -> BarPanel:
+    rng = np.random.default_rng(seed)
+    trade_dates = np.busday_offset("2005-01-03", np.arange(n_dates), roll="forward")
+    returns = rng.normal(0.0003, 0.02, (n_dates, n_symbols)).astype(dtype)
+    marks = np.cumprod(1 + returns, axis=0, dtype=dtype)
+    marks *= rng.uniform(5.0, 50.0, n_symbols).astype(dtype)
+    tradable = rng.random((n_dates, n_symbols)) > 0.02
+    return BarPanel(
+        symbols=[f"{i:06d}" for i in range(n_symbols)],
+        trade_dates=trade_dates.astype("datetime64[D]"),
+        row_index=[],
+        close_prices=np.where(tradable, marks, np.nan).astype(dtype),
+        marks=marks,
+        tradable=tradable
+    )
+
+
+def main(n_symbols: int = 5000, n_dates: int = 4900):
+    print(f"symbols={n_symbols} dates={n_dates}")
+    print(f"{'dtype':<10}{'factor':<16}{'panel MB':>10}{'ms':>10}{'return':>10}")
+    for dtype in (np.float32, np.float64):
+        panel = synthetic_panel(n_symbols, n_dates, dtype)
+        size = (panel.marks.nbytes + panel.close_prices.nbytes + panel.tradable.nbytes) / 2 ** 20
+        engine = CrossSectionEngine(initial_capital=1e8, top_n=50, rebalance="monthly")
+        for factor, params in (("momentum", {"lookback": 120, "skip": 20}), ("low_volatility", {"window": 60})):
+            start = time.perf_counter()
+            result = engine.run(panel, factor, params)
+            elapsed = time.perf_counter() - start
+            name = np.dtype(dtype).name
+            print(f"{name:<10}{factor:<16}{size:>10.0f}{elapsed * 1000:>10.0f}{result.total_return:>10.3f}")
+        del panel
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
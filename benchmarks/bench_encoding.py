@@ -0,0 +1,68 @@
+import gzip
+import json
+import time
+import numpy as np
+from src.api.encoding import brotli, dumps_json, kline_columns, kline_rows, msgpack, trade_columns
+from src.core.engine import BacktestEngine
+from src.models.ohlcv import BarData
+from src.strategy.ma_cross import MACrossStrategy
+
+
+def make_bars(n: int) -> BarData:
+    rng = np.random.default_rng(0)
+    prices = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return BarData.from_arrays(
+        symbol="000001",
+        trade_dates=np.datetime64("2000-01-03") + np.arange(n),
+        open_prices=prices,
+        high_prices=prices * 1.01,
+        low_prices=prices * 0.99,
+        close_prices=prices,
+        volumes=rng.integers(1e5, 1e7, n),
+        turnovers=prices * 1e6
+    )
+
+
+def timed(fn, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        best = min(best, time.perf_counter() - start)
+    return value, best
+
+
+def main(n_bars: int = 2520):
+    data = make_bars(n_bars)
+    result = BacktestEngine().run(data, MACrossStrategy())
+    rows = {
+        "equity_curve": result.equity_curve,
+        "kline": kline_rows(data),
+        "trades": [t.model_dump(mode="json") for t in result.trades],
+    }
+    columnar = {
+        "equity_curve": result.equity_curve,
+        "kline": kline_columns(data),
+        "trades": trade_columns(result.trades),
+    }
+
+    cases = [
+        ("rows/json", lambda: json.dumps(rows).encode()),
+        ("columnar/json", lambda: json.dumps(columnar).encode()),
+        ("columnar/fast-json", lambda: dumps_json(columnar)),
+        ("columnar/fast-json+gzip", lambda: gzip.compress(dumps_json(columnar), compresslevel=1)),
+    ]
+    if brotli is not None:
+        cases.append(("columnar/fast-json+br", lambda: brotli.compress(dumps_json(columnar), quality=4)))
+    if msgpack is not None:
+        cases.append(("columnar/msgpack", lambda: msgpack.packb(columnar, use_bin_type=True)))
+
+    print(f"bars={n_bars} trades={result.total_trades}")
+    print(f"{'format':<26}{'bytes':>12}{'ms':>10}")
+    for name, fn in cases:
+        body, seconds = timed(fn)
+        print(f"{name:<26}{len(body):>12}{seconds * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import sys
+import time
+from datetime import date
+from src.core.engine import BacktestEngine
+from src.data.synthetic import SyntheticProvider, synthetic_symbols
+from src.strategy.ma_cross import MACrossStrategy
+
+
+def main(n_symbols: int = 50, start_date: date = date(2000, 1, 1), end_date: date = date(2024, 12, 31)):
+    provider = SyntheticProvider(seed=42)
+    symbols = synthetic_symbols(n_symbols)
+
+    start = time.perf_counter()
+    universe = [provider.fetch_stock_daily(symbol, start_date, end_date) for symbol in symbols]
+    load_seconds = time.perf_counter() - start
+    n_bars = sum(len(data) for data in universe)
+
+    cases = [
+        ("run", lambda engine, data: engine.run(data, MACrossStrategy())),
+        ("run_vectorized", lambda engine, data: engine.run_vectorized(data, MACrossStrategy())),
+    ]
+    print(f"symbols={n_symbols} bars={n_bars} load={load_seconds * 1000:.0f}ms")
+    print(f"{'path':<18}{'total ms':>12}{'bars/s':>14}")
+    for name, fn in cases:
+        start = time.perf_counter()
+        for data in universe:
+            fn(BacktestEngine(), data)
+        seconds = time.perf_counter() - start
+        print(f"{name:<18}{seconds * 1000:>12.0f}{n_bars / seconds:>14.0f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
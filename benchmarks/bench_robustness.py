@@ -0,0 +1,29 @@
+import sys
+import time
+import numpy as np
+from src.core.robustness import bootstrap_returns, shuffle_trades
+
+
+def main(samples: int = 100000, n_bars: int = 2520, n_trades: int = 300):
+    rng = np.random.default_rng(42)
+    returns = rng.normal(0.0004, 0.012, n_bars)
+    pnls = rng.normal(100.0, 2000.0, n_trades)
+
+    cases = [
+        ("bootstrap_b1", lambda: bootstrap_returns(returns, samples, block_size=1)),
+        ("bootstrap_b5", lambda: bootstrap_returns(returns, samples, block_size=5)),
+        ("bootstrap_b20", lambda: bootstrap_returns(returns, samples, block_size=20)),
+        ("shuffle", lambda: shuffle_trades(pnls, 1000000.0, samples)),
+    ]
+    print(f"samples={samples} bars={n_bars} trades={n_trades}")
+    print(f"{'method':<16}{'ms':>10}{'dd p05':>10}{'dd p95':>10}")
+    for name, fn in cases:
+        start = time.perf_counter()
+        resampled = fn()
+        elapsed = time.perf_counter() - start
+        low, high = np.quantile(resampled["max_drawdown"], [0.05, 0.95])
+        print(f"{name:<16}{elapsed * 1000:>10.0f}{low:>10.3f}{high:>10.3f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,52 @@
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+import numpy as np
+from src.data.bar_store import BarStore, write_bar_store
+from src.data.file_provider import FileProvider
+from src.data.synthetic import SyntheticProvider, synthetic_symbols
+
+
+def main(n_symbols: int = 500, start_date: date = date(2004, 1, 1), end_date: date = date(2024, 12, 31)):
+    provider = SyntheticProvider(seed=42)
+    symbols = synthetic_symbols(n_symbols)
+    universe = [provider.fetch_stock_daily(symbol, start_date, end_date) for symbol in symbols]
+    n_bars = sum(len(data) for data in universe)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        start = time.perf_counter()
+        write_bar_store(tmp / "store", universe)
+        write_seconds = time.perf_counter() - start
+        for data in universe:
+            np.savez(
+                tmp / f"{data.symbol}.npz",
+                date=data.trade_dates,
+                open=data.open_prices,
+                high=data.high_prices,
+                low=data.low_prices,
+                close=data.close_prices,
+                volume=data.volumes,
+                turnover=data.turnovers
+            )
+
+        cases = [
+            ("bar_store", lambda: BarStore(tmp / "store").load_universe(symbols, start_date, end_date)),
+            ("npz_files", lambda: [
+                FileProvider(tmp).fetch_stock_daily(symbol, start_date, end_date) for symbol in symbols
+            ]),
+        ]
+        print(f"symbols={n_symbols} bars={n_bars} store_write={write_seconds * 1000:.0f}ms")
+        print(f"{'source':<12}{'load ms':>10}{'close sum':>16}")
+        for name, fn in cases:
+            start = time.perf_counter()
+            loaded = fn()
+            # 触碰全部收盘价, 计入内存映射的实际读盘时间
+            total = sum(float(data.close_prices.sum()) for data in loaded)
+            print(f"{name:<12}{(time.perf_counter() - start) * 1000:>10.0f}{total:>16.1f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -42,6 +42,10 @@ export interface BacktestResult {
     max_drawdown: number
     win_rate: number
     profit_loss_ratio: number
+    sortino_ratio?: number
+    calmar_ratio?: number
+    max_drawdown_duration?: number
+    exposure?: number
   }
   equity_curve: number[]
   kline: OHLCV[]
@@ -0,0 +1,136 @@
+import gzip
+import json
+from typing import Any, Optional
+from fastapi import HTTPException
+from fastapi.responses import Response
+from src.core.downsample import aggregate_ohlc
+from src.models.ohlcv import BarData
+from src.models.result import TradeRecord
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+MIN_COMPRESS_BYTES = 1024
+
+
+def kline_rows(data: BarData) -> list[dict]:
+    return [
+        {
+            "date": str(trade_date),
+            "open": open_price,
+            "high": high_price,
+            "low": low_price,
+            "close": close_price,
+            "volume": volume
+        }
+        for trade_date, open_price, high_price, low_price, close_price, volume in zip(
+            data.trade_dates.tolist(),
+            data.open_prices.tolist(),
+            data.high_prices.tolist(),
+            data.low_prices.tolist(),
+            data.close_prices.tolist(),
+            data.volumes.tolist()
+        )
+    ]
+
+
+def kline_columns(data: BarData) -> dict[str, list]:
+    return {
+        "date": data.trade_dates.astype(str).tolist(),
+        "open": data.open_prices.tolist(),
+        "high": data.high_prices.tolist(),
+        "low": data.low_prices.tolist(),
+        "close": data.close_prices.tolist(),
+        "volume": data.volumes.tolist()
+    }
+
+
+def kline_buckets(data: BarData, max_points: int) -> dict[str, list]:
+    buckets = aggregate_ohlc(
+        data.open_prices,
+        data.high_prices,
+        data.low_prices,
+        data.close_prices,
+        data.volumes,
+        max_points
+    )
+    return {
+        "index": buckets["index"].tolist(),
+        "date": data.trade_dates[buckets["index"]].astype(str).tolist(),
+        "open": buckets["open"].tolist(),
+        "high": buckets["high"].tolist(),
+        "low": buckets["low"].tolist(),
+        "close": buckets["close"].tolist(),
+        "volume": buckets["volume"].tolist()
+    }
+
+
+def columns_to_rows(columns: dict[str, list]) -> list[dict]:
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def trade_columns(trades: list[TradeRecord]) -> dict[str, list]:
+    columns: dict[str, list] = {name: [] for name in TradeRecord.model_fields}
+    for trade in trades:
+        for name, value in trade.model_dump(mode="json").items():
+            columns[name].append(value)
+    return columns
+
+
+def dumps_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+def _negotiate_media_type(accept: str) -> str:
+    for media_type in MSGPACK_MEDIA_TYPES:
+        if media_type in accept:
+            if msgpack is None:
+                raise HTTPException(status_code=406, detail="msgpack 编码不可用, 请安装 msgpack")
+            return media_type
+    return JSON_MEDIA_TYPE
+
+
+def _negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    encodings = {part.split(";")[0].strip() for part in accept_encoding.split(",")}
+    if "br" in encodings and brotli is not None:
+        return "br"
+    if "gzip" in encodings:
+        return "gzip"
+    return None
+
+
+def encode_response(payload: Any, accept: str = "", accept_encoding: str = "") -> Response:
+    media_type = _negotiate_media_type(accept)
+    if media_type == JSON_MEDIA_TYPE:
+        body = dumps_json(payload)
+    else:
+        body = msgpack.packb(payload, use_bin_type=True, default=str)
+
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    content_encoding = _negotiate_encoding(accept_encoding) if len(body) >= MIN_COMPRESS_BYTES else None
+    if content_encoding == "br":
+        body = brotli.compress(body, quality=4)
+    elif content_encoding == "gzip":
+        body = gzip.compress(body, compresslevel=1)
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+
+    return Response(content=body, media_type=media_type, headers=headers)
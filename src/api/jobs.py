@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Optional
+from pydantic import BaseModel, Field
+from src.core.sweep import process_context
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobInfo(BaseModel):
+    job_id: str = Field(..., description="任务ID")
+    status: JobStatus = Field(..., description="任务状态")
+    submitted_at: datetime = Field(..., description="提交时间")
+    finished_at: Optional[datetime] = Field(None, description="完成时间")
+    result: Optional[Any] = Field(None, description="任务结果")
+    error: Optional[str] = Field(None, description="错误信息")
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class _Job:
+    __slots__ = ("job_id", "future", "submitted_at", "finished_at", "expires_at")
+
+    def __init__(self, job_id: str, future: Future):
+        self.job_id = job_id
+        self.future = future
+        self.submitted_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.expires_at: Optional[float] = None
+
+
+class JobManager:
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_pending: int = 32,
+        result_ttl: float = 600.0,
+        executor: str = "thread",
+        max_finished: int = 256
+    ):
+        if executor == "process":
+            # 服务端是多线程的, 工作进程与参数扫描一样由 forkserver 启动, 不直接 fork
+            self._executor: Executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=process_context())
+        elif executor == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="backtest")
+        else:
+            raise ValueError(f"Unknown executor: {executor}")
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.max_finished = max_finished
+        self._jobs: dict[str, _Job] = {}
+        # 已完成任务按完成先后排列, 超出数量上限时先丢弃最早完成的结果
+        self._finished: OrderedDict[str, None] = OrderedDict()
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        if self._active >= self.max_workers + self.max_pending:
+            raise JobQueueFull(f"回测任务队列已满({self._active}个任务未完成)")
+        self._active += 1
+
+    def acquire(self) -> Callable[[], None]:
+        # 不经过任务池的长时间计算(如流式回测)也占用一个名额, 返回的 release 可重复调用
+        with self._lock:
+            self._purge_expired()
+            self._reserve()
+        released = threading.Event()
+
+        def release():
+            with self._lock:
+                if not released.is_set():
+                    released.set()
+                    self._active -= 1
+        return release
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> str:
+        with self._lock:
+            self._purge_expired()
+            self._reserve()
+            job_id = uuid.uuid4().hex
+            future = self._executor.submit(fn, *args)
+            job = _Job(job_id, future)
+            self._jobs[job_id] = job
+        future.add_done_callback(lambda _: self._on_done(job))
+        return job_id
+
+    def _on_done(self, job: _Job):
+        with self._lock:
+            self._active -= 1
+            job.finished_at = datetime.now()
+            job.expires_at = time.monotonic() + self.result_ttl
+            self._finished[job.job_id] = None
+            self._purge_expired()
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        while self._finished:
+            job_id = next(iter(self._finished))
+            if len(self._finished) <= self.max_finished and self._jobs[job_id].expires_at > now:
+                break
+            del self._finished[job_id]
+            del self._jobs[job_id]
+
+    def discard(self, job_id: str):
+        # 结果已交给调用方且之后不会再查询时, 立即释放
+        with self._lock:
+            if job_id in self._finished:
+                del self._finished[job_id]
+                del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[JobInfo]:
+        with self._lock:
+            self._purge_expired()
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        return self._info(job)
+
+    def result(self, job_id: str) -> Any:
+        with self._lock:
+            self._purge_expired()
+            job = self._jobs.get(job_id)
+        if job is None or not job.future.done():
+            return None
+        return job.future.result()
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[JobInfo]:
+        with self._lock:
+            self._purge_expired()
+            job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        try:
+            await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(job.future)), timeout)
+        except Exception:
+            # 超时或任务失败都通过任务状态返回
+            pass
+        return self._info(job)
+
+    def _info(self, job: _Job) -> JobInfo:
+        future = job.future
+        if not future.done():
+            status = JobStatus.RUNNING if future.running() else JobStatus.PENDING
+            return JobInfo(job_id=job.job_id, status=status, submitted_at=job.submitted_at)
+
+        error = future.exception()
+        return JobInfo(
+            job_id=job.job_id,
+            status=JobStatus.FAILED if error else JobStatus.SUCCEEDED,
+            submitted_at=job.submitted_at,
+            finished_at=job.finished_at or datetime.now(),
+            result=None if error else future.result(),
+            error=str(error) if error else None
+        )
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
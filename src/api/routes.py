@@ -1,18 +1,68 @@
-from fastapi import APIRouter, HTTPException
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Iterator, Literal, Optional
 from datetime import date
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+import json
 import logging
+import numpy as np
 
-from src.data.akshare_provider import AkshareProvider
-from src.strategy.ma_cross import MACrossStrategy
-from src.strategy.rsi import RSIStrategy
+from src.api.encoding import (
+    MSGPACK_MEDIA_TYPES,
+    columns_to_rows,
+    encode_response,
+    kline_buckets,
+    kline_columns,
+    kline_rows,
+    trade_columns,
+)
+from src.api.jobs import JobManager, JobQueueFull, JobStatus
+from src.config import settings
+from src.data.bulk import BulkLoader
+from src.data.coalescing import CoalescingProvider
+from src.data.factory import create_data_provider
+from src.models.ohlcv import BarData
+from src.models.result import BacktestResult
+from src.strategy.base import Strategy
+from src.strategy.registry import create_strategy
+from src.core.cross_section import CrossSectionEngine
+from src.core.checkpoint import CheckpointStore, checkpoint_key
+from src.core.downsample import lttb_indices
 from src.core.engine import BacktestEngine
+from src.core.portfolio import PortfolioEngine
+from src.core.result_cache import ResultCache, result_cache_key
+from src.core.robustness import analyze_robustness
+from src.core.sweep import run_sweep
+from src.core.walk_forward import run_walk_forward
 
 logger = logging.getLogger(__name__)
 
+FULL_RESOLUTION_KEY = "full_resolution"
+
 router = APIRouter()
-data_provider = AkshareProvider()
+data_provider = CoalescingProvider(
+    create_data_provider(settings),
+    max_bytes=settings.bar_memory_cache_bytes,
+    ttl=settings.bar_memory_cache_ttl
+)
+job_manager = JobManager(
+    max_workers=settings.job_workers,
+    max_pending=settings.job_max_pending,
+    result_ttl=settings.job_result_ttl,
+    executor=settings.job_executor,
+    max_finished=settings.job_max_finished
+)
+result_cache = ResultCache(
+    settings.result_cache_dir or None,
+    max_entries=settings.result_cache_entries,
+    max_disk_bytes=settings.result_cache_bytes
+)
+checkpoint_store = CheckpointStore(
+    settings.checkpoint_dir or None,
+    max_entries=settings.checkpoint_entries,
+    max_disk_bytes=settings.checkpoint_bytes
+)
 
 
 class BacktestRequest(BaseModel):
@@ -24,6 +74,67 @@ class BacktestRequest(BaseModel):
     fee_rate: float = 0.0003
     adjustment: str = "qfq"
     params: Optional[dict] = None
+    layout: Literal["rows", "columnar"] = "rows"
+    max_points: Optional[int] = Field(None, ge=3)
+    robustness: bool = False
+    robustness_method: Literal["bootstrap", "shuffle"] = "bootstrap"
+    robustness_samples: int = Field(10000, ge=100, le=100000)
+
+
+class SweepRequest(BaseModel):
+    symbol: str
+    strategy: str
+    start_date: date
+    end_date: date
+    param_grid: dict[str, list]
+    initial_capital: float = 100000.0
+    fee_rate: float = 0.0003
+    adjustment: str = "qfq"
+    sort_by: str = "sharpe_ratio"
+    top_n: Optional[int] = 20
+    max_workers: Optional[int] = Field(None, gt=0)
+
+
+class WalkForwardRequest(BaseModel):
+    symbol: str
+    strategy: str
+    start_date: date
+    end_date: date
+    param_grid: dict[str, list]
+    train_bars: int = Field(250, gt=0)
+    test_bars: int = Field(60, gt=0)
+    anchored: bool = False
+    initial_capital: float = 100000.0
+    fee_rate: float = 0.0003
+    adjustment: str = "qfq"
+    sort_by: str = "sharpe_ratio"
+    max_workers: Optional[int] = Field(None, gt=0)
+
+
+class PortfolioBacktestRequest(BaseModel):
+    symbols: list[str]
+    strategy: str
+    start_date: date
+    end_date: date
+    initial_capital: float = 100000.0
+    fee_rate: float = 0.0003
+    adjustment: str = "qfq"
+    params: Optional[dict] = None
+    max_position_weight: Optional[float] = None
+
+
+class CrossSectionRequest(BaseModel):
+    symbols: list[str]
+    factor: str
+    start_date: date
+    end_date: date
+    factor_params: Optional[dict] = None
+    top_n: int = Field(10, gt=0)
+    rebalance: str | int = "monthly"
+    dtype: Literal["float32", "float64"] = "float64"
+    initial_capital: float = 1000000.0
+    fee_rate: float = 0.0003
+    adjustment: str = "qfq"
 
 
 class BacktestResponse(BaseModel):
@@ -42,85 +153,379 @@ async def list_strategies():
     }
 
 
+def execute_backtest(request: BacktestRequest) -> dict:
+    data = data_provider.fetch_stock_daily(
+        symbol=request.symbol,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        adjustment=request.adjustment
+    )
+    strategy = create_strategy(request.strategy, request.params)
+    
+    engine = BacktestEngine(
+        initial_capital=request.initial_capital,
+        fee_rate=request.fee_rate
+    )
+    
+    key = result_cache_key(data, strategy, **engine.config)
+    result = result_cache.get_or_run(key, lambda: run_incremental(engine, data, strategy))
+    
+    columnar = request.layout == "columnar"
+    kline_data = kline_columns(data) if columnar else kline_rows(data)
+    trades = (
+        trade_columns(result.trades) if columnar
+        else [t.model_dump() for t in result.trades]
+    )
+    
+    equity = np.asarray(result.equity_curve)
+    payload = {
+        "symbol": result.symbol,
+        "strategy_name": result.strategy_name,
+        "start_date": str(result.start_date),
+        "end_date": str(result.end_date),
+        "initial_capital": result.initial_capital,
+        "final_value": result.final_value,
+        "total_return": result.total_return,
+        "total_trades": result.total_trades,
+        "win_rate": result.win_rate,
+        "sharpe_ratio": result.sharpe_ratio,
+        "max_drawdown": result.max_drawdown,
+        "metrics": result.metrics.model_dump(),
+        "equity_curve": result.equity_curve,
+        "kline": kline_data,
+        "trades": trades
+    }
+    if request.robustness and request.robustness_method == "shuffle" and not result.trades:
+        # 没有成交时无从重排, 不做稳健性分析, 回测本身照常返回
+        payload["robustness"] = None
+    elif request.robustness:
+        payload["robustness"] = analyze_robustness(
+            result,
+            method=request.robustness_method,
+            samples=request.robustness_samples
+        ).model_dump()
+    if request.max_points and len(data) > request.max_points:
+        payload.update(downsample_series(data, equity, request.max_points, columnar))
+        payload["downsampled"] = True
+        payload[FULL_RESOLUTION_KEY] = {"data": data, "equity_curve": equity}
+    return payload
+
+
+def run_incremental(engine: BacktestEngine, data: BarData, strategy: Strategy) -> BacktestResult:
+    # 同一起点的回测窗口向后延长时, 从上次的检查点续跑, 只处理新增K线
+    key = checkpoint_key(data, strategy, **engine.config)
+    result = engine.run(data, strategy, resume=checkpoint_store.find(key, data), checkpoint=True)
+    checkpoint_store.put(key, engine.last_checkpoint)
+    return result
+
+
+def downsample_series(data: BarData, equity: np.ndarray, max_points: int, columnar: bool) -> dict:
+    equity_index = lttb_indices(equity, max_points)
+    kline = kline_buckets(data, max_points)
+    return {
+        "equity_curve": equity[equity_index].tolist(),
+        "equity_index": equity_index.tolist(),
+        "kline": kline if columnar else columns_to_rows(kline)
+    }
+
+
+def public_result(result):
+    if isinstance(result, dict) and FULL_RESOLUTION_KEY in result:
+        return {k: v for k, v in result.items() if k != FULL_RESOLUTION_KEY}
+    return result
+
+
+def execute_portfolio_backtest(request: PortfolioBacktestRequest) -> dict:
+    fetched = BulkLoader(
+        data_provider,
+        max_workers=settings.bulk_workers,
+        rate=settings.bulk_rate
+    ).fetch_many(request.symbols, request.start_date, request.end_date, request.adjustment)
+    universe = [data for data in fetched.data.values() if len(data)]
+    if not universe:
+        raise ValueError(f"所有股票数据获取失败: {fetched.errors}")
+    
+    engine = PortfolioEngine(
+        initial_capital=request.initial_capital,
+        fee_rate=request.fee_rate,
+        max_position_weight=request.max_position_weight
+    )
+    result = engine.run(universe, create_strategy(request.strategy, request.params))
+    return {**result.model_dump(mode="json"), "fetch_errors": fetched.errors}
+
+
+def execute_cross_section(request: CrossSectionRequest) -> dict:
+    fetched = BulkLoader(
+        data_provider,
+        max_workers=settings.bulk_workers,
+        rate=settings.bulk_rate
+    ).fetch_many(request.symbols, request.start_date, request.end_date, request.adjustment)
+    universe = [data for data in fetched.data.values() if len(data)]
+    if not universe:
+        raise ValueError(f"所有股票数据获取失败: {fetched.errors}")
+    
+    engine = CrossSectionEngine(
+        initial_capital=request.initial_capital,
+        fee_rate=request.fee_rate,
+        top_n=request.top_n,
+        rebalance=request.rebalance
+    )
+    result = engine.run(universe, request.factor, request.factor_params, dtype=np.dtype(request.dtype))
+    return {**result.model_dump(mode="json"), "fetch_errors": fetched.errors}
+
+
+def execute_sweep(request: SweepRequest) -> dict:
+    data = data_provider.fetch_stock_daily(
+        symbol=request.symbol,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        adjustment=request.adjustment
+    )
+    results = run_sweep(
+        data,
+        request.strategy,
+        request.param_grid,
+        initial_capital=request.initial_capital,
+        fee_rate=request.fee_rate,
+        sort_by=request.sort_by,
+        top_n=request.top_n,
+        max_workers=sweep_workers(request.max_workers)
+    )
+    return {
+        "symbol": request.symbol,
+        "strategy_name": request.strategy,
+        "sort_by": request.sort_by,
+        "results": [r.model_dump() for r in results]
+    }
+
+
+def sweep_workers(requested: Optional[int]) -> int:
+    # 客户端指定的进程数不能超过服务端配置的上限
+    return min(requested or settings.sweep_workers, settings.sweep_workers)
+
+
+def execute_walk_forward(request: WalkForwardRequest) -> dict:
+    data = data_provider.fetch_stock_daily(
+        symbol=request.symbol,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        adjustment=request.adjustment
+    )
+    result = run_walk_forward(
+        data,
+        request.strategy,
+        request.param_grid,
+        train_bars=request.train_bars,
+        test_bars=request.test_bars,
+        anchored=request.anchored,
+        initial_capital=request.initial_capital,
+        fee_rate=request.fee_rate,
+        sort_by=request.sort_by,
+        max_workers=sweep_workers(request.max_workers)
+    )
+    return result.model_dump(mode="json")
+
+
+def _submit_job(fn, request: BaseModel) -> str:
+    try:
+        return job_manager.submit(fn, request)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+
+async def _run_job(fn, request: BaseModel, label: str) -> BacktestResponse:
+    job_id = _submit_job(fn, request)
+    info = await job_manager.wait(job_id)
+    if info.status == JobStatus.FAILED:
+        logger.error(f"{label} failed: {info.error}")
+        return BacktestResponse(success=False, error=info.error)
+    if isinstance(info.result, dict) and FULL_RESOLUTION_KEY in info.result:
+        # 降采样的结果保留到过期, 供 /series 按需查询完整序列
+        return BacktestResponse(success=True, result={**public_result(info.result), "job_id": job_id})
+    job_manager.discard(job_id)
+    return BacktestResponse(success=True, result=info.result)
+
+
 @router.post("/backtest", response_model=BacktestResponse)
-async def run_backtest(request: BacktestRequest):
+async def run_backtest(request: BacktestRequest, http_request: Request):
+    response = await _run_job(execute_backtest, request, "Backtest")
+    accept = http_request.headers.get("accept", "")
+    if request.layout == "columnar" or any(t in accept for t in MSGPACK_MEDIA_TYPES):
+        return encode_response(
+            response.model_dump(),
+            accept=accept,
+            accept_encoding=http_request.headers.get("accept-encoding", "")
+        )
+    return response
+
+
+@router.post("/backtest/jobs", status_code=202)
+async def submit_backtest_job(request: BacktestRequest):
+    job_id = _submit_job(execute_backtest, request)
+    return job_manager.get(job_id)
+
+
+@router.get("/backtest/jobs/{job_id}")
+async def get_backtest_job(job_id: str):
+    info = job_manager.get(job_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    info.result = public_result(info.result)
+    return info
+
+
+@router.get("/backtest/jobs/{job_id}/wait")
+async def wait_backtest_job(job_id: str, timeout: float = 30.0):
+    info = await job_manager.wait(job_id, timeout=timeout)
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    info.result = public_result(info.result)
+    return info
+
+
+@router.get("/backtest/jobs/{job_id}/series")
+async def get_backtest_series(
+    job_id: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    max_points: Optional[int] = Query(None, ge=3),
+    layout: Literal["rows", "columnar"] = "columnar"
+):
+    result = job_manager.result(job_id)
+    if not isinstance(result, dict):
+        raise HTTPException(status_code=404, detail=f"Job result not found: {job_id}")
+    
+    full = result.get(FULL_RESOLUTION_KEY)
+    if full is None:
+        return {"equity_curve": result["equity_curve"], "kline": result["kline"]}
+    
+    data, equity = full["data"], full["equity_curve"]
+    end = len(data) if end is None else min(end, len(data))
+    start = max(0, min(start, end))
+    window = data[start:end]
+    # 资金曲线比K线多一个初始资金点, 第i根K线对应资金曲线第i+1个值
+    window_equity = equity[start + 1:end + 1]
+    if max_points and len(window) > max_points:
+        series = downsample_series(window, window_equity, max_points, layout == "columnar")
+        series["equity_index"] = [i + start + 1 for i in series["equity_index"]]
+        series["kline"] = _offset_kline(series["kline"], start)
+        return series
+    
+    kline = kline_columns(window)
+    kline["index"] = list(range(start, end))
+    return {
+        "equity_curve": window_equity.tolist(),
+        "equity_index": list(range(start + 1, end + 1)),
+        "kline": kline if layout == "columnar" else columns_to_rows(kline)
+    }
+
+
+def _offset_kline(kline, offset: int):
+    if isinstance(kline, dict):
+        return {**kline, "index": [i + offset for i in kline["index"]]}
+    return [{**row, "index": row["index"] + offset} for row in kline]
+
+
+def stream_backtest(request: BacktestRequest, chunk_size: int) -> Iterator[dict]:
     try:
+        yield {"type": "progress", "stage": "fetching"}
         data = data_provider.fetch_stock_daily(
             symbol=request.symbol,
             start_date=request.start_date,
             end_date=request.end_date,
             adjustment=request.adjustment
         )
+        strategy = create_strategy(request.strategy, request.params)
+        yield {"type": "progress", "stage": "running", "total_bars": len(data)}
         
-        if request.strategy == "ma_cross":
-            params = request.params or {}
-            strategy = MACrossStrategy(
-                short_window=params.get("short_window", 5),
-                long_window=params.get("long_window", 20),
-                position_ratio=params.get("position_ratio", 1.0)
-            )
-        elif request.strategy == "rsi":
-            params = request.params or {}
-            strategy = RSIStrategy(
-                period=params.get("period", 14),
-                oversold=params.get("oversold", 30.0),
-                overbought=params.get("overbought", 70.0),
-                position_ratio=params.get("position_ratio", 1.0)
-            )
-        else:
-            raise HTTPException(status_code=400, detail=f"Unknown strategy: {request.strategy}")
+        for offset in range(0, len(data), chunk_size):
+            yield {"type": "kline", "offset": offset, **kline_columns(data[offset:offset + chunk_size])}
         
         engine = BacktestEngine(
             initial_capital=request.initial_capital,
             fee_rate=request.fee_rate
         )
-        
-        result = engine.run(data, strategy)
-        
-        kline_data = [
-            {
-                "date": str(bar.trade_date),
-                "open": bar.open_price,
-                "high": bar.high_price,
-                "low": bar.low_price,
-                "close": bar.close_price,
-                "volume": bar.volume
-            }
-            for bar in data.bars
-        ]
-        
-        return BacktestResponse(
-            success=True,
-            result={
-                "symbol": result.symbol,
-                "strategy_name": result.strategy_name,
-                "start_date": str(result.start_date),
-                "end_date": str(result.end_date),
-                "initial_capital": result.initial_capital,
-                "final_value": result.final_value,
-                "total_return": result.total_return,
-                "total_trades": result.total_trades,
-                "win_rate": result.win_rate,
-                "sharpe_ratio": result.sharpe_ratio,
-                "max_drawdown": result.max_drawdown,
-                "metrics": result.metrics.model_dump(),
-                "equity_curve": result.equity_curve,
-                "kline": kline_data,
-                "trades": [t.model_dump() for t in result.trades]
-            }
-        )
+        for kind, payload in engine.iter_run(data, strategy, chunk_size=chunk_size):
+            if kind == "equity":
+                yield {"type": "equity", **payload}
+            elif kind == "trades":
+                yield {"type": "trades", "trades": [t.model_dump(mode="json") for t in payload]}
+            elif kind == "progress":
+                yield {"type": "progress", "stage": "running", **payload}
+            elif kind == "result":
+                yield {
+                    "type": "result",
+                    "symbol": payload.symbol,
+                    "strategy_name": payload.strategy_name,
+                    "start_date": str(payload.start_date),
+                    "end_date": str(payload.end_date),
+                    "initial_capital": payload.initial_capital,
+                    "final_value": payload.final_value,
+                    "total_return": payload.total_return,
+                    "total_trades": payload.total_trades,
+                    "win_rate": payload.win_rate,
+                    "sharpe_ratio": payload.sharpe_ratio,
+                    "max_drawdown": payload.max_drawdown,
+                    "metrics": payload.metrics.model_dump()
+                }
     except Exception as e:
-        logger.error(f"Backtest failed: {e}")
-        return BacktestResponse(success=False, error=str(e))
+        logger.error(f"Streaming backtest failed: {e}")
+        yield {"type": "error", "error": str(e)}
+
+
+@router.post("/backtest/stream")
+def run_backtest_stream(request: BacktestRequest, http_request: Request, chunk_size: int = 500):
+    chunk_size = max(1, chunk_size)
+    # 流式回测在请求线程中计算, 与后台任务共用同一组名额, 队列满时返回 429
+    try:
+        release = job_manager.acquire()
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    frames = _holding_slot(stream_backtest(request, chunk_size), release)
+    if "text/event-stream" in http_request.headers.get("accept", ""):
+        body = (f"event: {frame['type']}\ndata: {json.dumps(frame)}\n\n" for frame in frames)
+        media_type = "text/event-stream"
+    else:
+        body = (json.dumps(frame) + "\n" for frame in frames)
+        media_type = "application/x-ndjson"
+    # 客户端中途断开时生成器可能未启动, 响应结束后再释放一次名额兜底
+    return StreamingResponse(body, media_type=media_type, background=BackgroundTask(release))
+
+
+def _holding_slot(frames: Iterator[dict], release) -> Iterator[dict]:
+    try:
+        yield from frames
+    finally:
+        release()
+
+
+@router.post("/portfolio/backtest", response_model=BacktestResponse)
+async def run_portfolio_backtest(request: PortfolioBacktestRequest):
+    return await _run_job(execute_portfolio_backtest, request, "Portfolio backtest")
+
+
+@router.post("/cross-section/backtest", response_model=BacktestResponse)
+async def run_cross_section_backtest(request: CrossSectionRequest):
+    return await _run_job(execute_cross_section, request, "Cross-section backtest")
+
+
+@router.post("/sweep", response_model=BacktestResponse)
+async def run_parameter_sweep(request: SweepRequest):
+    return await _run_job(execute_sweep, request, "Sweep")
+
+
+@router.post("/walk-forward", response_model=BacktestResponse)
+async def run_walk_forward_analysis(request: WalkForwardRequest):
+    return await _run_job(execute_walk_forward, request, "Walk-forward")
 
 
 @router.get("/stock/{symbol}")
-async def get_stock_info(symbol: str):
+def get_stock_info(symbol: str):
     info = data_provider.get_stock_info(symbol)
     return info
 
 
 @router.get("/stocks/search")
-async def search_stocks(keyword: str):
+def search_stocks(keyword: str):
     results = data_provider.search_stocks(keyword)
     return {"results": results}
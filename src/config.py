@@ -0,0 +1,35 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    data_source: str = "akshare"
+    data_dir: str = "data"
+    synthetic_seed: int = 0
+    initial_capital: float = 100000.0
+    fee_rate: float = 0.0003
+    default_adjustment: str = "qfq"
+    log_level: str = "INFO"
+    bar_cache_dir: str = ".cache/bars"
+    security_master_refresh: float = 86400.0
+    adjustment_factor_refresh: float = 86400.0
+    bar_memory_cache_bytes: int = 64 * 1024 * 1024
+    bar_memory_cache_ttl: float = 60.0
+    bulk_workers: int = 8
+    bulk_rate: float = 5.0
+    job_workers: int = 4
+    job_max_pending: int = 32
+    job_result_ttl: float = 600.0
+    job_max_finished: int = 256
+    job_executor: str = "thread"
+    sweep_workers: int = 4
+    result_cache_dir: str = ".cache/results"
+    result_cache_entries: int = 256
+    result_cache_bytes: int = 512 * 1024 * 1024
+    checkpoint_dir: str = ".cache/checkpoints"
+    checkpoint_entries: int = 64
+    checkpoint_bytes: int = 256 * 1024 * 1024
+
+
+settings = Settings()
@@ -0,0 +1,75 @@
+import hashlib
+import json
+from datetime import date
+from typing import Any, Optional, Union
+from pydantic import BaseModel, Field
+from src.core.result_cache import ResultCache
+from src.models.ohlcv import BarData
+from src.strategy.base import Strategy
+
+# 引擎状态结构变化时递增, 旧检查点自动失效
+CHECKPOINT_VERSION = 2
+
+LotState = tuple[float, int, date, Optional[str], float]
+ClosedLotState = tuple[
+    str, date, float, date, float, int, float, float, float, float,
+    Optional[str], list[Union[str, int, float]]
+]
+
+
+class LedgerState(BaseModel):
+    positions: dict[str, list[LotState]] = Field(default_factory=dict, description="各股票未平仓批次")
+    cost_basis: dict[str, float] = Field(default_factory=dict, description="各股票持仓成本")
+    closed: list[ClosedLotState] = Field(default_factory=list, description="已平仓明细")
+
+
+class EngineCheckpoint(BaseModel):
+    key: str = Field(..., description="检查点键")
+    bars: int = Field(..., description="已处理K线数量")
+    data_fingerprint: str = Field(..., description="已处理K线的内容指纹")
+    last_date: date = Field(..., description="最后处理的交易日")
+    cash: float = Field(..., description="现金")
+    total_commission: float = Field(..., description="累计手续费")
+    equity_curve: list[float] = Field(..., description="资金曲线")
+    ledger: LedgerState = Field(..., description="持仓账本")
+    metrics: dict[str, Union[int, float]] = Field(..., description="指标累加器状态")
+
+
+def checkpoint_key(data: BarData, strategy: Strategy, **engine_config: Any) -> str:
+    # 不含结束日期: 同一起点、同一策略和引擎配置的回测共享检查点, 窗口向后延长时从检查点续跑
+    payload = json.dumps(
+        {
+            "version": CHECKPOINT_VERSION,
+            "symbol": data.symbol,
+            "adjustment": data.adjustment,
+            "start": str(data.trade_dates[0]) if len(data) else None,
+            "strategy": [type(strategy).__name__, strategy.name, strategy.params],
+            "engine": engine_config,
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class CheckpointStore(ResultCache):
+    model = EngineCheckpoint
+
+    def put(self, key: str, result: EngineCheckpoint):
+        # 键不含结束日期, 较早结束日期的请求不覆盖已有的更长检查点
+        with self._lock:
+            existing = self._entries.get(key)
+        if existing is None:
+            existing = self._load(key)
+        if existing is not None and existing.bars > result.bars:
+            return
+        super().put(key, result)
+
+    def find(self, key: str, data: BarData) -> Optional[EngineCheckpoint]:
+        # 已处理部分的K线必须完全一致; 复权因子更新等导致历史变化时放弃检查点, 完整重跑
+        checkpoint = self.get(key)
+        if checkpoint is None or checkpoint.bars > len(data):
+            return None
+        if data[:checkpoint.bars].fingerprint != checkpoint.data_fingerprint:
+            return None
+        return checkpoint
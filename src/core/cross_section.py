@@ -0,0 +1,126 @@
+from datetime import date
+from typing import Any, Iterable, Optional, Union
+import numpy as np
+from src.core.metrics import MetricsAccumulator
+from src.models.ohlcv import BarData
+from src.models.panel import BarPanel
+from src.models.result import CrossSectionResult, RebalanceRecord
+from src.strategy.factors import FACTORS, rank_cross_section
+
+REBALANCE_PERIODS = {"daily": "D", "weekly": "W", "monthly": "M", "quarterly": "Q"}
+
+
+def rebalance_rows(trade_dates: np.ndarray, frequency: Union[str, int]) -> np.ndarray:
+    # 每个周期的第一个交易日调仓; 整数表示每隔 N 根K线调仓
+    if isinstance(frequency, int):
+        if frequency <= 0:
+            raise ValueError("调仓间隔必须大于0")
+        return np.arange(0, len(trade_dates), frequency)
+    if frequency not in REBALANCE_PERIODS:
+        raise ValueError(f"Unknown rebalance frequency: {frequency}")
+    if frequency == "quarterly":
+        months = trade_dates.astype("datetime64[M]").astype(np.int64)
+        periods = months // 3
+    elif frequency == "weekly":
+        # 以周一为界: 1970-01-01 为周四
+        periods = (trade_dates.astype("datetime64[D]").astype(np.int64) + 3) // 7
+    else:
+        periods = trade_dates.astype(f"datetime64[{REBALANCE_PERIODS[frequency]}]").astype(np.int64)
+    return np.flatnonzero(np.diff(periods, prepend=periods[0] - 1))
+
+
+class CrossSectionEngine:
+    def __init__(
+        self,
+        initial_capital: float = 1000000.0,
+        fee_rate: float = 0.0003,
+        top_n: int = 10,
+        rebalance: Union[str, int] = "monthly",
+        lot_size: int = 100
+    ):
+        self.initial_capital = initial_capital
+        self.fee_rate = fee_rate
+        self.top_n = top_n
+        self.rebalance = rebalance
+        self.lot_size = lot_size
+
+    def run(
+        self,
+        universe: Union[BarPanel, dict[str, BarData], Iterable[BarData]],
+        factor: str,
+        factor_params: Optional[dict[str, Any]] = None,
+        dtype=np.float64
+    ) -> CrossSectionResult:
+        if factor not in FACTORS:
+            raise ValueError(f"Unknown factor: {factor}")
+        factor_params = factor_params or {}
+        # 全市场长周期时可用 float32 存放价格矩阵, 资金和持仓仍按 float64 计算
+        panel = universe if isinstance(universe, BarPanel) else BarPanel.from_bars(universe, dtype=dtype)
+        marks, tradable = panel.marks, panel.tradable
+        n_dates, n_symbols = marks.shape
+
+        # 只在调仓日打分和排名, 不生成完整的日期×股票因子矩阵
+        rows = rebalance_rows(panel.trade_dates, self.rebalance)
+        scores = FACTORS[factor](marks, rows, **factor_params)
+        scores[~tradable[rows]] = np.nan
+        ranks = rank_cross_section(scores)
+
+        cash = self.initial_capital
+        holdings = np.zeros(n_symbols, dtype=np.float64)
+        equity = np.empty(n_dates, dtype=np.float64)
+        exposed = np.zeros(n_dates, dtype=bool)
+        records = []
+        total_commission = 0.0
+        bounds = np.append(rows, n_dates)
+        for k, row in enumerate(rows.tolist()):
+            prices = np.nan_to_num(marks[row].astype(np.float64))
+            can_trade = tradable[row]
+            # 停牌股票无法买卖, 继续持有; 其余资金等权分配给入选股票
+            investable = cash + float(holdings[can_trade] @ prices[can_trade])
+            selected = np.flatnonzero(ranks[k] <= self.top_n)
+
+            target = np.where(can_trade, 0.0, holdings)
+            if len(selected):
+                # 预留两倍费率, 保证先卖后买全部成交后现金不为负
+                budget = investable * (1 - 2 * self.fee_rate) / len(selected)
+                lots = np.floor(budget / prices[selected] / self.lot_size)
+                target[selected] = lots * self.lot_size
+            traded_value = np.abs(target - holdings) @ prices
+            commission = float(traded_value) * self.fee_rate
+            cash = investable - float(target[can_trade] @ prices[can_trade]) - commission
+            holdings = target
+            total_commission += commission
+            records.append(RebalanceRecord(
+                trade_date=panel.trade_dates[row].astype(date),
+                selected=[panel.symbols[column] for column in selected.tolist()],
+                turnover=float(traded_value),
+                commission=float(commission)
+            ))
+
+            # 两次调仓之间持仓不变, 按分段矩阵乘法计算每日市值
+            segment = slice(row, int(bounds[k + 1]))
+            segment_marks = np.nan_to_num(marks[segment].astype(np.float64))
+            equity[segment] = cash + segment_marks @ holdings
+            exposed[segment] = holdings.any()
+
+        equity_curve = [self.initial_capital] + equity.tolist()
+        accumulator = MetricsAccumulator(self.initial_capital)
+        accumulator.extend(equity, exposed)
+        metrics = accumulator.result()
+
+        return CrossSectionResult(
+            symbols=panel.symbols,
+            factor=factor,
+            factor_params=factor_params,
+            top_n=self.top_n,
+            rebalance=str(self.rebalance),
+            start_date=panel.start_date,
+            end_date=panel.end_date,
+            initial_capital=self.initial_capital,
+            final_value=equity_curve[-1],
+            total_return=metrics.return_rate,
+            metrics=metrics,
+            total_commission=total_commission,
+            rebalances=records,
+            equity_curve=equity_curve
+        )
@@ -0,0 +1,60 @@
+import numpy as np
+
+
+def lttb_indices(y: np.ndarray, n_out: int, x: np.ndarray | None = None) -> np.ndarray:
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("max_points 至少为3")
+
+    x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+    # 首尾点固定保留, 中间 n-2 个点均分为 n_out-2 个桶
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_lo, next_hi = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_lo, next_hi = n - 1, n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+
+        xs, ys = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - avg_x) * (ys - y[a]) - (x[a] - xs) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[bucket + 1] = a
+    return selected
+
+
+def ohlc_bucket_starts(n: int, n_out: int) -> np.ndarray:
+    if n_out >= n:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n, n_out, endpoint=False).astype(np.int64))
+
+
+def aggregate_ohlc(
+    open_prices: np.ndarray,
+    high_prices: np.ndarray,
+    low_prices: np.ndarray,
+    close_prices: np.ndarray,
+    volumes: np.ndarray,
+    n_out: int
+) -> dict[str, np.ndarray]:
+    n = len(close_prices)
+    starts = ohlc_bucket_starts(n, n_out)
+    ends = np.append(starts[1:], n) - 1
+    return {
+        "index": starts,
+        "open": open_prices[starts],
+        "high": np.maximum.reduceat(high_prices, starts) if n else high_prices,
+        "low": np.minimum.reduceat(low_prices, starts) if n else low_prices,
+        "close": close_prices[ends],
+        "volume": np.add.reduceat(volumes, starts) if n else volumes,
+    }
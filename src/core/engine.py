@@ -1,11 +1,14 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date
+from typing import Any, Iterator, Optional
 import numpy as np
-from src.strategy.base import Strategy, SignalType
+from src.strategy.base import LazyReason, Strategy
 from src.models.ohlcv import BarData
-from src.models.order import Order, OrderSide, OrderType, Trade
-from src.models.account import Account, Position
+from src.models.order import Trade
+from src.models.account import Account
 from src.models.result import BacktestResult, PerformanceMetrics, TradeRecord
+from src.core.checkpoint import EngineCheckpoint, checkpoint_key
+from src.core.ledger import PositionLedger
+from src.core.metrics import MetricsAccumulator
 
 
 class BacktestEngine:
@@ -21,56 +24,201 @@ class BacktestEngine:
         self.account: Optional[Account] = None
         self.trades: list[Trade] = []
         self.equity_curve: list[float] = []
-        self.completed_trades: list[TradeRecord] = []
-        self.open_trades: dict[str, dict] = {}
+        self.ledger = PositionLedger(fee_rate)
+        self.metrics = MetricsAccumulator(initial_capital)
+        self.last_checkpoint: Optional[EngineCheckpoint] = None
     
-    def run(self, data: BarData, strategy: Strategy) -> BacktestResult:
+    def _reset(self):
         self.account = Account(
             initial_capital=self.initial_capital,
             fee_rate=self.fee_rate
         )
         self.trades = []
-        self.completed_trades = []
-        self.open_trades = {}
+        self.ledger = PositionLedger(self.fee_rate)
+        self.metrics = MetricsAccumulator(self.initial_capital)
         self.equity_curve = [self.initial_capital]
+    
+    @property
+    def completed_trades(self) -> list[TradeRecord]:
+        return self.ledger.records()
+    
+    @property
+    def config(self) -> dict:
+        return {
+            "initial_capital": self.initial_capital,
+            "fee_rate": self.fee_rate,
+            "slippage": self.slippage
+        }
+    
+    def run(
+        self,
+        data: BarData,
+        strategy: Strategy,
+        resume: Optional[EngineCheckpoint] = None,
+        checkpoint: bool = False
+    ) -> BacktestResult:
+        for kind, payload in self.iter_run(data, strategy, chunk_size=0, resume=resume, checkpoint=checkpoint):
+            if kind == "result":
+                return payload
+    
+    def iter_run(
+        self,
+        data: BarData,
+        strategy: Strategy,
+        chunk_size: int = 250,
+        resume: Optional[EngineCheckpoint] = None,
+        checkpoint: bool = False
+    ) -> Iterator[tuple[str, Any]]:
+        # 逐段产出回测过程: ("equity", {"offset", "values"}), ("trades", [TradeRecord]),
+        # ("progress", {"processed", "total"}), 最后是 ("result", BacktestResult); chunk_size=0 时只产出结果
+        # resume 为同一起点的检查点时只处理其后的新K线; checkpoint=True 时在强制平仓前记录 last_checkpoint
+        self._reset()
+        first = self._restore(resume, data, strategy) if resume is not None else 0
         
-        signals = strategy.generate_signals(data)
-        signals_by_date = {}
-        for signal in signals:
-            date_key = signal.timestamp.isoformat()
-            if date_key not in signals_by_date:
-                signals_by_date[date_key] = []
-            signals_by_date[date_key].append(signal)
+        # 信号是因果的, 续跑时只需在新K线前保留策略所需的回看窗口重新生成
+        offset = strategy.resume_offset(data, first) if first else 0
+        signals = strategy.generate_signal_arrays(data[offset:] if offset else data)
+        signals_by_index: dict[int, list[int]] = {}
+        for k, index in enumerate(signals.indices.tolist()):
+            if index + offset >= first:
+                signals_by_index.setdefault(index + offset, []).append(k)
+        directions = signals.directions.tolist()
+        strengths = signals.strengths.tolist()
+        prices = signals.prices.tolist()
         
-        for bar in data.bars:
-            date_key = bar.trade_date.isoformat()
-            day_signals = signals_by_date.get(date_key, [])
-            
-            for signal in day_signals:
-                if signal.signal_type == SignalType.BUY:
-                    self._execute_buy(bar, signal)
-                elif signal.signal_type == SignalType.SELL:
-                    self._execute_sell(bar, signal)
+        trade_dates = data.trade_dates[first:].tolist()
+        close_prices = data.close_prices[first:].tolist()
+        total_bars = len(data)
+        emitted_bars = 0
+        emitted_trades = 0
+        for index, (trade_date, current_price) in enumerate(zip(trade_dates, close_prices), start=first + 1):
+            for k in signals_by_index.get(index - 1, ()):
+                execute = self._execute_buy if directions[k] > 0 else self._execute_sell
+                execute(trade_date, data.symbol, prices[k], strengths[k], LazyReason(strategy, signals, k))
             
-            current_price = bar.close_price
             total_value = self.account.cash + self._calculate_positions_value(current_price)
             self.equity_curve.append(total_value)
+            self.metrics.update(total_value, self.ledger.open_quantity > 0)
+            
+            if chunk_size and (index % chunk_size == 0 or index == total_bars):
+                yield "equity", {
+                    "offset": emitted_bars,
+                    "values": self.equity_curve[emitted_bars:index + 1]
+                }
+                emitted_bars = index + 1
+                if len(self.ledger) > emitted_trades:
+                    yield "trades", self.ledger.records(emitted_trades)
+                    emitted_trades = len(self.ledger)
+                yield "progress", {
+                    "processed": index,
+                    "total": total_bars,
+                    "metrics": self.metrics.result().model_dump()
+                }
+        
+        if checkpoint:
+            self.last_checkpoint = self.create_checkpoint(data, strategy)
+        self._close_all_positions(data.trade_dates[-1].astype(date), float(data.close_prices[-1]))
+        if chunk_size and len(self.ledger) > emitted_trades:
+            yield "trades", self.ledger.records(emitted_trades)
+        yield "result", self._build_result(data, strategy.name)
+    
+    def create_checkpoint(self, data: BarData, strategy: Strategy) -> EngineCheckpoint:
+        bars = len(self.equity_curve) - 1
+        return EngineCheckpoint(
+            key=checkpoint_key(data, strategy, **self.config),
+            bars=bars,
+            data_fingerprint=data[:bars].fingerprint,
+            last_date=data.trade_dates[bars - 1].astype(date),
+            cash=self.account.cash,
+            total_commission=self.account.total_commission,
+            equity_curve=self.equity_curve,
+            ledger=self.ledger.snapshot(),
+            metrics=self.metrics.snapshot()
+        )
+    
+    def _restore(self, checkpoint: EngineCheckpoint, data: BarData, strategy: Strategy) -> int:
+        if checkpoint.key != checkpoint_key(data, strategy, **self.config):
+            raise ValueError("检查点与当前数据、策略或引擎配置不匹配")
+        if checkpoint.bars > len(data) or data[:checkpoint.bars].fingerprint != checkpoint.data_fingerprint:
+            raise ValueError("检查点之前的K线已变化, 无法续跑")
+        self.account.cash = checkpoint.cash
+        self.account.total_commission = checkpoint.total_commission
+        self.equity_curve = list(checkpoint.equity_curve)
+        self.ledger.restore(checkpoint.ledger.model_dump())
+        self.metrics.restore(checkpoint.metrics)
+        return checkpoint.bars
+    
+    def run_vectorized(
+        self,
+        data: BarData,
+        strategy: Strategy,
+        include_trades: bool = True
+    ) -> BacktestResult:
+        return self.run_targets(data, strategy.generate_signal_array(data), strategy.name, include_trades)
+    
+    def run_targets(
+        self,
+        data: BarData,
+        targets: np.ndarray,
+        strategy_name: str,
+        include_trades: bool = True
+    ) -> BacktestResult:
+        # 按预先算好的信号数组撮合, 可对同一信号数组的不同切片重复回测
+        self._reset()
         
-        self._close_all_positions(data.bars[-1])
-        result = self._build_result(data, strategy)
-        return result
+        targets = np.asarray(targets, dtype=np.float64)
+        if targets.shape != (len(data),):
+            raise ValueError(f"信号数组长度({targets.shape})与K线数量({len(data)})不一致")
+        
+        close_prices = data.close_prices
+        event_indices = np.flatnonzero(targets)
+        cash_after = np.empty(len(event_indices), dtype=np.float64)
+        quantity_after = np.empty(len(event_indices), dtype=np.float64)
+        
+        # 只在有信号的K线上逐笔撮合, 其余K线的现金和持仓保持不变, 用数组一次性展开
+        for k, index in enumerate(event_indices.tolist()):
+            trade_date = data.trade_dates[index].astype(date)
+            strength = float(targets[index])
+            price = float(close_prices[index])
+            if strength > 0:
+                self._execute_buy(trade_date, data.symbol, price, min(strength, 1.0))
+            else:
+                self._execute_sell(trade_date, data.symbol, price, min(-strength, 1.0))
+            cash_after[k] = self.account.cash
+            quantity_after[k] = self.ledger.quantity(data.symbol)
+        
+        state = np.searchsorted(event_indices, np.arange(len(data)), side="right") - 1
+        has_state = state >= 0
+        state = np.maximum(state, 0)
+        if len(event_indices):
+            cash = np.where(has_state, cash_after[state], self.initial_capital)
+            quantity = np.where(has_state, quantity_after[state], 0.0)
+        else:
+            cash = np.full(len(data), self.initial_capital)
+            quantity = np.zeros(len(data))
+        equity = cash + quantity * close_prices
+        self.equity_curve.extend(equity.tolist())
+        self.metrics.extend(equity, quantity > 0)
+        
+        self._close_all_positions(
+            data.trade_dates[-1].astype(date), float(close_prices[-1])
+        )
+        return self._build_result(data, strategy_name, include_trades)
     
     def _calculate_positions_value(self, current_price: float) -> float:
-        total = 0.0
-        for symbol, pos in self.open_trades.items():
-            total += pos["quantity"] * current_price
-        return total
+        return self.ledger.open_quantity * current_price
     
-    def _execute_buy(self, bar, signal):
-        symbol = signal.symbol
-        price = signal.price * (1 + self.slippage)
+    def _execute_buy(
+        self,
+        trade_date: date,
+        symbol: str,
+        signal_price: float,
+        strength: float,
+        reason: Optional[str | LazyReason] = None
+    ):
+        price = signal_price * (1 + self.slippage)
 
-        max_quantity = int(self.account.cash / price * signal.strength * 0.95)
+        max_quantity = int(self.account.cash / price * strength * 0.95)
         quantity = (max_quantity // 100) * 100
         quantity = quantity if quantity >= 100 else 0
 
@@ -82,241 +230,80 @@ class BacktestEngine:
         if self.account.cash >= total_cost:
             self.account.cash -= total_cost
             self.account.total_commission += commission
-
-            if symbol not in self.open_trades:
-                self.open_trades[symbol] = {
-                    "quantity": 0,
-                    "avg_cost": 0,
-                    "entries": [],
-                    "reason": signal.reason,
-                    "position_ratio": signal.strength
-                }
-
-            pos = self.open_trades[symbol]
-            pos["entries"].append({
-                "price": price,
-                "quantity": quantity,
-                "date": bar.trade_date,
-                "reason": signal.reason,
-                "position_ratio": signal.strength
-            })
-
-            total_shares = pos["quantity"] + quantity
-            total_cost_basis = pos["quantity"] * pos["avg_cost"] + price * quantity
-            pos["quantity"] = total_shares
-            pos["avg_cost"] = total_cost_basis / total_shares if total_shares > 0 else 0
+            self.ledger.open(symbol, trade_date, price, quantity, reason, strength)
     
-    def _execute_sell(self, bar, signal):
-        symbol = signal.symbol
-        if symbol not in self.open_trades or self.open_trades[symbol]["quantity"] == 0:
+    def _execute_sell(
+        self,
+        trade_date: date,
+        symbol: str,
+        signal_price: float,
+        strength: float,
+        reason: Optional[str | LazyReason] = None
+    ):
+        held = self.ledger.quantity(symbol)
+        if held == 0:
             return
 
-        pos = self.open_trades[symbol]
-
-        price = signal.price * (1 - self.slippage)
-        target_quantity = int(pos["quantity"] * signal.strength)
+        price = signal_price * (1 - self.slippage)
+        target_quantity = int(held * strength)
         sell_quantity = (target_quantity // 100) * 100
-        sell_quantity = min(sell_quantity, pos["quantity"])
-        sell_quantity = sell_quantity if sell_quantity >= 100 else pos["quantity"]
+        sell_quantity = min(sell_quantity, held)
+        sell_quantity = sell_quantity if sell_quantity >= 100 else held
 
         if sell_quantity <= 0:
             return
 
-        remaining_quantity = sell_quantity
-        entry_price_sum = 0
-        total_commission = 0
-        position_ratio = signal.strength
-
-        for entry in list(pos["entries"]):
-            if remaining_quantity <= 0:
-                break
-
-            entry_quantity = min(entry["quantity"], remaining_quantity)
-            entry_commission = entry["price"] * entry_quantity * self.fee_rate
-
-            sell_commission = price * sell_quantity * self.fee_rate
-
-            entry_value = entry["price"] * entry_quantity
-            sell_value = price * entry_quantity
-            pnl = sell_value - entry_value - entry_commission - sell_commission
-            pnl_rate = pnl / entry_value if entry_value > 0 else 0
-
-            position_decision = (
-                f"仓位管理: position_ratio={position_ratio:.2f}, "
-                f"目标卖出={int(pos['quantity'] * position_ratio)}股, "
-                f"实际成交={sell_quantity}股(100股整数倍), "
-                f"卖出比例={position_ratio*100:.1f}%"
-            )
-
-            self.completed_trades.append(TradeRecord(
-                trade_id=f"t{len(self.completed_trades) + 1}",
-                symbol=symbol,
-                entry_date=entry["date"],
-                entry_price=entry["price"],
-                exit_date=bar.trade_date,
-                exit_price=price,
-                quantity=entry_quantity,
-                pnl=round(pnl, 2),
-                pnl_rate=round(pnl_rate, 4),
-                side="long",
-                commission=round(entry_commission + sell_commission, 2),
-                reason=f"{signal.reason or entry.get('reason', '')} | {position_decision}",
-                position_ratio=position_ratio,
-                avg_cost=entry["price"]
-            ))
-
-            entry_price_sum += entry["price"] * entry_quantity
-            total_commission += entry_commission + sell_commission
-            remaining_quantity -= entry_quantity
-
-            entry["quantity"] -= entry_quantity
-            if entry["quantity"] <= 0:
-                pos["entries"].remove(entry)
+        closed = len(self.ledger)
+        self.ledger.close(
+            symbol, trade_date, price, sell_quantity, strength, reason,
+            ("sell", strength, held, sell_quantity)
+        )
+        self._record_closed(closed)
 
         commission = price * sell_quantity * self.fee_rate
         self.account.cash += price * sell_quantity - commission
         self.account.total_commission += commission
-
-        pos["quantity"] -= sell_quantity
-        pos["avg_cost"] = self._calculate_avg_cost(pos)
-
-        position_decision = (
-            f"仓位管理: position_ratio={signal.strength:.2f}, "
-            f"当前持仓={pos['quantity'] + sell_quantity}股, "
-            f"卖出比例={signal.strength*100:.1f}%, "
-            f"实际卖出={sell_quantity}股(取整到100的倍数)"
-        )
-
-        for entry in list(pos["entries"]):
-            entry["position_decision"] = position_decision
-
-    def _calculate_avg_cost(self, pos: dict) -> float:
-        if pos["quantity"] <= 0:
-            return 0
-        total_cost = sum(e["price"] * e["quantity"] for e in pos["entries"])
-        return total_cost / pos["quantity"]
     
-    def _close_all_positions(self, bar):
-        for symbol, pos in list(self.open_trades.items()):
-            if pos["quantity"] > 0:
-                price = bar.close_price * (1 - self.slippage)
-                remaining = pos["quantity"]
-
-                position_decision = (
-                    f"仓位管理: 回测结束强制平仓, "
-                    f"剩余持仓={remaining}股, "
-                    f"以收盘价{price:.2f}全部卖出"
-                )
-
-                for entry in list(pos["entries"]):
-                    entry_commission = entry["price"] * entry["quantity"] * self.fee_rate
-                    sell_commission = price * entry["quantity"] * self.fee_rate
-
-                    entry_value = entry["price"] * entry["quantity"]
-                    sell_value = price * entry["quantity"]
-                    pnl = sell_value - entry_value - entry_commission - sell_commission
-                    pnl_rate = pnl / entry_value if entry_value > 0 else 0
-
-                    self.completed_trades.append(TradeRecord(
-                        trade_id=f"t{len(self.completed_trades) + 1}",
-                        symbol=symbol,
-                        entry_date=entry["date"],
-                        entry_price=entry["price"],
-                        exit_date=bar.trade_date,
-                        exit_price=price,
-                        quantity=entry["quantity"],
-                        pnl=round(pnl, 2),
-                        pnl_rate=round(pnl_rate, 4),
-                        side="long",
-                        commission=round(entry_commission + sell_commission, 2),
-                        reason=position_decision,
-                        position_ratio=1.0,
-                        avg_cost=entry["price"]
-                    ))
-
-                    remaining -= entry["quantity"]
-
-                pos["quantity"] = 0
-                pos["entries"] = []
+    def _close_all_positions(self, trade_date: date, close_price: float):
+        for symbol in list(self.ledger.positions):
+            self._close_position(symbol, trade_date, close_price)
+    
+    def _close_position(self, symbol: str, trade_date: date, close_price: float):
+        closed = len(self.ledger)
+        self.ledger.close_all_lots(symbol, trade_date, close_price * (1 - self.slippage))
+        self._record_closed(closed)
+    
+    def _record_closed(self, start: int):
+        for closed in self.ledger.closed[start:]:
+            self.metrics.record_trade(closed.pnl)
     
-    def _build_result(self, data: BarData, strategy: Strategy) -> BacktestResult:
+    def _build_metrics(self) -> PerformanceMetrics:
+        return self.metrics.result()
+    
+    def _build_result(
+        self,
+        data: BarData,
+        strategy_name: str,
+        include_trades: bool = True
+    ) -> BacktestResult:
+        # 成交记录只在需要输出时才转换为 TradeRecord, 参数扫描等只看指标的场景跳过
+        metrics = self._build_metrics()
         final_value = self.equity_curve[-1]
-        total_return = (final_value - self.initial_capital) / self.initial_capital
-        
-        trades = self.completed_trades
-        wins = sum(1 for t in trades if t.pnl > 0)
-        win_rate = wins / len(trades) if trades else 0.0
-        
-        returns_series = self._calculate_returns()
-        annual_return, volatility, sharpe = self._calculate_risk_metrics(returns_series)
-        max_drawdown = self._calculate_max_drawdown()
-        
-        metrics = PerformanceMetrics(
-            return_rate=total_return,
-            annual_return=annual_return,
-            volatility=volatility,
-            sharpe_ratio=sharpe,
-            max_drawdown=max_drawdown,
-            win_rate=win_rate,
-            profit_loss_ratio=self._calculate_profit_loss_ratio(trades)
-        )
+        trades = self.ledger.records() if include_trades else []
         
         return BacktestResult(
             symbol=data.symbol,
-            strategy_name=strategy.name,
-            start_date=data.start_date or data.bars[0].trade_date,
-            end_date=data.end_date or data.bars[-1].trade_date,
+            strategy_name=strategy_name,
+            start_date=data.start_date or data.trade_dates[0].astype(date),
+            end_date=data.end_date or data.trade_dates[-1].astype(date),
             initial_capital=self.initial_capital,
             final_value=final_value,
-            total_return=total_return,
+            total_return=metrics.return_rate,
             metrics=metrics,
-            total_trades=len(trades),
-            win_rate=win_rate,
-            sharpe_ratio=sharpe,
-            max_drawdown=max_drawdown,
+            total_trades=len(self.ledger),
+            win_rate=metrics.win_rate,
+            sharpe_ratio=metrics.sharpe_ratio,
+            max_drawdown=metrics.max_drawdown,
             trades=trades,
             equity_curve=self.equity_curve
         )
-    
-    def _calculate_returns(self) -> list[float]:
-        returns = []
-        for i in range(1, len(self.equity_curve)):
-            ret = (self.equity_curve[i] - self.equity_curve[i-1]) / self.equity_curve[i-1]
-            returns.append(ret)
-        return returns
-    
-    def _calculate_risk_metrics(self, returns: list[float]):
-        if not returns:
-            return 0.0, 0.0, 0.0
-        
-        annual_factor = 252
-        mean_return = np.mean(returns) * annual_factor
-        std_return = np.std(returns) * (annual_factor ** 0.5)
-        sharpe = mean_return / std_return if std_return > 0 else 0.0
-        
-        return mean_return, std_return, sharpe
-    
-    def _calculate_max_drawdown(self) -> float:
-        if not self.equity_curve:
-            return 0.0
-        
-        max_drawdown = 0.0
-        peak = self.equity_curve[0]
-        
-        for value in self.equity_curve:
-            if value > peak:
-                peak = value
-            drawdown = (peak - value) / peak
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
-        
-        return max_drawdown
-    
-    def _calculate_profit_loss_ratio(self, trades: list[TradeRecord]) -> float:
-        profits = [t.pnl for t in trades if t.pnl > 0]
-        losses = [abs(t.pnl) for t in trades if t.pnl < 0]
-        
-        avg_profit = sum(profits) / len(profits) if profits else 0
-        avg_loss = sum(losses) / len(losses) if losses else 1
-        
-        return avg_profit / avg_loss if avg_loss > 0 else 0.0
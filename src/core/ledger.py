@@ -0,0 +1,218 @@
+from collections import deque
+from datetime import date
+from typing import Any, Optional
+from src.models.result import TradeRecord
+
+
+class Lot:
+    __slots__ = ("price", "quantity", "date", "reason", "position_ratio")
+
+    def __init__(self, price: float, quantity: int, trade_date: date, reason: Any, position_ratio: float):
+        self.price = price
+        self.quantity = quantity
+        self.date = trade_date
+        self.reason = reason
+        self.position_ratio = position_ratio
+
+
+class ClosedLot:
+    # 平仓明细只保存数值, 转换为 TradeRecord 和格式化原因推迟到输出结果时
+    __slots__ = (
+        "symbol", "entry_date", "entry_price", "exit_date", "exit_price", "quantity",
+        "pnl", "pnl_rate", "commission", "position_ratio", "reason", "decision"
+    )
+
+    def __init__(
+        self,
+        symbol: str,
+        lot: Lot,
+        quantity: int,
+        exit_date: date,
+        exit_price: float,
+        sell_commission: float,
+        fee_rate: float,
+        position_ratio: float,
+        reason: Any,
+        decision: tuple
+    ):
+        entry_commission = lot.price * quantity * fee_rate
+        entry_value = lot.price * quantity
+        self.symbol = symbol
+        self.entry_date = lot.date
+        self.entry_price = lot.price
+        self.exit_date = exit_date
+        self.exit_price = exit_price
+        self.quantity = quantity
+        pnl = exit_price * quantity - entry_value - entry_commission - sell_commission
+        self.pnl = round(pnl, 2)
+        self.pnl_rate = round(pnl / entry_value if entry_value > 0 else 0, 4)
+        self.commission = round(entry_commission + sell_commission, 2)
+        self.position_ratio = position_ratio
+        self.reason = reason
+        self.decision = decision
+
+    def format_reason(self) -> str:
+        kind, *values = self.decision
+        if kind == "close":
+            remaining, price = values
+            return f"仓位管理: 回测结束强制平仓, 剩余持仓={remaining}股, 以收盘价{price:.2f}全部卖出"
+        ratio, held, sell_quantity = values
+        decision = (
+            f"仓位管理: position_ratio={ratio:.2f}, "
+            f"目标卖出={int(held * ratio)}股, "
+            f"实际成交={sell_quantity}股(100股整数倍), "
+            f"卖出比例={ratio*100:.1f}%"
+        )
+        return f"{self.reason or ''} | {decision}"
+
+    def to_record(self, trade_id: str) -> TradeRecord:
+        return TradeRecord(
+            trade_id=trade_id,
+            symbol=self.symbol,
+            entry_date=self.entry_date,
+            entry_price=self.entry_price,
+            exit_date=self.exit_date,
+            exit_price=self.exit_price,
+            quantity=self.quantity,
+            pnl=self.pnl,
+            pnl_rate=self.pnl_rate,
+            side="long",
+            commission=self.commission,
+            reason=self.format_reason(),
+            position_ratio=self.position_ratio,
+            avg_cost=self.entry_price
+        )
+
+
+class Position:
+    __slots__ = ("lots", "quantity", "cost_basis")
+
+    def __init__(self):
+        self.lots: deque[Lot] = deque()
+        self.quantity = 0
+        self.cost_basis = 0.0
+
+    @property
+    def avg_cost(self) -> float:
+        return self.cost_basis / self.quantity if self.quantity > 0 else 0.0
+
+
+class PositionLedger:
+    def __init__(self, fee_rate: float = 0.0):
+        self.fee_rate = fee_rate
+        self.positions: dict[str, Position] = {}
+        self.closed: list[ClosedLot] = []
+        self.open_quantity = 0
+        self._records: list[TradeRecord] = []
+
+    def quantity(self, symbol: str) -> int:
+        position = self.positions.get(symbol)
+        return position.quantity if position else 0
+
+    def open(
+        self,
+        symbol: str,
+        trade_date: date,
+        price: float,
+        quantity: int,
+        reason: Any = None,
+        position_ratio: float = 1.0
+    ):
+        position = self.positions.get(symbol)
+        if position is None:
+            position = self.positions[symbol] = Position()
+        position.lots.append(Lot(price, quantity, trade_date, reason, position_ratio))
+        position.quantity += quantity
+        position.cost_basis += price * quantity
+        self.open_quantity += quantity
+
+    def close(
+        self,
+        symbol: str,
+        trade_date: date,
+        price: float,
+        quantity: int,
+        position_ratio: float,
+        reason: Any,
+        decision: tuple
+    ):
+        # 按先进先出逐批匹配; 策略卖出时每批都计入整笔卖出的佣金, 强制平仓按批计算, 与原有盈亏口径一致
+        position = self.positions[symbol]
+        lots = position.lots
+        order_commission = price * quantity * self.fee_rate
+        remaining = quantity
+        while remaining > 0 and lots:
+            lot = lots[0]
+            matched = min(lot.quantity, remaining)
+            sell_commission = price * matched * self.fee_rate if decision[0] == "close" else order_commission
+            self.closed.append(ClosedLot(
+                symbol, lot, matched, trade_date, price, sell_commission,
+                self.fee_rate, position_ratio, reason or lot.reason, decision
+            ))
+            lot.quantity -= matched
+            position.cost_basis -= lot.price * matched
+            remaining -= matched
+            if lot.quantity <= 0:
+                lots.popleft()
+
+        position.quantity -= quantity
+        self.open_quantity -= quantity
+        if position.quantity <= 0:
+            position.quantity = 0
+            position.cost_basis = 0.0
+
+    def close_all_lots(self, symbol: str, trade_date: date, price: float):
+        position = self.positions.get(symbol)
+        if position is None or position.quantity <= 0:
+            return
+        self.close(symbol, trade_date, price, position.quantity, 1.0, None, ("close", position.quantity, price))
+
+    def snapshot(self) -> dict:
+        # 原因统一转为字符串, 快照不再引用策略和信号数组
+        return {
+            "positions": {
+                symbol: [
+                    (lot.price, lot.quantity, lot.date, _reason_text(lot.reason), lot.position_ratio)
+                    for lot in position.lots
+                ]
+                for symbol, position in self.positions.items()
+            },
+            "cost_basis": {symbol: position.cost_basis for symbol, position in self.positions.items()},
+            "closed": [
+                tuple(
+                    _reason_text(closed.reason) if name == "reason" else getattr(closed, name)
+                    for name in ClosedLot.__slots__
+                )
+                for closed in self.closed
+            ]
+        }
+
+    def restore(self, state: dict):
+        self.positions = {}
+        self.open_quantity = 0
+        for symbol, lots in state["positions"].items():
+            position = self.positions[symbol] = Position()
+            for price, quantity, trade_date, reason, position_ratio in lots:
+                position.lots.append(Lot(price, quantity, trade_date, reason, position_ratio))
+                position.quantity += quantity
+            position.cost_basis = state["cost_basis"][symbol]
+            self.open_quantity += position.quantity
+        self.closed = []
+        for values in state["closed"]:
+            closed = ClosedLot.__new__(ClosedLot)
+            for name, value in zip(ClosedLot.__slots__, values):
+                setattr(closed, name, value)
+            self.closed.append(closed)
+        self._records = []
+
+    def records(self, start: int = 0) -> list[TradeRecord]:
+        for closed in self.closed[len(self._records):]:
+            self._records.append(closed.to_record(f"t{len(self._records) + 1}"))
+        return self._records[start:]
+
+    def __len__(self) -> int:
+        return len(self.closed)
+
+
+def _reason_text(reason: Any) -> Optional[str]:
+    return None if reason is None else str(reason)
@@ -0,0 +1,132 @@
+import math
+from typing import Iterable, Optional
+import numpy as np
+from src.models.result import PerformanceMetrics
+
+
+class MetricsAccumulator:
+    # 逐根K线/逐笔成交增量更新, 生成指标为 O(1); 收益率减去首个收益率后按顺序累加一阶、二阶和(平移数据法, 避免方差相消),
+    # 批量路径用 np.add.accumulate 接着已有的和继续累加, 与逐根更新逐位一致, 断点续跑结果不受分段影响
+    def __init__(self, initial_value: float, periods_per_year: int = 252):
+        self.initial_value = initial_value
+        self.periods_per_year = periods_per_year
+        self.last_value = initial_value
+        self.count = 0
+        self.shift = 0.0
+        self.return_sum = 0.0
+        self.return_sq = 0.0
+        self.downside_sq = 0.0
+        self.peak = initial_value
+        self.max_drawdown = 0.0
+        self.drawdown_bars = 0
+        self.max_drawdown_duration = 0
+        self.exposed_bars = 0
+        self.trades = 0
+        self.wins = 0
+        self.profit_sum = 0.0
+        self.loss_sum = 0.0
+        self.loss_count = 0
+
+    def update(self, value: float, exposed: bool = False):
+        ret = (value - self.last_value) / self.last_value
+        self.last_value = value
+        if self.count == 0:
+            self.shift = ret
+        self.count += 1
+        shifted = ret - self.shift
+        self.return_sum += shifted
+        self.return_sq += shifted * shifted
+        if ret < 0:
+            self.downside_sq += ret * ret
+        if exposed:
+            self.exposed_bars += 1
+
+        if value > self.peak:
+            self.peak = value
+            self.drawdown_bars = 0
+        else:
+            drawdown = (self.peak - value) / self.peak
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
+            if value < self.peak:
+                self.drawdown_bars += 1
+                if self.drawdown_bars > self.max_drawdown_duration:
+                    self.max_drawdown_duration = self.drawdown_bars
+
+    def extend(self, values: Iterable[float], exposed: Optional[Iterable[bool]] = None):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        curve = np.concatenate(([self.last_value], values))
+        returns = np.diff(curve) / curve[:-1]
+        if self.count == 0:
+            self.shift = float(returns[0])
+        shifted = returns - self.shift
+        self.count += len(values)
+        self.last_value = float(values[-1])
+        self.return_sum = float(np.add.accumulate(np.concatenate(([self.return_sum], shifted)))[-1])
+        self.return_sq = float(np.add.accumulate(np.concatenate(([self.return_sq], shifted * shifted)))[-1])
+        self.downside_sq = float(np.add.accumulate(
+            np.concatenate(([self.downside_sq], np.where(returns < 0, returns * returns, 0.0)))
+        )[-1])
+        if exposed is not None:
+            self.exposed_bars += int(np.count_nonzero(np.asarray(exposed, dtype=bool)))
+
+        # 回撤: 逐根的历史最高点; 创新高时回撤持续K线数清零, 低于最高点时加一, 持平不变
+        previous_peak = np.maximum.accumulate(np.concatenate(([self.peak], values)))
+        peak = previous_peak[1:]
+        self.peak = float(peak[-1])
+        self.max_drawdown = max(self.max_drawdown, float(((peak - values) / peak).max()))
+        underwater = np.cumsum(values < peak)
+        new_high = values > previous_peak[:-1]
+        since_high = underwater - np.maximum.accumulate(np.where(new_high, underwater, 0))
+        duration = np.where(np.maximum.accumulate(new_high), since_high, since_high + self.drawdown_bars)
+        self.drawdown_bars = int(duration[-1])
+        self.max_drawdown_duration = max(self.max_drawdown_duration, int(duration.max()))
+
+    def record_trade(self, pnl: float):
+        self.trades += 1
+        if pnl > 0:
+            self.wins += 1
+            self.profit_sum += pnl
+        elif pnl < 0:
+            self.loss_sum += -pnl
+            self.loss_count += 1
+
+    def snapshot(self) -> dict:
+        return dict(self.__dict__)
+
+    def restore(self, state: dict):
+        self.__dict__.update(state)
+
+    def result(self) -> PerformanceMetrics:
+        total_return = (self.last_value - self.initial_value) / self.initial_value
+        win_rate = self.wins / self.trades if self.trades else 0.0
+
+        annual_return = volatility = sharpe = sortino = 0.0
+        if self.count:
+            mean_shifted = self.return_sum / self.count
+            variance = max(self.return_sq / self.count - mean_shifted * mean_shifted, 0.0)
+            annual_return = (self.shift + mean_shifted) * self.periods_per_year
+            volatility = math.sqrt(variance) * math.sqrt(self.periods_per_year)
+            sharpe = annual_return / volatility if volatility > 0 else 0.0
+            downside = math.sqrt(self.downside_sq / self.count) * math.sqrt(self.periods_per_year)
+            sortino = annual_return / downside if downside > 0 else 0.0
+        calmar = annual_return / self.max_drawdown if self.max_drawdown > 0 else 0.0
+
+        avg_profit = self.profit_sum / self.wins if self.wins else 0
+        avg_loss = self.loss_sum / self.loss_count if self.loss_count else 1
+
+        return PerformanceMetrics(
+            return_rate=total_return,
+            annual_return=annual_return,
+            volatility=volatility,
+            sharpe_ratio=sharpe,
+            max_drawdown=self.max_drawdown,
+            win_rate=win_rate,
+            profit_loss_ratio=avg_profit / avg_loss if avg_loss > 0 else 0.0,
+            sortino_ratio=sortino,
+            calmar_ratio=calmar,
+            max_drawdown_duration=self.max_drawdown_duration,
+            exposure=self.exposed_bars / self.count if self.count else 0.0
+        )
@@ -0,0 +1,116 @@
+from datetime import date
+from typing import Iterable, Optional, Union
+import numpy as np
+from src.core.engine import BacktestEngine
+from src.models.ohlcv import BarData
+from src.models.panel import BarPanel
+from src.models.result import PortfolioResult
+from src.strategy.base import Strategy
+
+
+class PortfolioEngine(BacktestEngine):
+    def __init__(
+        self,
+        initial_capital: float = 100000.0,
+        fee_rate: float = 0.0003,
+        slippage: float = 0.0,
+        max_position_weight: Optional[float] = None
+    ):
+        super().__init__(initial_capital=initial_capital, fee_rate=fee_rate, slippage=slippage)
+        self.max_position_weight = max_position_weight
+        self.panel: Optional[BarPanel] = None
+
+    def run(
+        self,
+        universe: Union[dict[str, BarData], Iterable[BarData]],
+        strategy: Strategy
+    ) -> PortfolioResult:
+        self._reset()
+        bars = list(universe.values()) if isinstance(universe, dict) else list(universe)
+        panel = BarPanel.from_bars(bars)
+        self.panel = panel
+        n_dates, n_symbols = panel.close_prices.shape
+        weight = self.max_position_weight or 1.0 / n_symbols
+
+        targets = np.zeros((n_dates, n_symbols), dtype=np.float64)
+        for column, data in enumerate(bars):
+            targets[panel.row_index[column], column] = strategy.generate_signal_array(data)
+
+        marks = np.nan_to_num(panel.marks, nan=0.0)
+        holdings = np.zeros(n_symbols, dtype=np.float64)
+        quantity_delta = np.zeros((n_dates, n_symbols), dtype=np.float64)
+        event_rows = np.flatnonzero(targets.any(axis=1))
+        cash_after = np.empty(len(event_rows), dtype=np.float64)
+
+        for k, row in enumerate(event_rows.tolist()):
+            trade_date = panel.trade_dates[row].astype(date)
+            day_targets = targets[row]
+            # 先卖后买, 卖出回笼的资金当天即可用于买入
+            for column in np.flatnonzero(day_targets < 0).tolist():
+                symbol = panel.symbols[column]
+                self._execute_sell(
+                    trade_date,
+                    symbol,
+                    float(panel.close_prices[row, column]),
+                    min(-float(day_targets[column]), 1.0)
+                )
+                self._record_holding(symbol, column, row, holdings, quantity_delta)
+
+            for column in np.flatnonzero(day_targets > 0).tolist():
+                symbol = panel.symbols[column]
+                equity = self.account.cash + float(holdings @ marks[row])
+                budget = min(self.account.cash, equity * weight)
+                scale = budget / self.account.cash if self.account.cash > 0 else 0.0
+                self._execute_buy(
+                    trade_date,
+                    symbol,
+                    float(panel.close_prices[row, column]),
+                    min(float(day_targets[column]), 1.0) * scale
+                )
+                self._record_holding(symbol, column, row, holdings, quantity_delta)
+
+            cash_after[k] = self.account.cash
+
+        state = np.searchsorted(event_rows, np.arange(n_dates), side="right") - 1
+        if len(event_rows):
+            cash = np.where(state >= 0, cash_after[np.maximum(state, 0)], self.initial_capital)
+        else:
+            cash = np.full(n_dates, self.initial_capital)
+        quantity = np.cumsum(quantity_delta, axis=0)
+        equity = cash + np.einsum("ij,ij->i", quantity, marks)
+        self.equity_curve.extend(equity.tolist())
+        self.metrics.extend(equity, (quantity > 0).any(axis=1))
+
+        last_date = panel.trade_dates[-1].astype(date)
+        for column, symbol in enumerate(panel.symbols):
+            self._close_position(symbol, last_date, float(marks[-1, column]))
+
+        metrics = self._build_metrics()
+        return PortfolioResult(
+            symbols=panel.symbols,
+            strategy_name=strategy.name,
+            start_date=panel.start_date,
+            end_date=panel.end_date,
+            initial_capital=self.initial_capital,
+            final_value=self.equity_curve[-1],
+            total_return=metrics.return_rate,
+            metrics=metrics,
+            total_trades=len(self.ledger),
+            win_rate=metrics.win_rate,
+            sharpe_ratio=metrics.sharpe_ratio,
+            max_drawdown=metrics.max_drawdown,
+            trades=self.completed_trades,
+            equity_curve=self.equity_curve
+        )
+
+    def _record_holding(
+        self,
+        symbol: str,
+        column: int,
+        row: int,
+        holdings: np.ndarray,
+        quantity_delta: np.ndarray
+    ):
+        quantity = self.ledger.quantity(symbol)
+        quantity_delta[row, column] += quantity - holdings[column]
+        holdings[column] = quantity
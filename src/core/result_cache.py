@@ -0,0 +1,148 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+from pydantic import BaseModel
+from src.models.ohlcv import BarData
+from src.models.result import BacktestResult
+from src.strategy.base import Strategy
+
+# 引擎或结果结构变化时递增, 旧的磁盘缓存自动失效
+RESULT_CACHE_VERSION = 2
+
+
+def result_cache_key(data: BarData, strategy: Strategy, **engine_config: Any) -> str:
+    # K线内容、策略及其完整参数、引擎配置共同决定回测结果, 数据变化后指纹不同, 旧条目不会再命中;
+    # 结果中回显请求的起止日期, 不同请求区间即使对应相同的K线也分开缓存
+    payload = json.dumps(
+        {
+            "version": RESULT_CACHE_VERSION,
+            "data": data.fingerprint,
+            "window": [data.start_date, data.end_date],
+            "strategy": [type(strategy).__name__, strategy.name, strategy.params],
+            "engine": engine_config,
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    model: type[BaseModel] = BacktestResult
+
+    def __init__(
+        self,
+        root: Optional[str | Path] = None,
+        max_entries: int = 256,
+        max_disk_bytes: int = 512 * 1024 * 1024
+    ):
+        self.root = Path(root) if root is not None else None
+        if self.root is not None:
+            self.root.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, BaseModel] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[BaseModel]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+
+        result = self._load(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, result)
+        return result
+
+    def put(self, key: str, result: BaseModel):
+        with self._lock:
+            self._remember(key, result)
+        if self.root is not None:
+            path = self._path(key)
+            path.parent.mkdir(exist_ok=True)
+            payload = result.model_dump_json().encode()
+            replaced = path.stat().st_size if path.exists() else 0
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(payload)
+            tmp_path.replace(path)
+            with self._lock:
+                self._disk_bytes += len(payload) - replaced
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._prune_disk(path)
+
+    def get_or_run(self, key: str, run: Callable[[], BacktestResult]) -> BacktestResult:
+        result = self.get(key)
+        if result is None:
+            result = run()
+            self.put(key, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for path, _, _ in self._disk_entries():
+                path.unlink(missing_ok=True)
+            self._disk_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, result: BaseModel):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_entries(self) -> list[tuple[Path, int, float]]:
+        if self.root is None:
+            return []
+        entries = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _prune_disk(self, keep: Path):
+        # 磁盘条目按最近使用时间(mtime)淘汰, 直到总大小回到上限以内; 刚写入的条目保留
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        self._disk_bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            self._disk_bytes -= size
+
+    def _load(self, key: str) -> Optional[BaseModel]:
+        if self.root is None:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            result = self.model.model_validate_json(path.read_bytes())
+            path.touch()
+            return result
+        except (OSError, ValueError):
+            path.unlink(missing_ok=True)
+            return None
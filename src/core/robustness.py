@@ -0,0 +1,148 @@
+from typing import Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from src.models.result import BacktestResult, ConfidenceInterval, RobustnessResult
+
+ROBUSTNESS_METHODS = ("bootstrap", "shuffle")
+
+
+def _block_tables(returns: np.ndarray, length: int) -> np.ndarray:
+    # 以每根K线为起点的循环块(长度 length)的汇总量, 逐块合并即可得到整条路径的收益与回撤:
+    # [对数收益和, 最高前缀, 最低前缀, 块内最大回撤(对数), 收益和, 收益平方和]
+    n = len(returns)
+    extended = np.concatenate((returns, returns[:length - 1]))
+    windows = sliding_window_view(extended, length)[:n]
+    prefix = np.cumsum(np.log1p(windows), axis=1)
+    running_peak = np.maximum(np.maximum.accumulate(prefix, axis=1), 0.0)
+    return np.stack((
+        prefix[:, -1],
+        running_peak[:, -1],
+        np.minimum(prefix.min(axis=1), 0.0),
+        (running_peak - prefix).max(axis=1),
+        windows.sum(axis=1),
+        (windows * windows).sum(axis=1)
+    )).astype(np.float32)
+
+
+def bootstrap_returns(
+    returns: np.ndarray,
+    samples: int = 10000,
+    block_size: int = 5,
+    seed: Optional[int] = 0,
+    chunk_size: int = 65536,
+    periods_per_year: int = 252
+) -> dict[str, np.ndarray]:
+    # 循环块自助法重采样日收益率, block_size=1 即独立同分布自助法; 所有样本按块批量推进, 不逐样本循环
+    returns = np.asarray(returns, dtype=np.float64)
+    n = len(returns)
+    if n == 0:
+        raise ValueError("没有可重采样的收益率")
+    block_size = max(1, min(block_size, n))
+    full_blocks, remainder = divmod(n, block_size)
+    lengths = [block_size] * full_blocks + ([remainder] if remainder else [])
+    tables = {length: _block_tables(returns, length) for length in set(lengths)}
+
+    rng = np.random.default_rng(seed)
+    total_return = np.empty(samples, dtype=np.float32)
+    max_drawdown = np.empty(samples, dtype=np.float32)
+    sharpe = np.empty(samples, dtype=np.float32)
+    for start in range(0, samples, chunk_size):
+        size = min(chunk_size, samples - start)
+        path = np.zeros(size, dtype=np.float32)
+        peak = np.zeros(size, dtype=np.float32)
+        drawdown = np.zeros(size, dtype=np.float32)
+        total = np.zeros(size, dtype=np.float32)
+        total_sq = np.zeros(size, dtype=np.float32)
+        scratch = np.empty(size, dtype=np.float32)
+        gathered = np.empty((6, size), dtype=np.float32)
+        log_sum, high, low, block_drawdown, ret_sum, ret_sq = gathered
+        for length in lengths:
+            starts = rng.integers(0, n, size=size)
+            for column, out in zip(tables[length], gathered):
+                np.take(column, starts, out=out)
+            # 回撤取: 已有回撤、块内回撤、此前高点到块内最低点 三者最大
+            np.add(path, low, out=scratch)
+            np.subtract(peak, scratch, out=scratch)
+            np.maximum(drawdown, scratch, out=drawdown)
+            np.maximum(drawdown, block_drawdown, out=drawdown)
+            np.add(path, high, out=scratch)
+            np.maximum(peak, scratch, out=peak)
+            path += log_sum
+            total += ret_sum
+            total_sq += ret_sq
+
+        chunk = slice(start, start + size)
+        total_return[chunk] = np.expm1(path)
+        max_drawdown[chunk] = -np.expm1(-drawdown)
+        mean = total / n
+        std = np.sqrt(np.maximum(total_sq / n - mean * mean, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe[chunk] = np.where(std > 0, mean / std * np.float32(np.sqrt(periods_per_year)), 0.0)
+    return {"total_return": total_return, "max_drawdown": max_drawdown, "sharpe_ratio": sharpe}
+
+
+def shuffle_trades(
+    pnls: np.ndarray,
+    initial_capital: float,
+    samples: int = 10000,
+    seed: Optional[int] = 0,
+    chunk_size: int = 65536
+) -> dict[str, np.ndarray]:
+    # 打乱成交顺序: 总收益不变, 衡量回撤对交易先后顺序的敏感程度
+    pnls = np.asarray(pnls, dtype=np.float32)
+    if len(pnls) == 0:
+        raise ValueError("没有可重排的交易")
+    rng = np.random.default_rng(seed)
+    chunk_size = max(1, min(chunk_size, (1 << 24) // len(pnls)))
+    max_drawdown = np.empty(samples, dtype=np.float32)
+    for start in range(0, samples, chunk_size):
+        size = min(chunk_size, samples - start)
+        equity = rng.permuted(np.broadcast_to(pnls, (size, len(pnls))), axis=1)
+        np.cumsum(equity, axis=1, out=equity)
+        equity += np.float32(initial_capital)
+        peak = np.maximum(np.maximum.accumulate(equity, axis=1), np.float32(initial_capital))
+        max_drawdown[start:start + size] = ((peak - equity) / peak).max(axis=1)
+    total_return = np.full(samples, pnls.sum(dtype=np.float64) / initial_capital, dtype=np.float32)
+    return {"total_return": total_return, "max_drawdown": max_drawdown}
+
+
+def _interval(point: float, values: np.ndarray, confidence: float) -> ConfidenceInterval:
+    tail = (1 - confidence) / 2
+    lower, upper = np.quantile(values, [tail, 1 - tail])
+    return ConfidenceInterval(
+        point=point,
+        mean=float(values.mean(dtype=np.float64)),
+        lower=float(lower),
+        upper=float(upper)
+    )
+
+
+def analyze_robustness(
+    result: BacktestResult,
+    method: str = "bootstrap",
+    samples: int = 10000,
+    confidence: float = 0.95,
+    block_size: int = 5,
+    seed: Optional[int] = 0
+) -> RobustnessResult:
+    if method not in ROBUSTNESS_METHODS:
+        raise ValueError(f"Unknown robustness method: {method}")
+    if not 0 < confidence < 1:
+        raise ValueError("置信水平必须在0和1之间")
+
+    if method == "bootstrap":
+        equity = np.asarray(result.equity_curve, dtype=np.float64)
+        resampled = bootstrap_returns(np.diff(equity) / equity[:-1], samples, block_size, seed)
+    else:
+        resampled = shuffle_trades([t.pnl for t in result.trades], result.initial_capital, samples, seed)
+
+    sharpe = resampled.get("sharpe_ratio")
+    return RobustnessResult(
+        method=method,
+        samples=samples,
+        confidence=confidence,
+        block_size=block_size if method == "bootstrap" else None,
+        total_return=_interval(result.total_return, resampled["total_return"], confidence),
+        max_drawdown=_interval(result.max_drawdown, resampled["max_drawdown"], confidence),
+        sharpe_ratio=_interval(result.sharpe_ratio, sharpe, confidence) if sharpe is not None else None
+    )
@@ -0,0 +1,217 @@
+import itertools
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Iterator, Optional
+import numpy as np
+from src.core.engine import BacktestEngine
+from src.models.ohlcv import ARRAY_FIELDS, BarData
+from src.models.result import PerformanceMetrics, SweepResult
+from src.strategy.registry import create_strategy
+
+
+MAX_SWEEP_COMBINATIONS = 5000
+ASCENDING_METRICS = {"max_drawdown", "volatility", "max_drawdown_duration"}
+
+_worker_state: dict[str, Any] = {}
+
+# 回测在任务线程中发起, 直接 fork 会把其他线程持有的锁一并复制到子进程, 改由 forkserver 启动工作进程
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def process_context() -> multiprocessing.context.BaseContext:
+    return multiprocessing.get_context(_START_METHOD)
+
+
+def worker_count(max_workers: Optional[int], tasks: int) -> int:
+    # 工作进程数不超过 CPU 核数和任务数
+    cpus = os.cpu_count() or 1
+    return max(1, min(max_workers or cpus, cpus, tasks))
+
+
+def _grid_values(param_grid: dict[str, list]) -> list[list]:
+    return [
+        list(choices) if isinstance(choices, (list, tuple, range)) else [choices]
+        for choices in param_grid.values()
+    ]
+
+
+def expand_grid(param_grid: dict[str, list]) -> list[dict[str, Any]]:
+    keys = list(param_grid)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*_grid_values(param_grid))]
+
+
+def valid_combinations(strategy_name: str, param_grid: dict[str, list]) -> list[dict[str, Any]]:
+    # 展开和校验参数之前先按各参数取值个数的乘积检查上限
+    total = math.prod(
+        len(choices) if isinstance(choices, (list, tuple, range)) else 1
+        for choices in param_grid.values()
+    )
+    if total > MAX_SWEEP_COMBINATIONS:
+        raise ValueError(f"参数组合数量({total})超过上限{MAX_SWEEP_COMBINATIONS}")
+    return [
+        params for params in expand_grid(param_grid)
+        if create_strategy(strategy_name, params).validate_params()
+    ]
+
+
+def check_sort_metric(sort_by: str):
+    if sort_by != "final_value" and sort_by not in PerformanceMetrics.model_fields:
+        raise ValueError(f"Unknown sort metric: {sort_by}")
+
+
+def rank_value(sort_by: str, metrics: PerformanceMetrics, final_value: float) -> float:
+    # 越小排名越靠前
+    value = final_value if sort_by == "final_value" else getattr(metrics, sort_by)
+    return value if sort_by in ASCENDING_METRICS else -value
+
+
+class SharedBarData:
+    def __init__(self, data: BarData):
+        self.symbol = data.symbol
+        self.adjustment = data.adjustment
+        self.layout: list[tuple[str, str, int, int]] = []
+
+        offset = 0
+        for name in ARRAY_FIELDS:
+            array = getattr(data, name)
+            self.layout.append((name, array.dtype.str, offset, len(array)))
+            offset += array.nbytes
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+
+        for name, dtype, offset, length in self.layout:
+            view = np.ndarray((length,), dtype=dtype, buffer=self.shm.buf, offset=offset)
+            view[:] = getattr(data, name)
+
+    @staticmethod
+    def attach(
+        shm: shared_memory.SharedMemory,
+        symbol: str,
+        adjustment: str,
+        layout: list[tuple[str, str, int, int]]
+    ) -> BarData:
+        arrays = {
+            name: np.ndarray((length,), dtype=dtype, buffer=shm.buf, offset=offset)
+            for name, dtype, offset, length in layout
+        }
+        return BarData.from_arrays(symbol=symbol, adjustment=adjustment, **arrays)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedBarData":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _init_worker(
+    shm_name: str,
+    symbol: str,
+    adjustment: str,
+    layout: list[tuple[str, str, int, int]],
+    strategy_name: str,
+    engine_kwargs: dict[str, float]
+):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_state["shm"] = shm
+    _worker_state["data"] = SharedBarData.attach(shm, symbol, adjustment, layout)
+    _worker_state["strategy_name"] = strategy_name
+    _worker_state["engine_kwargs"] = engine_kwargs
+
+
+def worker_state() -> tuple[BarData, str, dict[str, float]]:
+    # 在 shared_data_pool 的工作进程中取得共享的K线、策略名和引擎参数
+    return _worker_state["data"], _worker_state["strategy_name"], _worker_state["engine_kwargs"]
+
+
+@contextmanager
+def shared_data_pool(
+    data: BarData,
+    strategy_name: str,
+    engine_kwargs: dict[str, float],
+    workers: int
+) -> Iterator[ProcessPoolExecutor]:
+    # K线放入共享内存, 各工作进程只映射一次, 任务参数中不再携带K线
+    with SharedBarData(data) as shared:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=process_context(),
+            initializer=_init_worker,
+            initargs=(
+                shared.shm.name,
+                shared.symbol,
+                shared.adjustment,
+                shared.layout,
+                strategy_name,
+                engine_kwargs
+            )
+        ) as executor:
+            yield executor
+
+
+def _run_params(params: dict[str, Any]) -> tuple[dict, PerformanceMetrics, float, int]:
+    data, strategy_name, engine_kwargs = worker_state()
+    return _run_backtest(data, strategy_name, params, engine_kwargs)
+
+
+def _run_backtest(
+    data: BarData,
+    strategy_name: str,
+    params: dict[str, Any],
+    engine_kwargs: dict[str, float]
+) -> tuple[dict, PerformanceMetrics, float, int]:
+    strategy = create_strategy(strategy_name, params)
+    result = BacktestEngine(**engine_kwargs).run_vectorized(data, strategy, include_trades=False)
+    return params, result.metrics, result.final_value, result.total_trades
+
+
+def run_sweep(
+    data: BarData,
+    strategy_name: str,
+    param_grid: dict[str, list],
+    initial_capital: float = 100000.0,
+    fee_rate: float = 0.0003,
+    slippage: float = 0.0,
+    sort_by: str = "sharpe_ratio",
+    top_n: Optional[int] = None,
+    max_workers: Optional[int] = None
+) -> list[SweepResult]:
+    check_sort_metric(sort_by)
+    if len(data) == 0:
+        raise ValueError("没有可回测的K线数据")
+    combos = valid_combinations(strategy_name, param_grid)
+
+    engine_kwargs = {
+        "initial_capital": initial_capital,
+        "fee_rate": fee_rate,
+        "slippage": slippage,
+    }
+    workers = worker_count(max_workers, len(combos))
+
+    if workers <= 1:
+        outcomes = [_run_backtest(data, strategy_name, params, engine_kwargs) for params in combos]
+    else:
+        with shared_data_pool(data, strategy_name, engine_kwargs, workers) as executor:
+            chunksize = max(1, len(combos) // (workers * 4))
+            outcomes = list(executor.map(_run_params, combos, chunksize=chunksize))
+
+    outcomes.sort(key=lambda outcome: rank_value(sort_by, outcome[1], outcome[2]))
+    if top_n is not None:
+        outcomes = outcomes[:top_n]
+
+    return [
+        SweepResult(
+            rank=rank,
+            params=params,
+            final_value=final_value,
+            total_trades=total_trades,
+            metrics=metrics
+        )
+        for rank, (params, metrics, final_value, total_trades) in enumerate(outcomes, start=1)
+    ]
@@ -0,0 +1,210 @@
+from datetime import date
+from itertools import repeat
+from typing import Any, Optional
+import numpy as np
+from src.core.engine import BacktestEngine
+from src.core.metrics import MetricsAccumulator
+from src.core.sweep import (
+    check_sort_metric,
+    rank_value,
+    shared_data_pool,
+    valid_combinations,
+    worker_count,
+    worker_state,
+)
+from src.models.ohlcv import BarData
+from src.models.result import PerformanceMetrics, WalkForwardResult, WalkForwardWindow
+from src.strategy.registry import create_strategy
+
+
+def walk_forward_windows(
+    n_bars: int,
+    train_bars: int,
+    test_bars: int,
+    anchored: bool = False
+) -> list[tuple[int, int, int]]:
+    # 每个窗口为 (样本内起点, 样本外起点, 样本外终点), 样本外区间首尾相接覆盖样本内之后的全部K线
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError("样本内和样本外K线数量必须大于0")
+    windows = []
+    test_start = train_bars
+    while test_start < n_bars:
+        test_stop = min(test_start + test_bars, n_bars)
+        windows.append((0 if anchored else test_start - train_bars, test_start, test_stop))
+        test_start = test_stop
+    return windows
+
+
+def _evaluate_in_sample(
+    data: BarData,
+    strategy_name: str,
+    params: dict[str, Any],
+    windows: list[tuple[int, int, int]],
+    engine_kwargs: dict[str, float]
+) -> list[tuple[PerformanceMetrics, float]]:
+    # 信号是因果的, 每组参数在全量K线上只生成一次信号, 各窗口回测共享同一份指标和信号的切片
+    targets = create_strategy(strategy_name, params).generate_signal_array(data)
+    engine = BacktestEngine(**engine_kwargs)
+    outcomes = []
+    for train_start, test_start, _ in windows:
+        result = engine.run_targets(
+            data[train_start:test_start],
+            targets[train_start:test_start],
+            strategy_name,
+            include_trades=False
+        )
+        outcomes.append((result.metrics, result.final_value))
+    return outcomes
+
+
+def _evaluate_out_of_sample(
+    data: BarData,
+    strategy_name: str,
+    params: dict[str, Any],
+    window: tuple[int, int, int],
+    engine_kwargs: dict[str, float]
+) -> tuple[list[float], PerformanceMetrics, list[float]]:
+    _, test_start, test_stop = window
+    targets = create_strategy(strategy_name, params).generate_signal_array(data)
+    engine = BacktestEngine(**engine_kwargs)
+    result = engine.run_targets(
+        data[test_start:test_stop],
+        targets[test_start:test_stop],
+        strategy_name,
+        include_trades=False
+    )
+    return result.equity_curve, result.metrics, [closed.pnl for closed in engine.ledger.closed]
+
+
+def _in_sample_task(params: dict[str, Any], windows: list[tuple[int, int, int]]):
+    data, strategy_name, engine_kwargs = worker_state()
+    return _evaluate_in_sample(data, strategy_name, params, windows, engine_kwargs)
+
+
+def _out_of_sample_task(params: dict[str, Any], window: tuple[int, int, int]):
+    data, strategy_name, engine_kwargs = worker_state()
+    return _evaluate_out_of_sample(data, strategy_name, params, window, engine_kwargs)
+
+
+def run_walk_forward(
+    data: BarData,
+    strategy_name: str,
+    param_grid: dict[str, list],
+    train_bars: int,
+    test_bars: int,
+    anchored: bool = False,
+    initial_capital: float = 100000.0,
+    fee_rate: float = 0.0003,
+    slippage: float = 0.0,
+    sort_by: str = "sharpe_ratio",
+    max_workers: Optional[int] = None
+) -> WalkForwardResult:
+    check_sort_metric(sort_by)
+    windows = walk_forward_windows(len(data), train_bars, test_bars, anchored)
+    if not windows:
+        raise ValueError(f"K线数量({len(data)})不足以划分样本内外窗口")
+    combos = valid_combinations(strategy_name, param_grid)
+    if not combos:
+        raise ValueError("没有有效的参数组合")
+
+    engine_kwargs = {
+        "initial_capital": initial_capital,
+        "fee_rate": fee_rate,
+        "slippage": slippage,
+    }
+    workers = worker_count(max_workers, max(len(combos), len(windows)))
+
+    if workers <= 1:
+        in_sample = [
+            _evaluate_in_sample(data, strategy_name, params, windows, engine_kwargs)
+            for params in combos
+        ]
+        chosen = _choose_params(combos, in_sample, sort_by)
+        out_of_sample = [
+            _evaluate_out_of_sample(data, strategy_name, combos[best], window, engine_kwargs)
+            for best, window in zip(chosen, windows)
+        ]
+    else:
+        with shared_data_pool(data, strategy_name, engine_kwargs, workers) as executor:
+            chunksize = max(1, len(combos) // (workers * 4))
+            in_sample = list(executor.map(_in_sample_task, combos, repeat(windows), chunksize=chunksize))
+            chosen = _choose_params(combos, in_sample, sort_by)
+            out_of_sample = list(executor.map(
+                _out_of_sample_task,
+                [combos[best] for best in chosen],
+                windows
+            ))
+
+    return _stitch(data, strategy_name, sort_by, initial_capital, windows, combos, chosen, in_sample, out_of_sample)
+
+
+def _choose_params(
+    combos: list[dict[str, Any]],
+    in_sample: list[list[tuple[PerformanceMetrics, float]]],
+    sort_by: str
+) -> list[int]:
+    # 每个窗口选样本内排名第一的参数, 并列时取参数网格中靠前的组合
+    return [
+        min(range(len(combos)), key=lambda c: rank_value(sort_by, *in_sample[c][w]))
+        for w in range(len(in_sample[0]))
+    ]
+
+
+def _stitch(
+    data: BarData,
+    strategy_name: str,
+    sort_by: str,
+    initial_capital: float,
+    windows: list[tuple[int, int, int]],
+    combos: list[dict[str, Any]],
+    chosen: list[int],
+    in_sample: list[list[tuple[PerformanceMetrics, float]]],
+    out_of_sample: list[tuple[list[float], PerformanceMetrics, list[float]]]
+) -> WalkForwardResult:
+    # 各样本外窗口以相同初始资金独立回测, 拼接时按收益率复利衔接
+    trade_dates = data.trade_dates
+    accumulator = MetricsAccumulator(initial_capital)
+    equity_curve = [initial_capital]
+    results = []
+    exposed_bars = 0.0
+    total_trades = 0
+    for index, ((train_start, test_start, test_stop), best, (curve, metrics, pnls)) in enumerate(
+        zip(windows, chosen, out_of_sample)
+    ):
+        scale = equity_curve[-1] / curve[0]
+        values = np.asarray(curve[1:]) * scale
+        equity_curve.extend(values.tolist())
+        accumulator.extend(values)
+        for pnl in pnls:
+            accumulator.record_trade(pnl * scale)
+        exposed_bars += metrics.exposure * (test_stop - test_start)
+        total_trades += len(pnls)
+        results.append(WalkForwardWindow(
+            index=index,
+            train_start=trade_dates[train_start].astype(date),
+            train_end=trade_dates[test_start - 1].astype(date),
+            test_start=trade_dates[test_start].astype(date),
+            test_end=trade_dates[test_stop - 1].astype(date),
+            params=combos[best],
+            in_sample=in_sample[best][index][0],
+            out_of_sample=metrics,
+            total_trades=len(pnls)
+        ))
+
+    first_test = windows[0][1]
+    metrics = accumulator.result().model_copy(
+        update={"exposure": exposed_bars / (len(data) - first_test)}
+    )
+    return WalkForwardResult(
+        symbol=data.symbol,
+        strategy_name=strategy_name,
+        sort_by=sort_by,
+        initial_capital=initial_capital,
+        final_value=equity_curve[-1],
+        total_return=metrics.return_rate,
+        metrics=metrics,
+        total_trades=total_trades,
+        windows=results,
+        equity_dates=trade_dates[first_test:].astype(date).tolist(),
+        equity_curve=equity_curve
+    )
@@ -0,0 +1,116 @@
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+import numpy as np
+import pandas as pd
+
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+ADJUSTMENTS = ("qfq", "hfq", "")
+
+
+def exchange_symbol(symbol: str) -> str:
+    if symbol.startswith(("6", "9", "5")):
+        return f"sh{symbol}"
+    if symbol.startswith(("4", "8")):
+        return f"bj{symbol}"
+    return f"sz{symbol}"
+
+
+def normalize_adjustment(adjustment: str) -> str:
+    # 前端的不复权选项传 "none"; qfq/hfq 以外的取值都按不复权处理
+    return adjustment if adjustment in ("qfq", "hfq") else ""
+
+
+def factors_on(
+    dates: np.ndarray,
+    factor_dates: np.ndarray,
+    factors: np.ndarray
+) -> np.ndarray:
+    # 复权因子在除权日生效, 每个交易日取不晚于当日的最近一个因子
+    if len(factors) == 0:
+        return np.ones(len(dates))
+    positions = np.searchsorted(factor_dates, dates.astype("datetime64[D]"), side="right") - 1
+    return factors[np.clip(positions, 0, None)]
+
+
+def apply_adjustment(
+    frame: pd.DataFrame,
+    factor_dates: np.ndarray,
+    factors: np.ndarray,
+    adjustment: str
+) -> pd.DataFrame:
+    if adjustment not in ADJUSTMENTS:
+        raise ValueError(f"Unknown adjustment: {adjustment}")
+    if not adjustment or frame.empty or len(factors) == 0:
+        # 没有复权因子(从未除权或上游缺数据)时价格无需调整
+        return frame
+
+    scale = factors_on(frame["date"].to_numpy(), factor_dates, factors)
+    if adjustment == "qfq":
+        # 前复权以最新因子为基准, 最新价格等于不复权价格
+        scale = scale / factors[-1]
+    adjusted = frame.copy()
+    for field in PRICE_FIELDS:
+        adjusted[field] = frame[field].to_numpy() * scale
+    return adjusted
+
+
+class AdjustmentFactorStore:
+    def __init__(self, root: str | Path, refresh_interval: float = 86400.0):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+
+    def _path(self, symbol: str) -> Path:
+        return self.root / f"{symbol}_factors.npz"
+
+    def _load(self, symbol: str) -> Optional[dict[str, np.ndarray]]:
+        path = self._path(symbol)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                return {key: npz[key] for key in npz.files}
+        except (OSError, ValueError):
+            path.unlink(missing_ok=True)
+            return None
+
+    def save(self, symbol: str, factor_dates: np.ndarray, factors: np.ndarray):
+        path = self._path(symbol)
+        tmp_path = path.with_suffix(".tmp.npz")
+        with self._lock:
+            np.savez(
+                tmp_path,
+                date=factor_dates.astype("datetime64[D]"),
+                factor=factors.astype(np.float64),
+                fetched_at=np.array(time.time())
+            )
+            tmp_path.replace(path)
+
+    def get(
+        self,
+        symbol: str,
+        loader: Callable[[str], tuple[np.ndarray, np.ndarray]]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        arrays = self._load(symbol)
+        if arrays is not None and time.time() - float(arrays["fetched_at"]) < self.refresh_interval:
+            return arrays["date"], arrays["factor"]
+
+        # 出现新的除权除息只需更新因子表, 原始K线不用重新下载
+        try:
+            factor_dates, factors = loader(symbol)
+        except Exception:
+            if arrays is None:
+                raise
+            return arrays["date"], arrays["factor"]
+        self.save(symbol, factor_dates, factors)
+        return factor_dates.astype("datetime64[D]"), factors.astype(np.float64)
+
+    def clear(self, symbol: Optional[str] = None):
+        pattern = f"{symbol}_factors.npz" if symbol else "*_factors.npz"
+        with self._lock:
+            for path in self.root.glob(pattern):
+                path.unlink(missing_ok=True)
@@ -1,10 +1,29 @@
 import akshare as ak
+import numpy as np
+import pandas as pd
 from datetime import date as date_type
 from typing import Optional
-from src.models.ohlcv import OHLCV, BarData
+from src.data.adjustment import AdjustmentFactorStore, apply_adjustment, exchange_symbol, normalize_adjustment
+from src.data.bar_cache import BarCache, empty_frame
+from src.data.security_master import SecurityMaster
+from src.models.ohlcv import BarData
 
 
 class AkshareProvider:
+    def __init__(
+        self,
+        cache: Optional[BarCache] = None,
+        factor_store: Optional[AdjustmentFactorStore] = None,
+        security_master: Optional[SecurityMaster] = None,
+        security_master_refresh: float = 86400.0
+    ):
+        self.cache = cache
+        self.factor_store = factor_store
+        self.security_master = security_master or SecurityMaster(
+            ak.stock_info_a_code_name,
+            refresh_interval=security_master_refresh
+        )
+
     def fetch_stock_daily(
         self,
         symbol: str,
@@ -13,72 +32,96 @@ class AkshareProvider:
         adjustment: str = "qfq"
     ) -> BarData:
         try:
-            if adjustment == "qfq":
-                df = ak.stock_zh_a_hist(
-                    symbol=symbol,
-                    start_date=start_date.strftime("%Y%m%d"),
-                    end_date=end_date.strftime("%Y%m%d"),
-                    adjust="qfq"
-                )
-            elif adjustment == "hfq":
-                df = ak.stock_zh_a_hist(
-                    symbol=symbol,
-                    start_date=start_date.strftime("%Y%m%d"),
-                    end_date=end_date.strftime("%Y%m%d"),
-                    adjust="hfq"
-                )
-            else:
-                df = ak.stock_zh_a_hist(
-                    symbol=symbol,
-                    start_date=start_date.strftime("%Y%m%d"),
-                    end_date=end_date.strftime("%Y%m%d"),
-                    adjust=""
-                )
+            frame = self._raw_daily(symbol, start_date, end_date)
+            adjustment_type = normalize_adjustment(adjustment)
+            if adjustment_type:
+                factor_dates, factors = self._adjustment_factors(symbol)
+                frame = apply_adjustment(frame, factor_dates, factors, adjustment_type)
             
-            bars = []
-            for _, row in df.iterrows():
-                bar = OHLCV(
-                    symbol=symbol,
-                    trade_date=row["日期"],
-                    open_price=row["开盘"],
-                    high_price=row["最高"],
-                    low_price=row["最低"],
-                    close_price=row["收盘"],
-                    volume=row["成交量"],
-                    turnover=row["成交额"],
-                    adjustment=adjustment
-                )
-                bars.append(bar)
-            
-            return BarData(
+            return BarData.from_arrays(
                 symbol=symbol,
-                bars=bars,
+                trade_dates=frame["date"].to_numpy().astype("datetime64[D]"),
+                open_prices=frame["open"].to_numpy(),
+                high_prices=frame["high"].to_numpy(),
+                low_prices=frame["low"].to_numpy(),
+                close_prices=frame["close"].to_numpy(),
+                volumes=frame["volume"].to_numpy(),
+                turnovers=frame["turnover"].to_numpy(),
                 start_date=start_date,
-                end_date=end_date
+                end_date=end_date,
+                adjustment=adjustment
             )
         except Exception as e:
             raise ConnectionError(f"获取股票数据失败: {e}")
     
+    def _raw_daily(
+        self,
+        symbol: str,
+        start_date: date_type,
+        end_date: date_type
+    ) -> pd.DataFrame:
+        # 只缓存不复权K线, 前后复权由因子表在本地计算
+        if self.cache is None:
+            return self._download_daily(symbol, start_date, end_date)
+        for missing_start, missing_end in self.cache.missing_ranges(symbol, "", start_date, end_date):
+            self.cache.merge(
+                symbol,
+                "",
+                self._download_daily(symbol, missing_start, missing_end),
+                missing_start,
+                missing_end
+            )
+        return self.cache.read(symbol, "", start_date, end_date)
+    
+    def _adjustment_factors(self, symbol: str) -> tuple[np.ndarray, np.ndarray]:
+        if self.factor_store is None:
+            return self._download_factors(symbol)
+        return self.factor_store.get(symbol, self._download_factors)
+    
+    def _download_factors(self, symbol: str) -> tuple[np.ndarray, np.ndarray]:
+        df = ak.stock_zh_a_daily(symbol=exchange_symbol(symbol), adjust="hfq-factor")
+        if df is None or df.empty:
+            return np.empty(0, dtype="datetime64[D]"), np.empty(0, dtype=np.float64)
+        df = df.assign(date=pd.to_datetime(df["date"])).sort_values("date")
+        return (
+            df["date"].to_numpy().astype("datetime64[D]"),
+            df["hfq_factor"].astype(np.float64).to_numpy()
+        )
+    
+    def _download_daily(
+        self,
+        symbol: str,
+        start_date: date_type,
+        end_date: date_type
+    ) -> pd.DataFrame:
+        df = ak.stock_zh_a_hist(
+            symbol=symbol,
+            start_date=start_date.strftime("%Y%m%d"),
+            end_date=end_date.strftime("%Y%m%d"),
+            adjust=""
+        )
+        
+        if df is None or df.empty:
+            return empty_frame()
+        return pd.DataFrame({
+            "date": pd.to_datetime(df["日期"]).astype("datetime64[ns]"),
+            "open": df["开盘"].astype(np.float64),
+            "high": df["最高"].astype(np.float64),
+            "low": df["最低"].astype(np.float64),
+            "close": df["收盘"].astype(np.float64),
+            "volume": df["成交量"].astype(np.int64),
+            "turnover": df["成交额"].astype(np.float64),
+        })
+    
     def get_stock_info(self, symbol: str) -> dict:
         try:
-            df = ak.stock_info_a_code_name()
-            row = df[df["code"] == symbol]
-            if row.empty:
-                return {"name": symbol, "market": "unknown"}
-            return {
-                "name": row["name"].iloc[0],
-                "market": row["market"].iloc[0] if "market" in row.columns else "A股"
-            }
+            info = self.security_master.get(symbol)
+            return info or {"name": symbol, "market": "unknown"}
         except Exception:
             return {"name": symbol, "market": "unknown"}
     
     def search_stocks(self, keyword: str) -> list[dict]:
         try:
-            df = ak.stock_info_a_code_name()
-            filtered = df[df["name"].str.contains(keyword) | df["code"].str.contains(keyword)]
-            return [
-                {"code": row["code"], "name": row["name"]}
-                for _, row in filtered.head(20).iterrows()
-            ]
+            return self.security_master.search(keyword, limit=20)
         except Exception:
             return []
@@ -0,0 +1,140 @@
+import threading
+from datetime import date as date_type, timedelta
+from pathlib import Path
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+FIELDS = ("open", "high", "low", "close", "volume", "turnover")
+
+
+def empty_frame() -> pd.DataFrame:
+    frame = pd.DataFrame({field: np.empty(0, dtype=np.float64) for field in FIELDS})
+    frame["volume"] = frame["volume"].astype(np.int64)
+    frame.insert(0, "date", np.empty(0, dtype="datetime64[ns]"))
+    return frame
+
+
+class BarCache:
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, symbol: str, adjustment: str) -> Path:
+        return self.root / f"{symbol}_{adjustment or 'none'}.npz"
+
+    def _load(self, symbol: str, adjustment: str) -> Optional[dict[str, np.ndarray]]:
+        path = self._path(symbol, adjustment)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                return {key: npz[key] for key in npz.files}
+        except (OSError, ValueError):
+            path.unlink(missing_ok=True)
+            return None
+
+    def _save(self, symbol: str, adjustment: str, arrays: dict[str, np.ndarray]):
+        path = self._path(symbol, adjustment)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, **arrays)
+        tmp_path.replace(path)
+
+    def coverage(self, symbol: str, adjustment: str) -> Optional[tuple[date_type, date_type]]:
+        arrays = self._load(symbol, adjustment)
+        if arrays is None:
+            return None
+        start, end = arrays["coverage"].astype("datetime64[D]").astype(object)
+        return start, end
+
+    def missing_ranges(
+        self,
+        symbol: str,
+        adjustment: str,
+        start_date: date_type,
+        end_date: date_type
+    ) -> list[tuple[date_type, date_type]]:
+        covered = self.coverage(symbol, adjustment)
+        if covered is None:
+            return [(start_date, end_date)]
+
+        # 缺口一并补齐, 使缓存始终是一段连续区间, 合并时不会丢弃已有历史
+        covered_start, covered_end = covered
+        ranges = []
+        if start_date < covered_start:
+            ranges.append((start_date, covered_start - timedelta(days=1)))
+        if end_date > covered_end:
+            ranges.append((covered_end + timedelta(days=1), end_date))
+        return ranges
+
+    def merge(
+        self,
+        symbol: str,
+        adjustment: str,
+        frame: pd.DataFrame,
+        start_date: date_type,
+        end_date: date_type
+    ):
+        # 当日行情可能尚未收盘, 覆盖区间只记到昨天, 下次请求会重新拉取
+        end_date = min(end_date, date_type.today() - timedelta(days=1))
+
+        with self._lock:
+            existing = self._load(symbol, adjustment)
+            new_dates = frame["date"].to_numpy().astype("datetime64[D]")
+            new_coverage = np.array([start_date, end_date], dtype="datetime64[D]")
+
+            if existing is not None:
+                covered_start, covered_end = existing["coverage"]
+                adjacent = (
+                    new_coverage[0] <= covered_end + np.timedelta64(1, "D")
+                    and new_coverage[1] >= covered_start - np.timedelta64(1, "D")
+                )
+            else:
+                adjacent = False
+
+            if adjacent:
+                keep = ~np.isin(existing["date"], new_dates)
+                dates = np.concatenate([existing["date"][keep], new_dates])
+                columns = {
+                    field: np.concatenate([existing[field][keep], frame[field].to_numpy()])
+                    for field in FIELDS
+                }
+                new_coverage = np.array(
+                    [min(covered_start, new_coverage[0]), max(covered_end, new_coverage[1])],
+                    dtype="datetime64[D]"
+                )
+            else:
+                dates = new_dates
+                columns = {field: frame[field].to_numpy() for field in FIELDS}
+
+            order = np.argsort(dates, kind="stable")
+            arrays = {"date": dates[order], "coverage": new_coverage}
+            arrays.update({field: columns[field][order] for field in FIELDS})
+            arrays["volume"] = arrays["volume"].astype(np.int64)
+            self._save(symbol, adjustment, arrays)
+
+    def read(
+        self,
+        symbol: str,
+        adjustment: str,
+        start_date: date_type,
+        end_date: date_type
+    ) -> pd.DataFrame:
+        arrays = self._load(symbol, adjustment)
+        if arrays is None:
+            return empty_frame()
+
+        dates = arrays["date"]
+        lo = np.searchsorted(dates, np.datetime64(start_date, "D"), side="left")
+        hi = np.searchsorted(dates, np.datetime64(end_date, "D"), side="right")
+        frame = pd.DataFrame({field: arrays[field][lo:hi] for field in FIELDS})
+        frame.insert(0, "date", dates[lo:hi].astype("datetime64[ns]"))
+        return frame
+
+    def clear(self, symbol: Optional[str] = None):
+        pattern = f"{symbol}_*.npz" if symbol else "*.npz"
+        with self._lock:
+            for path in self.root.glob(pattern):
+                path.unlink(missing_ok=True)
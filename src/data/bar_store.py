@@ -0,0 +1,123 @@
+import json
+import shutil
+from datetime import date as date_type
+from pathlib import Path
+from typing import Iterable, Optional
+import numpy as np
+import pandas as pd
+from src.data.security_master import SecurityMaster
+from src.models.ohlcv import ARRAY_FIELDS, BarData
+
+
+INDEX_FILE = "index.json"
+
+
+def write_bar_store(root: str | Path, universe: Iterable[BarData], adjustment: str = "qfq") -> Path:
+    root = Path(root)
+    universe = [data for data in universe if len(data)]
+    total = sum(len(data) for data in universe)
+
+    # 先写入临时目录再整体替换, 正在读取旧文件的进程不受影响
+    tmp_root = root.with_name(f"{root.name}.tmp")
+    shutil.rmtree(tmp_root, ignore_errors=True)
+    tmp_root.mkdir(parents=True)
+    index: dict[str, list[int]] = {}
+    for name, dtype in ARRAY_FIELDS.items():
+        array = np.lib.format.open_memmap(tmp_root / f"{name}.npy", mode="w+", dtype=dtype, shape=(total,))
+        offset = 0
+        for data in universe:
+            length = len(data)
+            array[offset:offset + length] = getattr(data, name)
+            index[data.symbol] = [offset, length]
+            offset += length
+        array.flush()
+        del array
+
+    with open(tmp_root / INDEX_FILE, "w", encoding="utf-8") as f:
+        json.dump({"adjustment": adjustment, "symbols": index}, f)
+    if root.exists():
+        shutil.rmtree(root)
+    tmp_root.rename(root)
+    return root
+
+
+class BarStore:
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        with open(self.root / INDEX_FILE, encoding="utf-8") as f:
+            meta = json.load(f)
+        self.adjustment: str = meta["adjustment"]
+        self.index: dict[str, tuple[int, int]] = {
+            symbol: (offset, length) for symbol, (offset, length) in meta["symbols"].items()
+        }
+        # 各列以只读内存映射打开, 多个工作进程共享同一份页缓存
+        self.arrays: dict[str, np.ndarray] = {
+            name: np.load(self.root / f"{name}.npy", mmap_mode="r") for name in ARRAY_FIELDS
+        }
+        self.security_master = SecurityMaster(self._load_securities, refresh_interval=float("inf"))
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self.index)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get(
+        self,
+        symbol: str,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None
+    ) -> BarData:
+        if symbol not in self.index:
+            raise KeyError(f"数据仓库中没有股票: {symbol}")
+        offset, length = self.index[symbol]
+        lo, hi = offset, offset + length
+        dates = self.arrays["trade_dates"]
+        if start_date is not None:
+            lo += int(np.searchsorted(dates[lo:hi], np.datetime64(start_date, "D"), side="left"))
+        if end_date is not None:
+            hi = lo + int(np.searchsorted(dates[lo:hi], np.datetime64(end_date, "D"), side="right"))
+
+        # 数据写入时已按 BarData 的类型存储, 直接构造零拷贝视图
+        return BarData.model_construct(
+            symbol=symbol,
+            start_date=start_date,
+            end_date=end_date,
+            adjustment=self.adjustment,
+            **{name: array[lo:hi] for name, array in self.arrays.items()}
+        )
+
+    def load_universe(
+        self,
+        symbols: Optional[Iterable[str]] = None,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None
+    ) -> list[BarData]:
+        return [self.get(symbol, start_date, end_date) for symbol in (symbols or self.index)]
+
+    def fetch_stock_daily(
+        self,
+        symbol: str,
+        start_date: date_type,
+        end_date: date_type,
+        adjustment: str = "qfq"
+    ) -> BarData:
+        if adjustment != self.adjustment:
+            raise ValueError(f"数据仓库复权类型为 {self.adjustment or 'none'}, 不支持 {adjustment or 'none'}")
+        return self.get(symbol, start_date, end_date)
+
+    def _load_securities(self) -> pd.DataFrame:
+        path = self.root / "securities.csv"
+        if path.exists():
+            return pd.read_csv(path, dtype=str)
+        return pd.DataFrame({"code": self.symbols, "name": self.symbols})
+
+    def get_stock_info(self, symbol: str) -> dict:
+        return self.security_master.get(symbol) or {"name": symbol, "market": "unknown"}
+
+    def search_stocks(self, keyword: str) -> list[dict]:
+        return self.security_master.search(keyword, limit=20)
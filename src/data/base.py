@@ -0,0 +1,21 @@
+from datetime import date as date_type
+from typing import Protocol, runtime_checkable
+from src.models.ohlcv import BarData
+
+
+@runtime_checkable
+class DataProvider(Protocol):
+    def fetch_stock_daily(
+        self,
+        symbol: str,
+        start_date: date_type,
+        end_date: date_type,
+        adjustment: str = "qfq"
+    ) -> BarData:
+        ...
+
+    def get_stock_info(self, symbol: str) -> dict:
+        ...
+
+    def search_stocks(self, keyword: str) -> list[dict]:
+        ...
@@ -0,0 +1,129 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date as date_type
+from typing import Iterable, Optional
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+from src.models.ohlcv import BarData
+from src.models.panel import BarPanel
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate 必须大于0")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class BulkFetchResult(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    data: dict[str, BarData] = Field(default_factory=dict, description="成功获取的K线")
+    errors: dict[str, str] = Field(default_factory=dict, description="获取失败的股票及原因")
+    attempts: dict[str, int] = Field(default_factory=dict, description="每只股票的请求次数")
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_panel(self, dtype=np.float64) -> BarPanel:
+        return BarPanel.from_bars([data for data in self.data.values() if len(data)], dtype=dtype)
+
+
+class BulkLoader:
+    def __init__(
+        self,
+        provider,
+        max_workers: int = 8,
+        rate: float = 5.0,
+        burst: Optional[float] = None,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10.0
+    ):
+        self.provider = provider
+        self.max_workers = max_workers
+        self.limiter = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def _fetch_one(
+        self,
+        symbol: str,
+        start_date: date_type,
+        end_date: date_type,
+        adjustment: str
+    ) -> tuple[Optional[BarData], Optional[str], int]:
+        attempt = 0
+        while True:
+            attempt += 1
+            self.limiter.acquire()
+            try:
+                data = self.provider.fetch_stock_daily(
+                    symbol=symbol,
+                    start_date=start_date,
+                    end_date=end_date,
+                    adjustment=adjustment
+                )
+                return data, None, attempt
+            except Exception as e:
+                if attempt > self.max_retries:
+                    return None, str(e), attempt
+                # 指数退避加全抖动, 避免并发线程同时重试
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+                logger.warning(f"获取{symbol}失败(第{attempt}次), {delay:.2f}秒内重试: {e}")
+                time.sleep(random.uniform(0, delay))
+
+    def fetch_many(
+        self,
+        symbols: Iterable[str],
+        start_date: date_type,
+        end_date: date_type,
+        adjustment: str = "qfq"
+    ) -> BulkFetchResult:
+        symbols = list(dict.fromkeys(symbols))
+        result = BulkFetchResult()
+        if not symbols:
+            return result
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(symbols)),
+            thread_name_prefix="bulk-fetch"
+        ) as executor:
+            futures = {
+                executor.submit(self._fetch_one, symbol, start_date, end_date, adjustment): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                data, error, attempts = future.result()
+                result.attempts[symbol] = attempts
+                if error is None:
+                    result.data[symbol] = data
+                else:
+                    result.errors[symbol] = error
+
+        result.data = {symbol: result.data[symbol] for symbol in symbols if symbol in result.data}
+        return result
@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date as date_type
+from src.models.ohlcv import ARRAY_FIELDS, BarData
+
+
+def bar_data_nbytes(data: BarData) -> int:
+    return sum(getattr(data, name).nbytes for name in ARRAY_FIELDS)
+
+
+class CoalescingProvider:
+    def __init__(self, provider, max_bytes: int = 64 * 1024 * 1024, ttl: float = 60.0):
+        self.provider = provider
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._cache: OrderedDict[tuple, tuple[BarData, int, float]] = OrderedDict()
+        self._cache_bytes = 0
+        self._inflight: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self.provider, name)
+
+    @property
+    def cache_bytes(self) -> int:
+        return self._cache_bytes
+
+    def fetch_stock_daily(
+        self,
+        symbol: str,
+        start_date: date_type,
+        end_date: date_type,
+        adjustment: str = "qfq"
+    ) -> BarData:
+        key = (symbol, start_date, end_date, adjustment)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                data, _, expires_at = cached
+                if expires_at > time.monotonic():
+                    self._cache.move_to_end(key)
+                    return data
+                self._evict(key)
+
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            return future.result()
+
+        # 同一参数的并发请求只由第一个请求访问上游, 其余等待同一结果
+        try:
+            data = self.provider.fetch_stock_daily(
+                symbol=symbol,
+                start_date=start_date,
+                end_date=end_date,
+                adjustment=adjustment
+            )
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._inflight[key]
+            self._store(key, data)
+        future.set_result(data)
+        return data
+
+    def _store(self, key: tuple, data: BarData):
+        size = bar_data_nbytes(data)
+        if size > self.max_bytes:
+            return
+        if key in self._cache:
+            self._evict(key)
+        self._cache[key] = (data, size, time.monotonic() + self.ttl)
+        self._cache_bytes += size
+        while self._cache_bytes > self.max_bytes:
+            self._evict(next(iter(self._cache)))
+
+    def _evict(self, key: tuple):
+        _, size, _ = self._cache.pop(key)
+        self._cache_bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
@@ -0,0 +1,27 @@
+from src.config import Settings
+from src.data.adjustment import AdjustmentFactorStore
+from src.data.akshare_provider import AkshareProvider
+from src.data.bar_cache import BarCache
+from src.data.bar_store import BarStore
+from src.data.base import DataProvider
+from src.data.file_provider import FileProvider
+from src.data.synthetic import SyntheticProvider
+
+
+def create_data_provider(settings: Settings) -> DataProvider:
+    if settings.data_source == "akshare":
+        return AkshareProvider(
+            cache=BarCache(settings.bar_cache_dir),
+            factor_store=AdjustmentFactorStore(
+                settings.bar_cache_dir,
+                refresh_interval=settings.adjustment_factor_refresh
+            ),
+            security_master_refresh=settings.security_master_refresh
+        )
+    if settings.data_source == "store":
+        return BarStore(settings.data_dir)
+    if settings.data_source == "file":
+        return FileProvider(settings.data_dir)
+    if settings.data_source == "synthetic":
+        return SyntheticProvider(seed=settings.synthetic_seed)
+    raise ValueError(f"Unknown data source: {settings.data_source}")
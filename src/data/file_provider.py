@@ -0,0 +1,91 @@
+from datetime import date as date_type
+from pathlib import Path
+from typing import Optional
+import numpy as np
+import pandas as pd
+from src.data.bar_cache import FIELDS
+from src.data.security_master import SecurityMaster
+from src.models.ohlcv import ARRAY_FIELDS, BarData
+
+
+SECURITIES_FILE = "securities.csv"
+COLUMN_FIELDS = dict(zip(("date",) + FIELDS, ARRAY_FIELDS))
+
+
+class FileProvider:
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        if not self.root.is_dir():
+            raise FileNotFoundError(f"数据目录不存在: {self.root}")
+        self.security_master = SecurityMaster(self._load_securities, refresh_interval=float("inf"))
+
+    def _find(self, symbol: str, adjustment: str) -> Optional[Path]:
+        # 依次查找 {symbol}/ 目录(每列一个 .npy, 内存映射打开)、.npz、.parquet、.csv,
+        # 按复权类型导出的 {symbol}_{qfq|hfq|none} 优先
+        for stem in (f"{symbol}_{adjustment or 'none'}", symbol):
+            directory = self.root / stem
+            if (directory / "date.npy").exists():
+                return directory
+            for suffix in (".npz", ".parquet", ".csv"):
+                path = self.root / f"{stem}{suffix}"
+                if path.exists():
+                    return path
+        return None
+
+    def _read_columns(self, path: Path) -> dict[str, np.ndarray]:
+        if path.is_dir():
+            return {
+                column: np.load(path / f"{column}.npy", mmap_mode="r")
+                for column in COLUMN_FIELDS
+            }
+        if path.suffix == ".npz":
+            with np.load(path, allow_pickle=False) as npz:
+                return {column: npz[column] for column in COLUMN_FIELDS}
+        if path.suffix == ".parquet":
+            frame = pd.read_parquet(path, columns=list(COLUMN_FIELDS), memory_map=True)
+        else:
+            frame = pd.read_csv(path, usecols=list(COLUMN_FIELDS), memory_map=True)
+        columns = {column: frame[column].to_numpy() for column in COLUMN_FIELDS}
+        columns["date"] = pd.to_datetime(frame["date"]).to_numpy()
+        return columns
+
+    def fetch_stock_daily(
+        self,
+        symbol: str,
+        start_date: date_type,
+        end_date: date_type,
+        adjustment: str = "qfq"
+    ) -> BarData:
+        path = self._find(symbol, adjustment)
+        if path is None:
+            raise FileNotFoundError(f"未找到股票数据文件: {symbol}")
+
+        columns = self._read_columns(path)
+        dates = columns["date"].astype("datetime64[D]", copy=False)
+        lo = np.searchsorted(dates, np.datetime64(start_date, "D"), side="left")
+        hi = np.searchsorted(dates, np.datetime64(end_date, "D"), side="right")
+        return BarData.from_arrays(
+            symbol=symbol,
+            start_date=start_date,
+            end_date=end_date,
+            adjustment=adjustment,
+            **{field: columns[column][lo:hi] for column, field in COLUMN_FIELDS.items() if column != "date"},
+            trade_dates=dates[lo:hi]
+        )
+
+    def _load_securities(self) -> pd.DataFrame:
+        path = self.root / SECURITIES_FILE
+        if path.exists():
+            return pd.read_csv(path, dtype=str)
+        symbols = sorted({
+            path.name.split(".")[0].split("_")[0]
+            for path in self.root.iterdir()
+            if path.name != SECURITIES_FILE
+        })
+        return pd.DataFrame({"code": symbols, "name": symbols})
+
+    def get_stock_info(self, symbol: str) -> dict:
+        return self.security_master.get(symbol) or {"name": symbol, "market": "unknown"}
+
+    def search_stocks(self, keyword: str) -> list[dict]:
+        return self.security_master.search(keyword, limit=20)
@@ -0,0 +1,147 @@
+import heapq
+import logging
+import threading
+import time
+from typing import Callable, Optional
+import pandas as pd
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:
+    lazy_pinyin = None
+
+logger = logging.getLogger(__name__)
+
+
+def pinyin_initials(name: str) -> str:
+    if lazy_pinyin is None:
+        return ""
+    return "".join(lazy_pinyin(name, style=Style.FIRST_LETTER)).lower()
+
+
+def _ngrams(text: str) -> set[str]:
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+class _SecurityIndex:
+    def __init__(self, df: pd.DataFrame):
+        self.codes: list[str] = df["code"].astype(str).tolist()
+        self.names: list[str] = df["name"].astype(str).tolist()
+        self.markets: list[str] = (
+            df["market"].astype(str).tolist() if "market" in df.columns
+            else ["A股"] * len(self.codes)
+        )
+        self.initials: list[str] = [pinyin_initials(name) for name in self.names]
+        self.by_code: dict[str, int] = {code: row for row, code in enumerate(self.codes)}
+        self.search_texts: list[tuple[str, ...]] = [
+            (code.lower(), name.lower(), initials)
+            for code, name, initials in zip(self.codes, self.names, self.initials)
+        ]
+
+        # 代码、名称、拼音首字母的一元和二元字串倒排索引, 查询时取交集再校验子串
+        self.postings: dict[str, set[int]] = {}
+        for row, texts in enumerate(self.search_texts):
+            for text in texts:
+                for gram in _ngrams(text):
+                    self.postings.setdefault(gram, set()).add(row)
+
+    def search(self, keyword: str, limit: int) -> list[int]:
+        keyword = keyword.strip().lower()
+        if not keyword:
+            return []
+        grams = [keyword] if len(keyword) == 1 else [keyword[i:i + 2] for i in range(len(keyword) - 1)]
+
+        candidates: Optional[set[int]] = None
+        for gram in sorted(grams, key=lambda g: len(self.postings.get(g, ()))):
+            rows = self.postings.get(gram)
+            if not rows:
+                return []
+            candidates = set(rows) if candidates is None else candidates & rows
+            if not candidates:
+                return []
+
+        matches = [
+            row for row in candidates
+            if any(keyword in text for text in self.search_texts[row])
+        ]
+        return heapq.nsmallest(limit, matches, key=lambda row: (not self.codes[row].startswith(keyword), row))
+
+
+class SecurityMaster:
+    def __init__(
+        self,
+        loader: Callable[[], pd.DataFrame],
+        refresh_interval: float = 86400.0,
+        retry_backoff: float = 60.0
+    ):
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.retry_backoff = retry_backoff
+        self._index: Optional[_SecurityIndex] = None
+        self._next_refresh = 0.0
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _load(self):
+        index = _SecurityIndex(self.loader())
+        self._index = index
+        self._next_refresh = time.monotonic() + self.refresh_interval
+        self._failures = 0
+
+    def _record_failure(self) -> float:
+        # 上游不可用时按指数退避推迟下次加载, 避免每次查询都重新下载
+        self._failures += 1
+        delay = min(
+            self.retry_backoff * 2 ** (self._failures - 1),
+            max(self.refresh_interval, self.retry_backoff)
+        )
+        self._next_refresh = time.monotonic() + delay
+        return delay
+
+    def _background_refresh(self):
+        try:
+            self._load()
+        except Exception as e:
+            delay = self._record_failure()
+            logger.warning(f"刷新证券主数据失败, 继续使用旧数据, {delay:.0f}秒后重试: {e}")
+        finally:
+            self._refreshing = False
+
+    def _ensure_index(self) -> _SecurityIndex:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    if time.monotonic() < self._next_refresh:
+                        raise ConnectionError("证券主数据加载失败, 等待重试")
+                    try:
+                        self._load()
+                    except Exception:
+                        self._record_failure()
+                        raise
+        elif time.monotonic() >= self._next_refresh:
+            with self._lock:
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(target=self._background_refresh, daemon=True).start()
+        return self._index
+
+    def refresh(self):
+        with self._lock:
+            self._load()
+
+    def get(self, symbol: str) -> Optional[dict]:
+        index = self._ensure_index()
+        row = index.by_code.get(symbol)
+        if row is None:
+            return None
+        return {"name": index.names[row], "market": index.markets[row]}
+
+    def search(self, keyword: str, limit: int = 20) -> list[dict]:
+        index = self._ensure_index()
+        return [
+            {"code": index.codes[row], "name": index.names[row]}
+            for row in index.search(keyword, limit)
+        ]
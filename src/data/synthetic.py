@@ -0,0 +1,74 @@
+import zlib
+from datetime import date as date_type
+import numpy as np
+from src.models.ohlcv import BarData
+
+
+EPOCH = np.datetime64("1990-01-01", "D")
+
+
+def synthetic_symbols(count: int) -> list[str]:
+    return [f"{i:06d}" for i in range(1, count + 1)]
+
+
+class SyntheticProvider:
+    def __init__(
+        self,
+        seed: int = 0,
+        initial_price: float = 10.0,
+        drift: float = 0.08,
+        volatility: float = 0.3
+    ):
+        self.seed = seed
+        self.initial_price = initial_price
+        self.drift = drift
+        self.volatility = volatility
+
+    def _rng(self, symbol: str) -> np.random.Generator:
+        return np.random.default_rng([self.seed, zlib.crc32(symbol.encode())])
+
+    def fetch_stock_daily(
+        self,
+        symbol: str,
+        start_date: date_type,
+        end_date: date_type,
+        adjustment: str = "qfq"
+    ) -> BarData:
+        # 路径总是从固定起点生成, 同一股票同一日期的价格与请求区间无关
+        trade_dates = np.arange(EPOCH, np.datetime64(end_date, "D") + 1, dtype="datetime64[D]")
+        trade_dates = trade_dates[np.is_busday(trade_dates)]
+        n = len(trade_dates)
+
+        # 每个交易日按行取一组随机数, 请求区间变长时已有日期的取值不变
+        shocks = self._rng(symbol).standard_normal((n, 5))
+        dt = 1 / 252
+        sigma = self.volatility * np.sqrt(dt)
+        returns = (self.drift - 0.5 * self.volatility ** 2) * dt + sigma * shocks[:, 0]
+        close = self.initial_price * np.exp(np.cumsum(returns))
+        open_ = np.concatenate(([self.initial_price], close[:-1])) * np.exp(0.2 * sigma * shocks[:, 1])
+        high = np.maximum(open_, close) * (1 + 0.5 * sigma * np.abs(shocks[:, 2]))
+        low = np.minimum(open_, close) * (1 - 0.5 * sigma * np.abs(shocks[:, 3]))
+        volumes = np.exp(13 + 0.5 * shocks[:, 4]).astype(np.int64)
+
+        lo = np.searchsorted(trade_dates, np.datetime64(start_date, "D"), side="left")
+        return BarData.from_arrays(
+            symbol=symbol,
+            trade_dates=trade_dates[lo:],
+            open_prices=open_[lo:],
+            high_prices=high[lo:],
+            low_prices=low[lo:],
+            close_prices=close[lo:],
+            volumes=volumes[lo:],
+            turnovers=volumes[lo:] * close[lo:],
+            start_date=start_date,
+            end_date=end_date,
+            adjustment=adjustment
+        )
+
+    def get_stock_info(self, symbol: str) -> dict:
+        return {"name": f"合成{symbol}", "market": "synthetic"}
+
+    def search_stocks(self, keyword: str) -> list[dict]:
+        if not keyword.isdigit():
+            return []
+        return [{"code": keyword.zfill(6), "name": f"合成{keyword.zfill(6)}"}]
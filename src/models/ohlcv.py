@@ -1,6 +1,8 @@
+import hashlib
 from datetime import date as date_type
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Any, Optional
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 
 
 class OHLCV(BaseModel):
@@ -23,18 +25,157 @@ class OHLCV(BaseModel):
         return self.close_price >= self.open_price
 
 
+ARRAY_FIELDS = {
+    "trade_dates": "datetime64[D]",
+    "open_prices": np.float64,
+    "high_prices": np.float64,
+    "low_prices": np.float64,
+    "close_prices": np.float64,
+    "volumes": np.int64,
+    "turnovers": np.float64,
+}
+
+
+def _empty_array(dtype) -> np.ndarray:
+    return np.empty(0, dtype=dtype)
+
+
 class BarData(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     symbol: str = Field(..., description="股票代码")
-    bars: list[OHLCV] = Field(default_factory=list, description="K线数据列表")
     start_date: Optional[date_type] = Field(None, description="起始日期")
     end_date: Optional[date_type] = Field(None, description="结束日期")
-    
+    adjustment: str = Field(default="qfq", description="复权类型")
+    trade_dates: np.ndarray = Field(default_factory=lambda: _empty_array("datetime64[D]"), description="交易日期")
+    open_prices: np.ndarray = Field(default_factory=lambda: _empty_array(np.float64), description="开盘价")
+    high_prices: np.ndarray = Field(default_factory=lambda: _empty_array(np.float64), description="最高价")
+    low_prices: np.ndarray = Field(default_factory=lambda: _empty_array(np.float64), description="最低价")
+    close_prices: np.ndarray = Field(default_factory=lambda: _empty_array(np.float64), description="收盘价")
+    volumes: np.ndarray = Field(default_factory=lambda: _empty_array(np.int64), description="成交量")
+    turnovers: np.ndarray = Field(default_factory=lambda: _empty_array(np.float64), description="成交额")
+
+    _bars: Optional[list[OHLCV]] = PrivateAttr(default=None)
+    _fingerprint: Optional[str] = PrivateAttr(default=None)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_bars(cls, values: Any) -> Any:
+        if not isinstance(values, dict) or values.get("bars") is None:
+            return values
+        values = dict(values)
+        bars = values.pop("bars")
+        values["trade_dates"] = np.array([bar.trade_date for bar in bars], dtype="datetime64[D]")
+        values["open_prices"] = np.array([bar.open_price for bar in bars], dtype=np.float64)
+        values["high_prices"] = np.array([bar.high_price for bar in bars], dtype=np.float64)
+        values["low_prices"] = np.array([bar.low_price for bar in bars], dtype=np.float64)
+        values["close_prices"] = np.array([bar.close_price for bar in bars], dtype=np.float64)
+        values["volumes"] = np.array([bar.volume for bar in bars], dtype=np.int64)
+        values["turnovers"] = np.array([bar.turnover for bar in bars], dtype=np.float64)
+        if bars and "adjustment" not in values:
+            values["adjustment"] = bars[0].adjustment
+        return values
+
+    @model_validator(mode="after")
+    def _check_arrays(self) -> "BarData":
+        length = len(self.trade_dates)
+        for name, dtype in ARRAY_FIELDS.items():
+            array = getattr(self, name)
+            if array.dtype != np.dtype(dtype):
+                array = np.ascontiguousarray(array, dtype=dtype)
+                object.__setattr__(self, name, array)
+            if array.ndim != 1 or len(array) != length:
+                raise ValueError(f"{name} 长度({len(array)})与交易日期数量({length})不一致")
+        return self
+
+    @classmethod
+    def from_arrays(
+        cls,
+        symbol: str,
+        trade_dates: np.ndarray,
+        open_prices: np.ndarray,
+        high_prices: np.ndarray,
+        low_prices: np.ndarray,
+        close_prices: np.ndarray,
+        volumes: np.ndarray,
+        turnovers: np.ndarray,
+        start_date: Optional[date_type] = None,
+        end_date: Optional[date_type] = None,
+        adjustment: str = "qfq"
+    ) -> "BarData":
+        return cls(
+            symbol=symbol,
+            start_date=start_date,
+            end_date=end_date,
+            adjustment=adjustment,
+            trade_dates=trade_dates,
+            open_prices=open_prices,
+            high_prices=high_prices,
+            low_prices=low_prices,
+            close_prices=close_prices,
+            volumes=volumes,
+            turnovers=turnovers
+        )
+
+    @property
+    def bars(self) -> list[OHLCV]:
+        if self._bars is None:
+            self._bars = [self.bar_at(i) for i in range(len(self))]
+        return self._bars
+
+    @property
+    def fingerprint(self) -> str:
+        # K线内容的摘要, 内容相同的数据集共享指标和回测缓存; 计算后数组设为只读, 防止原地修改使摘要失效
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(f"{self.symbol}|{self.adjustment}".encode())
+            for name in ARRAY_FIELDS:
+                array = getattr(self, name)
+                array.setflags(write=False)
+                digest.update(np.ascontiguousarray(array).view(np.uint8))
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def model_copy(self, *, update: Optional[dict[str, Any]] = None, deep: bool = False) -> "BarData":
+        # 复制时可能替换了数组, 摘要和逐根K线缓存需重新计算
+        copied = super().model_copy(update=update, deep=deep)
+        copied._fingerprint = None
+        copied._bars = None
+        return copied
+
     @property
     def total_bars(self) -> int:
-        return len(self.bars)
+        return len(self.trade_dates)
+
+    def bar_at(self, index: int) -> OHLCV:
+        return OHLCV.model_construct(
+            symbol=self.symbol,
+            trade_date=self.trade_dates[index].astype(date_type),
+            open_price=float(self.open_prices[index]),
+            high_price=float(self.high_prices[index]),
+            low_price=float(self.low_prices[index]),
+            close_price=float(self.close_prices[index]),
+            volume=int(self.volumes[index]),
+            turnover=float(self.turnovers[index]),
+            adjustment=self.adjustment
+        )
+
+    def slice(self, start: int, stop: int) -> "BarData":
+        return self.model_construct(
+            symbol=self.symbol,
+            start_date=None,
+            end_date=None,
+            adjustment=self.adjustment,
+            **{name: getattr(self, name)[start:stop] for name in ARRAY_FIELDS}
+        )
     
     def __len__(self) -> int:
         return self.total_bars
     
-    def __getitem__(self, index: int) -> OHLCV:
-        return self.bars[index]
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("BarData 切片不支持步长")
+            return self.slice(start, stop)
+        return self.bar_at(index)
@@ -0,0 +1,63 @@
+from datetime import date as date_type
+from typing import Iterable, Union
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+from src.models.ohlcv import BarData
+
+
+class BarPanel(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    symbols: list[str] = Field(..., description="股票代码列表")
+    trade_dates: np.ndarray = Field(..., description="所有股票交易日的并集")
+    row_index: list[np.ndarray] = Field(..., description="每只股票的K线在并集日历中的行号")
+    close_prices: np.ndarray = Field(..., description="收盘价矩阵(日期×股票), 停牌日为NaN")
+    marks: np.ndarray = Field(..., description="估值价格矩阵, 停牌日沿用最近收盘价")
+    tradable: np.ndarray = Field(..., description="当日是否有K线")
+
+    @classmethod
+    def from_bars(
+        cls,
+        universe: Union[dict[str, BarData], Iterable[BarData]],
+        dtype=np.float64
+    ) -> "BarPanel":
+        bars = list(universe.values()) if isinstance(universe, dict) else list(universe)
+        if not bars:
+            raise ValueError("股票池为空")
+
+        trade_dates = np.unique(np.concatenate([data.trade_dates for data in bars]))
+        n_dates, n_symbols = len(trade_dates), len(bars)
+
+        close_prices = np.full((n_dates, n_symbols), np.nan, dtype=dtype)
+        tradable = np.zeros((n_dates, n_symbols), dtype=bool)
+        row_index = []
+        for column, data in enumerate(bars):
+            rows = np.searchsorted(trade_dates, data.trade_dates)
+            close_prices[rows, column] = data.close_prices
+            tradable[rows, column] = True
+            row_index.append(rows)
+
+        # 停牌日沿用上一个有效收盘价: 用行号的前向最大值代替逐日查找
+        last_row = np.where(tradable, np.arange(n_dates, dtype=np.int32)[:, None], 0)
+        np.maximum.accumulate(last_row, axis=0, out=last_row)
+        marks = np.take_along_axis(close_prices, last_row, axis=0)
+
+        return cls(
+            symbols=[data.symbol for data in bars],
+            trade_dates=trade_dates,
+            row_index=row_index,
+            close_prices=close_prices,
+            marks=marks,
+            tradable=tradable
+        )
+
+    @property
+    def start_date(self) -> date_type:
+        return self.trade_dates[0].astype(date_type)
+
+    @property
+    def end_date(self) -> date_type:
+        return self.trade_dates[-1].astype(date_type)
+
+    def __len__(self) -> int:
+        return len(self.trade_dates)
@@ -11,6 +11,10 @@ class PerformanceMetrics(BaseModel):
     max_drawdown: float = Field(..., description="最大回撤")
     win_rate: float = Field(..., description="胜率")
     profit_loss_ratio: float = Field(..., description="盈亏比")
+    sortino_ratio: float = Field(default=0.0, description="索提诺比率")
+    calmar_ratio: float = Field(default=0.0, description="卡玛比率")
+    max_drawdown_duration: int = Field(default=0, description="最长回撤持续K线数")
+    exposure: float = Field(default=0.0, description="持仓时间占比")
 
 
 class TradeRecord(BaseModel):
@@ -45,3 +49,95 @@ class BacktestResult(BaseModel):
     max_drawdown: float = Field(..., description="最大回撤")
     trades: list[TradeRecord] = Field(default_factory=list, description="交易记录")
     equity_curve: list[float] = Field(default_factory=list, description="资金曲线")
+
+
+class SweepResult(BaseModel):
+    rank: int = Field(..., description="排名")
+    params: dict = Field(..., description="策略参数")
+    final_value: float = Field(..., description="最终资产")
+    total_trades: int = Field(..., description="总交易次数")
+    metrics: PerformanceMetrics = Field(..., description="性能指标")
+
+
+class PortfolioResult(BaseModel):
+    symbols: list[str] = Field(..., description="股票代码列表")
+    strategy_name: str = Field(..., description="策略名称")
+    start_date: date = Field(..., description="回测起始日期")
+    end_date: date = Field(..., description="回测结束日期")
+    initial_capital: float = Field(..., description="初始资金")
+    final_value: float = Field(..., description="最终资产")
+    total_return: float = Field(..., description="总收益率")
+    metrics: PerformanceMetrics = Field(..., description="性能指标")
+    total_trades: int = Field(..., description="总交易次数")
+    win_rate: float = Field(..., description="胜率")
+    sharpe_ratio: float = Field(..., description="夏普比率")
+    max_drawdown: float = Field(..., description="最大回撤")
+    trades: list[TradeRecord] = Field(default_factory=list, description="交易记录")
+    equity_curve: list[float] = Field(default_factory=list, description="资金曲线")
+
+
+class WalkForwardWindow(BaseModel):
+    index: int = Field(..., description="窗口序号")
+    train_start: date = Field(..., description="样本内起始日期")
+    train_end: date = Field(..., description="样本内结束日期")
+    test_start: date = Field(..., description="样本外起始日期")
+    test_end: date = Field(..., description="样本外结束日期")
+    params: dict = Field(..., description="样本内选出的策略参数")
+    in_sample: PerformanceMetrics = Field(..., description="样本内性能指标")
+    out_of_sample: PerformanceMetrics = Field(..., description="样本外性能指标")
+    total_trades: int = Field(..., description="样本外交易次数")
+
+
+class WalkForwardResult(BaseModel):
+    symbol: str = Field(..., description="股票代码")
+    strategy_name: str = Field(..., description="策略名称")
+    sort_by: str = Field(..., description="参数选择指标")
+    initial_capital: float = Field(..., description="初始资金")
+    final_value: float = Field(..., description="最终资产")
+    total_return: float = Field(..., description="样本外总收益率")
+    metrics: PerformanceMetrics = Field(..., description="拼接后样本外性能指标")
+    total_trades: int = Field(..., description="样本外总交易次数")
+    windows: list[WalkForwardWindow] = Field(default_factory=list, description="各窗口结果")
+    equity_dates: list[date] = Field(default_factory=list, description="样本外资金曲线日期")
+    equity_curve: list[float] = Field(default_factory=list, description="拼接后的样本外资金曲线")
+
+
+class ConfidenceInterval(BaseModel):
+    point: float = Field(..., description="原始回测值")
+    mean: float = Field(..., description="重采样均值")
+    lower: float = Field(..., description="置信区间下限")
+    upper: float = Field(..., description="置信区间上限")
+
+
+class RobustnessResult(BaseModel):
+    method: str = Field(..., description="重采样方法")
+    samples: int = Field(..., description="重采样次数")
+    confidence: float = Field(..., description="置信水平")
+    block_size: Optional[int] = Field(None, description="自助法块长度")
+    total_return: ConfidenceInterval = Field(..., description="总收益率区间")
+    max_drawdown: ConfidenceInterval = Field(..., description="最大回撤区间")
+    sharpe_ratio: Optional[ConfidenceInterval] = Field(None, description="夏普比率区间")
+
+
+class RebalanceRecord(BaseModel):
+    trade_date: date = Field(..., description="调仓日期")
+    selected: list[str] = Field(default_factory=list, description="入选股票")
+    turnover: float = Field(..., description="成交金额")
+    commission: float = Field(..., description="手续费")
+
+
+class CrossSectionResult(BaseModel):
+    symbols: list[str] = Field(..., description="股票池")
+    factor: str = Field(..., description="因子名称")
+    factor_params: dict = Field(default_factory=dict, description="因子参数")
+    top_n: int = Field(..., description="持仓数量")
+    rebalance: str = Field(..., description="调仓频率")
+    start_date: date = Field(..., description="回测起始日期")
+    end_date: date = Field(..., description="回测结束日期")
+    initial_capital: float = Field(..., description="初始资金")
+    final_value: float = Field(..., description="最终资产")
+    total_return: float = Field(..., description="总收益率")
+    metrics: PerformanceMetrics = Field(..., description="性能指标")
+    total_commission: float = Field(..., description="累计手续费")
+    rebalances: list[RebalanceRecord] = Field(default_factory=list, description="调仓记录")
+    equity_curve: list[float] = Field(default_factory=list, description="资金曲线")
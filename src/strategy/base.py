@@ -1,9 +1,11 @@
-from abc import ABC, abstractmethod
+from abc import ABC
 from datetime import datetime, date
 from enum import Enum
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
-from src.models.ohlcv import BarData
+from typing import Optional, Dict, Any, Protocol, runtime_checkable
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+from src.models.ohlcv import OHLCV, BarData
+from src.strategy.features import FeatureCache, feature_cache
 
 
 class SignalType(str, Enum):
@@ -21,14 +23,173 @@ class Signal(BaseModel):
     reason: Optional[str] = Field(None, description="信号原因")
 
 
+class SignalArrays(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    indices: np.ndarray = Field(..., description="信号所在K线下标")
+    directions: np.ndarray = Field(..., description="方向: 1买入, -1卖出")
+    strengths: np.ndarray = Field(..., description="信号强度")
+    prices: np.ndarray = Field(..., description="信号价格")
+    reason_codes: np.ndarray = Field(..., description="原因模板编号")
+    reason_args: np.ndarray = Field(..., description="原因模板参数, 每个信号一行")
+    reasons: Optional[list[Optional[str]]] = Field(None, description="已格式化的原因, 仅由 Signal 列表转换时存在")
+
+    @classmethod
+    def build(
+        cls,
+        indices: np.ndarray,
+        directions: np.ndarray,
+        strengths: Any,
+        prices: np.ndarray,
+        reason_codes: np.ndarray,
+        reason_args: np.ndarray,
+        reasons: Optional[list[Optional[str]]] = None
+    ) -> "SignalArrays":
+        n = len(indices)
+        reason_args = np.asarray(reason_args, dtype=np.float64)
+        if reason_args.ndim != 2:
+            reason_args = reason_args.reshape(n, -1) if n else np.empty((0, 0))
+        return cls.model_construct(
+            indices=np.asarray(indices, dtype=np.int64),
+            directions=np.asarray(directions, dtype=np.int8),
+            strengths=np.broadcast_to(np.asarray(strengths, dtype=np.float64), (n,)),
+            prices=np.asarray(prices, dtype=np.float64),
+            reason_codes=np.asarray(reason_codes, dtype=np.int16),
+            reason_args=reason_args,
+            reasons=reasons
+        )
+
+    @classmethod
+    def empty(cls) -> "SignalArrays":
+        return cls.build([], [], [], [], [], [])
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+
+class LazyReason:
+    # 信号原因在成交记录真正生成时才格式化
+    __slots__ = ("strategy", "signals", "position")
+
+    def __init__(self, strategy: "Strategy", signals: SignalArrays, position: int):
+        self.strategy = strategy
+        self.signals = signals
+        self.position = position
+
+    def __str__(self) -> str:
+        return self.strategy.describe(self.signals, self.position) or ""
+
+    def __bool__(self) -> bool:
+        if self.signals.reasons is not None:
+            return bool(self.signals.reasons[self.position])
+        return bool(self.signals.reason_codes[self.position] >= 0)
+
+
 class Strategy(ABC):
+    # 同一数据集上的指标序列在所有策略实例和参数组合间共享
+    features: FeatureCache = feature_cache
+    # 信号原因模板, 位置参数来自 reason_args, 关键字参数来自策略参数
+    REASONS: tuple[str, ...] = ()
+    
+    def __new__(cls, *args: Any, **kwargs: Any):
+        if cls is Strategy:
+            raise TypeError("Strategy 是抽象基类, 不能直接实例化")
+        return super().__new__(cls)
+    
+    def __init_subclass__(cls, **kwargs: Any):
+        # 子类至少实现 generate_signals 和 generate_signal_arrays 之一, 两者默认互相转换
+        super().__init_subclass__(**kwargs)
+        if (
+            cls.generate_signals is Strategy.generate_signals
+            and cls.generate_signal_arrays is Strategy.generate_signal_arrays
+        ):
+            raise TypeError(f"{cls.__name__} 必须实现 generate_signals 或 generate_signal_arrays")
+    
     def __init__(self, name: str, params: Optional[Dict[str, Any]] = None):
         self.name = name
         self.params = params or {}
     
-    @abstractmethod
     def generate_signals(self, data: BarData) -> list[Signal]:
+        signals = self.generate_signal_arrays(data)
+        trade_dates = data.trade_dates[signals.indices].astype(date).tolist()
+        return [
+            Signal(
+                symbol=data.symbol,
+                signal_type=SignalType.BUY if direction > 0 else SignalType.SELL,
+                price=price,
+                timestamp=trade_date,
+                strength=strength,
+                reason=self.describe(signals, k)
+            )
+            for k, (trade_date, direction, price, strength) in enumerate(zip(
+                trade_dates,
+                signals.directions.tolist(),
+                signals.prices.tolist(),
+                signals.strengths.tolist()
+            ))
+        ]
+    
+    def generate_signal_arrays(self, data: BarData) -> SignalArrays:
+        signals = [
+            signal for signal in self.generate_signals(data)
+            if signal.signal_type in (SignalType.BUY, SignalType.SELL)
+        ]
+        timestamps = np.array([signal.timestamp for signal in signals], dtype="datetime64[D]")
+        indices = np.searchsorted(data.trade_dates, timestamps)
+        matched = indices < len(data)
+        matched[matched] = data.trade_dates[indices[matched]] == timestamps[matched]
+        signals = [signal for signal, keep in zip(signals, matched.tolist()) if keep]
+        return SignalArrays.build(
+            indices=indices[matched],
+            directions=[1 if signal.signal_type == SignalType.BUY else -1 for signal in signals],
+            strengths=[signal.strength for signal in signals],
+            prices=[signal.price for signal in signals],
+            reason_codes=np.full(len(signals), -1),
+            reason_args=np.empty((len(signals), 0)),
+            reasons=[signal.reason for signal in signals]
+        )
+    
+    def describe(self, signals: SignalArrays, position: int) -> Optional[str]:
+        if signals.reasons is not None:
+            return signals.reasons[position]
+        code = int(signals.reason_codes[position])
+        if code < 0:
+            return None
+        return self.REASONS[code].format(*signals.reason_args[position].tolist(), **self.params)
+    
+    def generate_signal_array(self, data: BarData) -> np.ndarray:
+        # 与K线对齐的信号数组: 正数为买入强度, 负数为卖出强度, 0为无信号; 同一天多个信号以最后一个为准
+        targets = np.zeros(len(data), dtype=np.float64)
+        signals = self.generate_signal_arrays(data)
+        values = signals.directions * signals.strengths
+        _, last = np.unique(signals.indices[::-1], return_index=True)
+        keep = len(signals) - 1 - last
+        targets[signals.indices[keep]] = values[keep]
+        return targets
+    
+    @property
+    def lookback(self) -> Optional[int]:
+        # 第 i 根K线的信号只取决于前 lookback 根及当前K线; None 表示依赖全部历史
+        return None
+    
+    def resume_offset(self, data: BarData, first: int) -> int:
+        # 从第 first 根K线续跑时重新生成信号所需的最早K线; 默认按 lookback, 窗口依赖数据的策略可覆盖
+        if self.lookback is None:
+            return 0
+        return max(0, first - self.lookback)
+    
+    def snapshot(self) -> dict:
+        return {}
+    
+    def restore(self, state: dict):
         pass
     
     def validate_params(self) -> bool:
         return True
+
+
+@runtime_checkable
+class IncrementalStrategy(Protocol):
+    # 可选能力: 逐K线增量运行, 用于实盘或流式回放, 状态通过 snapshot/restore 保存和恢复
+    def on_bar(self, bar: OHLCV) -> Optional[Signal]:
+        ...
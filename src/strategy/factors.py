@@ -0,0 +1,42 @@
+from typing import Callable
+import numpy as np
+
+# ---- 横截面因子: 输入日期×股票的估值价格矩阵和需要打分的行号, 输出 (行数, 股票数) 的得分, 越大越好, 无法计算为 NaN ----
+
+
+def momentum(marks: np.ndarray, rows: np.ndarray, lookback: int = 120, skip: int = 0) -> np.ndarray:
+    # 过去 lookback 根K线的涨幅, skip 跳过最近的K线以避开短期反转
+    end = rows - skip
+    start = end - lookback
+    scores = np.full((len(rows), marks.shape[1]), np.nan, dtype=marks.dtype)
+    valid = start >= 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores[valid] = marks[end[valid]] / marks[start[valid]] - 1
+    return scores
+
+
+def low_volatility(marks: np.ndarray, rows: np.ndarray, window: int = 60) -> np.ndarray:
+    # 过去 window 个日收益率的标准差取负, 波动越低得分越高; 逐行计算, 只占用 window×股票数 的临时内存
+    scores = np.full((len(rows), marks.shape[1]), np.nan, dtype=marks.dtype)
+    for k, row in enumerate(rows.tolist()):
+        if row < window:
+            continue
+        prices = marks[row - window:row + 1]
+        returns = prices[1:] / prices[:-1] - 1
+        scores[k] = -returns.std(axis=0)
+    return scores
+
+
+FACTORS: dict[str, Callable[..., np.ndarray]] = {
+    "momentum": momentum,
+    "low_volatility": low_volatility,
+}
+
+
+def rank_cross_section(scores: np.ndarray) -> np.ndarray:
+    # 每行按得分从高到低排名, 1 为最好, 得分相同按股票顺序, NaN 不参与排名
+    order = np.argsort(np.where(np.isnan(scores), np.inf, -scores), axis=1, kind="stable")
+    ranks = np.empty(scores.shape, dtype=np.float32)
+    np.put_along_axis(ranks, order, np.arange(1, scores.shape[1] + 1, dtype=np.float32), axis=1)
+    ranks[np.isnan(scores)] = np.nan
+    return ranks
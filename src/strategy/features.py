@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Union
+import numpy as np
+from src.models.ohlcv import BarData
+from src.strategy import indicators
+
+
+Feature = Union[np.ndarray, tuple[np.ndarray, ...]]
+
+# 指标名 -> (批量计算函数, 输入的K线字段)
+INDICATORS: dict[str, tuple[Callable[..., Feature], tuple[str, ...]]] = {
+    "sma": (indicators.sma, ("close_prices",)),
+    "ema": (indicators.ema, ("close_prices",)),
+    "rsi": (indicators.rsi, ("close_prices",)),
+    "atr": (indicators.atr, ("high_prices", "low_prices", "close_prices")),
+    "bollinger": (indicators.bollinger, ("close_prices",)),
+    "macd": (indicators.macd, ("close_prices",)),
+}
+
+
+def _feature_nbytes(feature: Feature) -> int:
+    if isinstance(feature, tuple):
+        return sum(array.nbytes for array in feature)
+    return feature.nbytes
+
+
+def _freeze(feature: Feature) -> Feature:
+    # 缓存的序列被多个策略共享, 设为只读防止被原地修改
+    arrays = feature if isinstance(feature, tuple) else (feature,)
+    for array in arrays:
+        array.setflags(write=False)
+    return feature
+
+
+class FeatureCache:
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._features: OrderedDict[tuple, tuple[Feature, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, data: BarData, name: str, **params: Any) -> Feature:
+        if name not in INDICATORS:
+            raise ValueError(f"Unknown indicator: {name}")
+        key = (data.fingerprint, name, tuple(sorted(params.items())))
+        with self._lock:
+            cached = self._features.get(key)
+            if cached is not None:
+                self._features.move_to_end(key)
+                self.hits += 1
+                return cached[0]
+            self.misses += 1
+
+        compute, fields = INDICATORS[name]
+        feature = _freeze(compute(*(getattr(data, field) for field in fields), **params))
+        size = _feature_nbytes(feature)
+        if size > self.max_bytes:
+            return feature
+
+        with self._lock:
+            if key not in self._features:
+                self._features[key] = (feature, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, evicted) = self._features.popitem(last=False)
+                    self._bytes -= evicted
+        return feature
+
+    def clear(self):
+        with self._lock:
+            self._features.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+feature_cache = FeatureCache()
@@ -0,0 +1,298 @@
+from collections import deque
+from typing import Optional
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# ---- 批量计算: 输入 numpy 数组, 输出与输入等长的 float64 数组, 预热期为 NaN ----
+
+def _nan_array(n: int) -> np.ndarray:
+    return np.full(n, np.nan)
+
+
+def _ewm(values: np.ndarray, alpha: float) -> np.ndarray:
+    # y[0] = x[0], y[t] = (1 - alpha) * y[t-1] + alpha * x[t]
+    return pd.Series(values, copy=False).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def _wilder(values: np.ndarray, period: int) -> np.ndarray:
+    # Wilder 平滑: 前 period 个值的简单平均作为初值, 之后按 1/period 递推
+    out = _nan_array(len(values))
+    if len(values) < period:
+        return out
+    seeded = values[period - 1:].copy()
+    seeded[0] = values[:period].mean()
+    out[period - 1:] = _ewm(seeded, 1 / period)
+    return out
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    out = _nan_array(len(values))
+    if len(values) >= window:
+        # 每个窗口独立求均值, 结果只取决于窗口内数据
+        out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return values.copy()
+    return _ewm(values, 2 / (span + 1))
+
+
+def rsi(close: np.ndarray, period: int = 14, smoothing: str = "wilder") -> np.ndarray:
+    close = np.asarray(close, dtype=np.float64)
+    if smoothing not in ("wilder", "sma"):
+        raise ValueError(f"Unknown smoothing: {smoothing}")
+    if len(close) == 0:
+        return close.copy()
+
+    # 第一根K线的涨跌按0计入, sma 模式与原先的滚动均值实现逐点一致
+    delta = np.diff(close, prepend=close[0])
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    if smoothing == "wilder":
+        avg_gain, avg_loss = _wilder(gain[1:], period), _wilder(loss[1:], period)
+        avg_gain, avg_loss = np.concatenate(([np.nan], avg_gain)), np.concatenate(([np.nan], avg_loss))
+    else:
+        avg_gain, avg_loss = sma(gain, period), sma(loss, period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    return _wilder(true_range(high, low, close), period)
+
+
+def bollinger(
+    close: np.ndarray,
+    window: int = 20,
+    num_std: float = 2.0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    close = np.asarray(close, dtype=np.float64)
+    mid = sma(close, window)
+    std = _nan_array(len(close))
+    if len(close) >= window:
+        std[window - 1:] = sliding_window_view(close, window).std(axis=1)
+    return mid, mid + num_std * std, mid - num_std * std
+
+
+def macd(
+    close: np.ndarray,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+# ---- 增量计算: 每根新K线 O(1) 更新, 状态可快照与恢复 ----
+
+class Indicator:
+    _state_fields: tuple[str, ...] = ()
+
+    def snapshot(self) -> dict:
+        state = {}
+        for name in self._state_fields:
+            value = getattr(self, name)
+            if isinstance(value, Indicator):
+                value = value.snapshot()
+            elif isinstance(value, (deque, list)):
+                value = list(value)
+            state[name] = value
+        return state
+
+    def restore(self, state: dict):
+        for name in self._state_fields:
+            current = getattr(self, name)
+            if isinstance(current, Indicator):
+                current.restore(state[name])
+            elif isinstance(current, deque):
+                setattr(self, name, deque(state[name], maxlen=current.maxlen))
+            elif isinstance(current, list):
+                setattr(self, name, list(state[name]))
+            else:
+                setattr(self, name, state[name])
+
+
+class SMA(Indicator):
+    _state_fields = ("_window_values", "_sum", "_updates")
+
+    def __init__(self, window: int):
+        self.window = window
+        self._window_values: deque = deque(maxlen=window)
+        self._sum = 0.0
+        self._updates = 0
+
+    @property
+    def value(self) -> Optional[float]:
+        if len(self._window_values) < self.window:
+            return None
+        return self._sum / self.window
+
+    def update(self, value: float) -> Optional[float]:
+        if len(self._window_values) == self.window:
+            self._sum -= self._window_values[0]
+        self._window_values.append(value)
+        self._sum += value
+        self._updates += 1
+        # 定期按窗口重新求和, 消除滑动累加的浮点误差, 均摊仍为 O(1)
+        if self._updates % self.window == 0:
+            self._sum = sum(self._window_values)
+        return self.value
+
+
+class EMA(Indicator):
+    _state_fields = ("_value",)
+
+    def __init__(self, span: Optional[int] = None, alpha: Optional[float] = None):
+        if (span is None) == (alpha is None):
+            raise ValueError("span 和 alpha 必须且只能指定一个")
+        self.alpha = alpha if alpha is not None else 2 / (span + 1)
+        self._value: Optional[float] = None
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._value
+
+    def update(self, value: float) -> float:
+        if self._value is None:
+            self._value = value
+        else:
+            self._value += self.alpha * (value - self._value)
+        return self._value
+
+
+class _Wilder(Indicator):
+    _state_fields = ("_seed", "_value")
+
+    def __init__(self, period: int):
+        self.period = period
+        self._seed: list[float] = []
+        self._value: Optional[float] = None
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._value
+
+    def update(self, value: float) -> Optional[float]:
+        if self._value is not None:
+            self._value += (value - self._value) / self.period
+        else:
+            self._seed.append(value)
+            if len(self._seed) == self.period:
+                self._value = sum(self._seed) / self.period
+                self._seed = []
+        return self._value
+
+
+class RSI(Indicator):
+    _state_fields = ("_prev_close", "_avg_gain", "_avg_loss")
+
+    def __init__(self, period: int = 14, smoothing: str = "wilder"):
+        if smoothing not in ("wilder", "sma"):
+            raise ValueError(f"Unknown smoothing: {smoothing}")
+        self.period = period
+        self.smoothing = smoothing
+        average = _Wilder if smoothing == "wilder" else SMA
+        self._prev_close: Optional[float] = None
+        self._avg_gain = average(period)
+        self._avg_loss = average(period)
+
+    @property
+    def value(self) -> Optional[float]:
+        avg_gain, avg_loss = self._avg_gain.value, self._avg_loss.value
+        if avg_gain is None or avg_loss is None:
+            return None
+        if avg_loss == 0:
+            return 100.0 if avg_gain > 0 else None
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+    def update(self, close: float) -> Optional[float]:
+        if self._prev_close is not None:
+            delta = close - self._prev_close
+            self._avg_gain.update(max(delta, 0.0))
+            self._avg_loss.update(max(-delta, 0.0))
+        elif self.smoothing == "sma":
+            self._avg_gain.update(0.0)
+            self._avg_loss.update(0.0)
+        self._prev_close = close
+        return self.value
+
+
+class ATR(Indicator):
+    _state_fields = ("_prev_close", "_average")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._prev_close: Optional[float] = None
+        self._average = _Wilder(period)
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._average.value
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        tr = high - low
+        if self._prev_close is not None:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        return self._average.update(tr)
+
+
+class Bollinger(Indicator):
+    _state_fields = ("_mean", "_sq_mean")
+
+    def __init__(self, window: int = 20, num_std: float = 2.0):
+        self.window = window
+        self.num_std = num_std
+        self._mean = SMA(window)
+        self._sq_mean = SMA(window)
+
+    @property
+    def value(self) -> Optional[tuple[float, float, float]]:
+        mid, sq_mean = self._mean.value, self._sq_mean.value
+        if mid is None:
+            return None
+        std = max(sq_mean - mid * mid, 0.0) ** 0.5
+        return mid, mid + self.num_std * std, mid - self.num_std * std
+
+    def update(self, close: float) -> Optional[tuple[float, float, float]]:
+        self._mean.update(close)
+        self._sq_mean.update(close * close)
+        return self.value
+
+
+class MACD(Indicator):
+    _state_fields = ("_fast", "_slow", "_signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = EMA(fast)
+        self._slow = EMA(slow)
+        self._signal = EMA(signal)
+
+    @property
+    def value(self) -> Optional[tuple[float, float, float]]:
+        if self._signal.value is None:
+            return None
+        line = self._fast.value - self._slow.value
+        return line, self._signal.value, line - self._signal.value
+
+    def update(self, close: float) -> tuple[float, float, float]:
+        line = self._fast.update(close) - self._slow.update(close)
+        self._signal.update(line)
+        return self.value
@@ -1,10 +1,21 @@
-import pandas as pd
+import numpy as np
+from datetime import date
 from typing import Optional
-from src.strategy.base import Strategy, Signal, SignalType
-from src.models.ohlcv import BarData
+from src.strategy import indicators
+from src.strategy.base import Strategy, Signal, SignalArrays, SignalType
+from src.models.ohlcv import OHLCV, BarData
+
+
+GOLDEN_CROSS = 0
+DEATH_CROSS = 1
 
 
 class MACrossStrategy(Strategy):
+    REASONS = (
+        "金叉: 短期MA({0:.2f})上穿长期MA({1:.2f})",
+        "死叉: 短期MA({0:.2f})下穿长期MA({1:.2f})",
+    )
+    
     def __init__(
         self,
         short_window: int = 5,
@@ -24,46 +35,92 @@ class MACrossStrategy(Strategy):
         self.position_ratio = position_ratio
         self._previous_short_ma: Optional[float] = None
         self._previous_long_ma: Optional[float] = None
+        self._short_sma = indicators.SMA(short_window)
+        self._long_sma = indicators.SMA(long_window)
     
-    def generate_signals(self, data: BarData) -> list[Signal]:
-        if len(data.bars) < self.long_window:
-            return []
+    @property
+    def lookback(self) -> int:
+        # 判断交叉需要前一根K线的长均线
+        return self.long_window
+    
+    def validate_params(self) -> bool:
+        return 0 < self.short_window < self.long_window and 0 < self.position_ratio <= 1
+    
+    def generate_signal_arrays(self, data: BarData) -> SignalArrays:
+        start = self.long_window - 1
+        if len(data) <= start:
+            return SignalArrays.empty()
         
-        closes = [float(bar.close_price) for bar in data.bars]
-        df = pd.DataFrame({"close": closes})
-        df["short_ma"] = df["close"].rolling(window=self.short_window).mean()
-        df["long_ma"] = df["close"].rolling(window=self.long_window).mean()
+        short_ma = self.features.get(data, "sma", window=self.short_window)[start:]
+        long_ma = self.features.get(data, "sma", window=self.long_window)[start:]
+        prev_short, prev_long = short_ma[:-1], long_ma[:-1]
+        curr_short, curr_long = short_ma[1:], long_ma[1:]
         
-        signals = []
-        for i, row in df.iterrows():
-            if pd.isna(row["short_ma"]) or pd.isna(row["long_ma"]):
-                continue
-            
-            if self._previous_short_ma is not None and self._previous_long_ma is not None:
-                prev_short = self._previous_short_ma
-                curr_short = float(row["short_ma"])
-                curr_long = float(row["long_ma"])
-                
-                if prev_short <= self._previous_long_ma and curr_short > curr_long:
-                    signals.append(Signal(
-                        symbol=data.symbol,
-                        signal_type=SignalType.BUY,
-                        price=data.bars[i].close_price,
-                        timestamp=data.bars[i].trade_date,
-                        strength=self.position_ratio,
-                        reason=f"金叉: 短期MA({curr_short:.2f})上穿长期MA({curr_long:.2f})"
-                    ))
-                elif prev_short >= self._previous_long_ma and curr_short < curr_long:
-                    signals.append(Signal(
-                        symbol=data.symbol,
-                        signal_type=SignalType.SELL,
-                        price=data.bars[i].close_price,
-                        timestamp=data.bars[i].trade_date,
-                        strength=self.position_ratio,
-                        reason=f"死叉: 短期MA({curr_short:.2f})下穿长期MA({curr_long:.2f})"
-                    ))
+        golden = (prev_short <= prev_long) & (curr_short > curr_long)
+        death = (prev_short >= prev_long) & (curr_short < curr_long)
+        crossed = np.flatnonzero(golden | death)
+        is_golden = golden[crossed]
+        return SignalArrays.build(
+            indices=crossed + start + 1,
+            directions=np.where(is_golden, 1, -1),
+            strengths=self.position_ratio,
+            prices=data.close_prices[crossed + start + 1],
+            reason_codes=np.where(is_golden, GOLDEN_CROSS, DEATH_CROSS),
+            reason_args=np.column_stack((curr_short[crossed], curr_long[crossed]))
+        )
+    
+    def on_bar(self, bar: OHLCV) -> Optional[Signal]:
+        short_ma = self._short_sma.update(bar.close_price)
+        long_ma = self._long_sma.update(bar.close_price)
+        if short_ma is None or long_ma is None:
+            return None
+        return self._cross_signal(bar.symbol, bar.trade_date, bar.close_price, short_ma, long_ma)
+    
+    def snapshot(self) -> dict:
+        return {
+            "short_sma": self._short_sma.snapshot(),
+            "long_sma": self._long_sma.snapshot(),
+            "previous_short_ma": self._previous_short_ma,
+            "previous_long_ma": self._previous_long_ma
+        }
+    
+    def restore(self, state: dict):
+        self._short_sma.restore(state["short_sma"])
+        self._long_sma.restore(state["long_sma"])
+        self._previous_short_ma = state["previous_short_ma"]
+        self._previous_long_ma = state["previous_long_ma"]
+    
+    def _cross_signal(
+        self,
+        symbol: str,
+        trade_date: date,
+        price: float,
+        curr_short: float,
+        curr_long: float
+    ) -> Optional[Signal]:
+        signal = None
+        if self._previous_short_ma is not None and self._previous_long_ma is not None:
+            prev_short = self._previous_short_ma
             
-            self._previous_short_ma = float(row["short_ma"])
-            self._previous_long_ma = float(row["long_ma"])
+            if prev_short <= self._previous_long_ma and curr_short > curr_long:
+                signal = Signal(
+                    symbol=symbol,
+                    signal_type=SignalType.BUY,
+                    price=price,
+                    timestamp=trade_date,
+                    strength=self.position_ratio,
+                    reason=self.REASONS[GOLDEN_CROSS].format(curr_short, curr_long)
+                )
+            elif prev_short >= self._previous_long_ma and curr_short < curr_long:
+                signal = Signal(
+                    symbol=symbol,
+                    signal_type=SignalType.SELL,
+                    price=price,
+                    timestamp=trade_date,
+                    strength=self.position_ratio,
+                    reason=self.REASONS[DEATH_CROSS].format(curr_short, curr_long)
+                )
         
-        return signals
+        self._previous_short_ma = curr_short
+        self._previous_long_ma = curr_long
+        return signal
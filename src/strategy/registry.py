@@ -0,0 +1,21 @@
+import inspect
+from typing import Any, Optional
+from src.strategy.base import Strategy
+from src.strategy.ma_cross import MACrossStrategy
+from src.strategy.rsi import RSIStrategy
+
+
+STRATEGIES: dict[str, type[Strategy]] = {
+    "ma_cross": MACrossStrategy,
+    "rsi": RSIStrategy,
+}
+
+
+def create_strategy(name: str, params: Optional[dict[str, Any]] = None) -> Strategy:
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {name}")
+    
+    strategy_cls = STRATEGIES[name]
+    accepted = inspect.signature(strategy_cls.__init__).parameters
+    kwargs = {key: value for key, value in (params or {}).items() if key in accepted}
+    return strategy_cls(**kwargs)
@@ -1,16 +1,28 @@
-import pandas as pd
-from typing import Optional
-from src.strategy.base import Strategy, Signal, SignalType
-from src.models.ohlcv import BarData
+import numpy as np
+from datetime import date
+from typing import Literal, Optional
+from src.strategy import indicators
+from src.strategy.base import Strategy, Signal, SignalArrays, SignalType
+from src.models.ohlcv import OHLCV, BarData
+
+
+OVERSOLD_CROSS = 0
+OVERBOUGHT_CROSS = 1
 
 
 class RSIStrategy(Strategy):
+    REASONS = (
+        "RSI超卖金叉: RSI({0:.2f})上穿{oversold}",
+        "RSI超买死叉: RSI({0:.2f})下穿{overbought}",
+    )
+    
     def __init__(
         self,
         period: int = 14,
         oversold: float = 30.0,
         overbought: float = 70.0,
-        position_ratio: float = 1.0
+        position_ratio: float = 1.0,
+        smoothing: Literal["sma", "wilder"] = "sma"
     ):
         super().__init__(
             name="rsi",
@@ -18,62 +30,106 @@ class RSIStrategy(Strategy):
                 "period": period,
                 "oversold": oversold,
                 "overbought": overbought,
-                "position_ratio": position_ratio
+                "position_ratio": position_ratio,
+                "smoothing": smoothing
             }
         )
         self.period = period
         self.oversold = oversold
         self.overbought = overbought
         self.position_ratio = position_ratio
+        self.smoothing = smoothing
         self._previous_rsi: Optional[float] = None
+        self._rsi: Optional[indicators.RSI] = None
     
-    def generate_signals(self, data: BarData) -> list[Signal]:
-        if len(data.bars) < self.period:
-            return []
-        
-        closes = [float(bar.close_price) for bar in data.bars]
-        df = pd.DataFrame({"close": closes})
-        
-        delta = df["close"].diff()
-        gain = delta.where(delta > 0, 0)
-        loss = (-delta).where(delta < 0, 0)
-        
-        avg_gain = gain.rolling(window=self.period).mean()
-        avg_loss = loss.rolling(window=self.period).mean()
+    def resume_offset(self, data: BarData, first: int) -> int:
+        # sma 平滑的 RSI 只用最近 period 个涨跌, 再加一根K线提供首个涨跌的前收盘价; wilder 平滑依赖全部历史.
+        # 信号与上一个有效 RSI 比较, 连续 period 根以上收盘价不变时 RSI 无法计算, 窗口需回溯到最后一次价格变动之前
+        if self.smoothing != "sma":
+            return 0
+        changes = np.flatnonzero(np.diff(data.close_prices[:first]))
+        last_change = int(changes[-1]) + 1 if len(changes) else first
+        return max(0, min(first - 1 - self.period, last_change - 1))
+    
+    def validate_params(self) -> bool:
+        return (
+            self.period > 0
+            and 0 <= self.oversold < self.overbought <= 100
+            and 0 < self.position_ratio <= 1
+            and self.smoothing in ("sma", "wilder")
+        )
+    
+    def generate_signal_arrays(self, data: BarData) -> SignalArrays:
+        if len(data) < self.period:
+            return SignalArrays.empty()
         
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        df["rsi"] = rsi
+        rsi = self.features.get(data, "rsi", period=self.period, smoothing=self.smoothing)
+        # 与上一个有效 RSI 比较, 中间无法计算的K线跳过
+        valid = np.flatnonzero(~np.isnan(rsi))
+        prev_rsi, curr_rsi = rsi[valid[:-1]], rsi[valid[1:]]
         
-        signals = []
-        for i, row in df.iterrows():
-            if pd.isna(row["rsi"]):
-                continue
-            
-            curr_rsi = float(row["rsi"])
-            
-            if self._previous_rsi is not None:
-                prev_rsi = self._previous_rsi
-                
-                if prev_rsi <= self.oversold and curr_rsi > self.oversold:
-                    signals.append(Signal(
-                        symbol=data.symbol,
-                        signal_type=SignalType.BUY,
-                        price=data.bars[i].close_price,
-                        timestamp=data.bars[i].trade_date,
-                        strength=self.position_ratio,
-                        reason=f"RSI超卖金叉: RSI({curr_rsi:.2f})上穿{self.oversold}"
-                    ))
-                elif prev_rsi >= self.overbought and curr_rsi < self.overbought:
-                    signals.append(Signal(
-                        symbol=data.symbol,
-                        signal_type=SignalType.SELL,
-                        price=data.bars[i].close_price,
-                        timestamp=data.bars[i].trade_date,
-                        strength=self.position_ratio,
-                        reason=f"RSI超买死叉: RSI({curr_rsi:.2f})下穿{self.overbought}"
-                    ))
+        oversold_cross = (prev_rsi <= self.oversold) & (curr_rsi > self.oversold)
+        overbought_cross = (prev_rsi >= self.overbought) & (curr_rsi < self.overbought) & ~oversold_cross
+        crossed = np.flatnonzero(oversold_cross | overbought_cross)
+        is_buy = oversold_cross[crossed]
+        indices = valid[1:][crossed]
+        return SignalArrays.build(
+            indices=indices,
+            directions=np.where(is_buy, 1, -1),
+            strengths=self.position_ratio,
+            prices=data.close_prices[indices],
+            reason_codes=np.where(is_buy, OVERSOLD_CROSS, OVERBOUGHT_CROSS),
+            reason_args=curr_rsi[crossed]
+        )
+    
+    @property
+    def _live_rsi(self) -> indicators.RSI:
+        if self._rsi is None:
+            self._rsi = indicators.RSI(self.period, self.smoothing)
+        return self._rsi
+    
+    def on_bar(self, bar: OHLCV) -> Optional[Signal]:
+        curr_rsi = self._live_rsi.update(bar.close_price)
+        if curr_rsi is None:
+            return None
+        return self._cross_signal(bar.symbol, bar.trade_date, bar.close_price, curr_rsi)
+    
+    def snapshot(self) -> dict:
+        return {"rsi": self._live_rsi.snapshot(), "previous_rsi": self._previous_rsi}
+    
+    def restore(self, state: dict):
+        self._live_rsi.restore(state["rsi"])
+        self._previous_rsi = state["previous_rsi"]
+    
+    def _cross_signal(
+        self,
+        symbol: str,
+        trade_date: date,
+        price: float,
+        curr_rsi: float
+    ) -> Optional[Signal]:
+        signal = None
+        if self._previous_rsi is not None:
+            prev_rsi = self._previous_rsi
             
-            self._previous_rsi = curr_rsi
+            if prev_rsi <= self.oversold and curr_rsi > self.oversold:
+                signal = Signal(
+                    symbol=symbol,
+                    signal_type=SignalType.BUY,
+                    price=price,
+                    timestamp=trade_date,
+                    strength=self.position_ratio,
+                    reason=self.REASONS[OVERSOLD_CROSS].format(curr_rsi, **self.params)
+                )
+            elif prev_rsi >= self.overbought and curr_rsi < self.overbought:
+                signal = Signal(
+                    symbol=symbol,
+                    signal_type=SignalType.SELL,
+                    price=price,
+                    timestamp=trade_date,
+                    strength=self.position_ratio,
+                    reason=self.REASONS[OVERBOUGHT_CROSS].format(curr_rsi, **self.params)
+                )
         
-        return signals
+        self._previous_rsi = curr_rsi
+        return signal
@@ -0,0 +1,47 @@
+import gzip
+import json
+import pytest
+import numpy as np
+from src.api.encoding import encode_response, kline_columns
+from src.models.ohlcv import BarData
+
+
+def create_bars(n: int = 300) -> BarData:
+    prices = 10 + np.arange(n) * 0.01
+    return BarData.from_arrays(
+        symbol="000001",
+        trade_dates=np.datetime64("2024-01-01") + np.arange(n),
+        open_prices=prices,
+        high_prices=prices,
+        low_prices=prices,
+        close_prices=prices,
+        volumes=np.full(n, 100),
+        turnovers=prices * 100
+    )
+
+
+def test_kline_columns():
+    columns = kline_columns(create_bars(3))
+    assert columns["date"] == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert columns["volume"] == [100, 100, 100]
+
+
+def test_encode_response_gzip_roundtrip():
+    payload = {"kline": kline_columns(create_bars())}
+    response = encode_response(payload, accept_encoding="gzip, deflate")
+    assert response.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.body)) == payload
+
+
+def test_encode_response_small_body_is_not_compressed():
+    response = encode_response({"ok": True}, accept_encoding="gzip")
+    assert "content-encoding" not in response.headers
+    assert json.loads(response.body) == {"ok": True}
+
+
+def test_encode_response_msgpack():
+    msgpack = pytest.importorskip("msgpack")
+    payload = {"kline": kline_columns(create_bars(5))}
+    response = encode_response(payload, accept="application/msgpack")
+    assert response.media_type == "application/msgpack"
+    assert msgpack.unpackb(response.body) == payload
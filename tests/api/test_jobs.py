@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.api.jobs import JobManager, JobQueueFull, JobStatus
+
+
+def test_job_completes_and_returns_result():
+    manager = JobManager(max_workers=2)
+    job_id = manager.submit(lambda x: x * 2, 21)
+    info = asyncio.run(manager.wait(job_id, timeout=5))
+    assert info.status == JobStatus.SUCCEEDED
+    assert info.result == 42
+    manager.shutdown()
+
+
+def test_process_executor_runs_jobs():
+    manager = JobManager(max_workers=1, executor="process")
+    info = asyncio.run(manager.wait(manager.submit(pow, 2, 10), timeout=30))
+    assert info.status == JobStatus.SUCCEEDED
+    assert info.result == 1024
+    manager.shutdown()
+
+
+def test_failed_job_reports_error():
+    def boom():
+        raise ValueError("bad params")
+
+    manager = JobManager(max_workers=1)
+    info = asyncio.run(manager.wait(manager.submit(boom), timeout=5))
+    assert info.status == JobStatus.FAILED
+    assert info.error == "bad params"
+    manager.shutdown()
+
+
+def test_queue_applies_backpressure():
+    release = threading.Event()
+    manager = JobManager(max_workers=1, max_pending=1)
+    first = manager.submit(release.wait)
+    manager.submit(release.wait)
+    with pytest.raises(JobQueueFull):
+        manager.submit(release.wait)
+    assert manager.get(first).status in (JobStatus.PENDING, JobStatus.RUNNING)
+    release.set()
+    manager.shutdown()
+
+
+def test_acquired_slots_count_toward_capacity():
+    manager = JobManager(max_workers=1, max_pending=0)
+    release = manager.acquire()
+    with pytest.raises(JobQueueFull):
+        manager.submit(lambda: None)
+    release()
+    release()
+    assert manager._active == 0
+    asyncio.run(manager.wait(manager.submit(lambda: None), timeout=5))
+    manager.shutdown()
+
+
+def test_results_expire_after_ttl():
+    manager = JobManager(max_workers=1, result_ttl=0.05)
+    job_id = manager.submit(lambda: "done")
+    asyncio.run(manager.wait(job_id, timeout=5))
+    assert manager.get(job_id) is not None
+    time.sleep(0.1)
+    assert manager.get(job_id) is None
+    manager.shutdown()
+
+
+def test_finished_jobs_are_capped_and_discarded():
+    manager = JobManager(max_workers=1, max_finished=2)
+    job_ids = [manager.submit(lambda i=i: i) for i in range(4)]
+    for job_id in job_ids:
+        asyncio.run(manager.wait(job_id, timeout=5))
+    assert manager.result(job_ids[0]) is None
+    assert manager.result(job_ids[1]) is None
+    assert manager.result(job_ids[3]) == 3
+    manager.discard(job_ids[3])
+    assert manager.get(job_ids[3]) is None
+    assert manager.get(job_ids[2]).result == 2
+    manager.shutdown()
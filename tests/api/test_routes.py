@@ -0,0 +1,232 @@
+import json
+import pytest
+import numpy as np
+from datetime import date
+from fastapi.testclient import TestClient
+from src.api import routes
+from src.api.jobs import JobManager
+from src.core.checkpoint import CheckpointStore
+from src.core.result_cache import ResultCache
+from src.main import app
+from src.models.ohlcv import BarData
+
+
+class StubProvider:
+    def __init__(self, make_bars):
+        self.make_bars = make_bars
+
+    def fetch_stock_daily(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        adjustment: str = "qfq"
+    ) -> BarData:
+        prices = 10 + np.sin(np.arange((end_date - start_date).days) / 5.0)
+        return self.make_bars(
+            prices,
+            symbol=symbol,
+            first_date=str(start_date),
+            start_date=start_date,
+            end_date=end_date,
+            adjustment=adjustment
+        )
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path, make_bars):
+    monkeypatch.setattr(routes, "data_provider", StubProvider(make_bars))
+    monkeypatch.setattr(routes, "result_cache", ResultCache(tmp_path / "results"))
+    monkeypatch.setattr(routes, "checkpoint_store", CheckpointStore(tmp_path / "checkpoints"))
+    return TestClient(app)
+
+
+def backtest_payload(**overrides) -> dict:
+    payload = {
+        "symbol": "000001",
+        "strategy": "ma_cross",
+        "start_date": "2023-01-01",
+        "end_date": "2023-12-31",
+        "params": {"short_window": 5, "long_window": 20},
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_backtest_endpoint(client):
+    retained = len(routes.job_manager._finished)
+    resp = client.post("/api/v1/backtest", json=backtest_payload())
+    body = resp.json()
+    assert body["success"] is True
+    assert len(body["result"]["kline"]) == 364
+    assert len(body["result"]["equity_curve"]) == 365
+    assert "job_id" not in body["result"]
+    assert len(routes.job_manager._finished) == retained
+
+
+def test_backtest_repeated_request_served_from_cache(client):
+    first = client.post("/api/v1/backtest", json=backtest_payload()).json()
+    second = client.post("/api/v1/backtest", json=backtest_payload()).json()
+    assert routes.result_cache.hits == 1
+    assert second["result"]["equity_curve"] == first["result"]["equity_curve"]
+
+    client.post("/api/v1/backtest", json=backtest_payload(fee_rate=0.001))
+    assert routes.result_cache.misses == 2
+
+
+def test_backtest_extended_window_resumes_from_checkpoint(client):
+    client.post("/api/v1/backtest", json=backtest_payload())
+    extended = client.post("/api/v1/backtest", json=backtest_payload(end_date="2024-03-31")).json()
+    assert routes.checkpoint_store.hits == 1
+
+    routes.result_cache.clear()
+    routes.checkpoint_store.clear()
+    full = client.post("/api/v1/backtest", json=backtest_payload(end_date="2024-03-31")).json()
+    assert extended["result"]["equity_curve"] == full["result"]["equity_curve"]
+    assert extended["result"]["trades"] == full["result"]["trades"]
+
+
+def test_backtest_with_robustness(client):
+    payload = backtest_payload(robustness=True, robustness_samples=500)
+    robustness = client.post("/api/v1/backtest", json=payload).json()["result"]["robustness"]
+    assert robustness["samples"] == 500
+    drawdown = robustness["max_drawdown"]
+    assert drawdown["lower"] <= drawdown["mean"] <= drawdown["upper"]
+
+
+def test_backtest_shuffle_robustness_without_trades(client):
+    payload = backtest_payload(
+        params={"short_window": 5, "long_window": 400},
+        robustness=True,
+        robustness_method="shuffle",
+        robustness_samples=500
+    )
+    body = client.post("/api/v1/backtest", json=payload).json()
+    assert body["success"] is True
+    assert body["result"]["total_trades"] == 0
+    assert body["result"]["robustness"] is None
+
+
+def test_backtest_unknown_strategy(client):
+    body = client.post("/api/v1/backtest", json=backtest_payload(strategy="foo")).json()
+    assert body["success"] is False
+
+
+def test_sweep_endpoint(client):
+    payload = backtest_payload(param_grid={"short_window": [3, 5], "long_window": [10, 20]})
+    payload.update(top_n=3, max_workers=1)
+    body = client.post("/api/v1/sweep", json=payload).json()
+    assert body["success"] is True
+    results = body["result"]["results"]
+    assert len(results) == 3
+    assert results[0]["rank"] == 1
+
+
+def test_walk_forward_endpoint(client):
+    payload = backtest_payload(param_grid={"short_window": [3, 5], "long_window": [10, 20]})
+    payload.update(train_bars=120, test_bars=60, max_workers=1)
+    body = client.post("/api/v1/walk-forward", json=payload).json()
+    assert body["success"] is True
+    result = body["result"]
+    assert len(result["windows"]) == 5
+    assert len(result["equity_curve"]) == len(result["equity_dates"]) + 1 == 245
+
+
+def test_portfolio_backtest_endpoint(client):
+    payload = backtest_payload(symbols=["000001", "000002", "600000"])
+    del payload["symbol"]
+    body = client.post("/api/v1/portfolio/backtest", json=payload).json()
+    assert body["success"] is True
+    assert body["result"]["symbols"] == ["000001", "000002", "600000"]
+    assert len(body["result"]["equity_curve"]) == 365
+
+
+def test_cross_section_endpoint(client):
+    payload = backtest_payload(symbols=["000001", "000002", "600000"], factor="momentum")
+    for key in ("symbol", "strategy", "params"):
+        del payload[key]
+    payload.update(factor_params={"lookback": 20}, top_n=2, dtype="float32")
+    body = client.post("/api/v1/cross-section/backtest", json=payload).json()
+    assert body["success"] is True
+    assert body["result"]["symbols"] == ["000001", "000002", "600000"]
+    assert all(len(r["selected"]) <= 2 for r in body["result"]["rebalances"])
+    assert len(body["result"]["equity_curve"]) == 365
+
+
+def test_backtest_job_submit_and_wait(client):
+    resp = client.post("/api/v1/backtest/jobs", json=backtest_payload())
+    assert resp.status_code == 202
+    job_id = resp.json()["job_id"]
+    info = client.get(f"/api/v1/backtest/jobs/{job_id}/wait", params={"timeout": 10}).json()
+    assert info["status"] == "succeeded"
+    assert info["result"]["symbol"] == "000001"
+    assert client.get("/api/v1/backtest/jobs/unknown").status_code == 404
+
+
+def test_backtest_stream_ndjson(client):
+    resp = client.post("/api/v1/backtest/stream", json=backtest_payload(), params={"chunk_size": 100})
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    frames = [json.loads(line) for line in resp.text.splitlines()]
+    assert frames[-1]["type"] == "result"
+
+    equity = [v for f in frames if f["type"] == "equity" for v in f["values"]]
+    closes = [v for f in frames if f["type"] == "kline" for v in f["close"]]
+    trades = [t for f in frames if f["type"] == "trades" for t in f["trades"]]
+    full = client.post("/api/v1/backtest", json=backtest_payload()).json()["result"]
+    assert equity == full["equity_curve"]
+    assert closes == [k["close"] for k in full["kline"]]
+    assert len(trades) == full["total_trades"]
+    assert frames[-1]["final_value"] == full["final_value"]
+
+
+def test_backtest_stream_sse(client):
+    resp = client.post(
+        "/api/v1/backtest/stream",
+        json=backtest_payload(),
+        headers={"Accept": "text/event-stream"}
+    )
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert "event: result" in resp.text
+
+
+def test_backtest_stream_shares_job_slots(client, monkeypatch):
+    manager = JobManager(max_workers=1, max_pending=0)
+    monkeypatch.setattr(routes, "job_manager", manager)
+    release = manager.acquire()
+    assert client.post("/api/v1/backtest/stream", json=backtest_payload()).status_code == 429
+
+    release()
+    assert client.post("/api/v1/backtest/stream", json=backtest_payload()).status_code == 200
+    assert manager._active == 0
+    manager.shutdown()
+
+
+def test_backtest_columnar_layout(client):
+    rows = client.post("/api/v1/backtest", json=backtest_payload()).json()["result"]
+    body = client.post("/api/v1/backtest", json=backtest_payload(layout="columnar")).json()
+    kline = body["result"]["kline"]
+    assert kline["close"] == [k["close"] for k in rows["kline"]]
+    assert kline["date"] == [k["date"] for k in rows["kline"]]
+    assert body["result"]["trades"]["pnl"] == [t["pnl"] for t in rows["trades"]]
+
+
+def test_backtest_downsampled_with_full_series(client):
+    full = client.post("/api/v1/backtest", json=backtest_payload()).json()["result"]
+    body = client.post("/api/v1/backtest", json=backtest_payload(max_points=50)).json()
+    result = body["result"]
+    assert result["downsampled"] is True
+    assert len(result["equity_curve"]) == 50
+    assert len(result["kline"]) <= 50
+    assert "full_resolution" not in result
+
+    series = client.get(f"/api/v1/backtest/jobs/{result['job_id']}/series").json()
+    assert series["equity_curve"] == full["equity_curve"][1:]
+    assert series["kline"]["close"] == [k["close"] for k in full["kline"]]
+
+    zoom = client.get(
+        f"/api/v1/backtest/jobs/{result['job_id']}/series",
+        params={"start": 100, "end": 300, "max_points": 20}
+    ).json()
+    assert len(zoom["equity_curve"]) == 20
+    assert zoom["equity_index"][0] == 101
+    assert zoom["kline"]["index"][0] == 100
@@ -0,0 +1,41 @@
+import pytest
+import numpy as np
+from src.models.ohlcv import BarData
+
+
+def bars_from_prices(
+    prices=None,
+    *,
+    n: int = 250,
+    seed: int = 0,
+    drift: float = 0.0,
+    vol: float = 0.02,
+    symbol: str = "000001",
+    first_date: str = "2020-01-01",
+    keep=None,
+    **kwargs
+) -> BarData:
+    # 由收盘价序列构造逐日K线, 未给出价格时按 seed 生成对数随机游走; keep 为 False 的日期视为停牌
+    if prices is None:
+        rng = np.random.default_rng(seed)
+        prices = 10 * np.exp(np.cumsum(rng.normal(drift, vol, n)))
+    prices = np.asarray(prices, dtype=np.float64)
+    dates = np.datetime64(first_date, "D") + np.arange(len(prices))
+    if keep is not None:
+        prices, dates = prices[keep], dates[keep]
+    return BarData.from_arrays(
+        symbol=symbol,
+        trade_dates=dates,
+        open_prices=prices,
+        high_prices=prices * 1.01,
+        low_prices=prices * 0.99,
+        close_prices=prices,
+        volumes=np.full(len(prices), 1000000),
+        turnovers=prices * 1000000,
+        **kwargs
+    )
+
+
+@pytest.fixture
+def make_bars():
+    return bars_from_prices
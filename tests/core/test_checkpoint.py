@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+from datetime import date
+from src.core.checkpoint import CheckpointStore, checkpoint_key
+from src.core.engine import BacktestEngine
+from src.data.synthetic import SyntheticProvider
+from src.strategy.ma_cross import MACrossStrategy
+from src.strategy.rsi import RSIStrategy
+
+
+def make_data(end: date):
+    return SyntheticProvider(seed=3).fetch_stock_daily("000001", date(2020, 1, 1), end)
+
+
+@pytest.mark.parametrize("make_strategy", [
+    lambda: MACrossStrategy(short_window=5, long_window=20, position_ratio=0.6),
+    lambda: RSIStrategy(period=14, position_ratio=0.5),
+    lambda: RSIStrategy(period=14, position_ratio=0.5, smoothing="wilder"),
+])
+def test_resumed_run_matches_full_run(tmp_path, make_strategy):
+    engine = BacktestEngine(initial_capital=100000.0, fee_rate=0.0003, slippage=0.001)
+    store = CheckpointStore(tmp_path)
+    short = make_data(date(2022, 6, 30))
+    engine.run(short, make_strategy(), checkpoint=True)
+    key = checkpoint_key(short, make_strategy(), **engine.config)
+    store.put(key, engine.last_checkpoint)
+
+    full = make_data(date(2023, 12, 31))
+    checkpoint = CheckpointStore(tmp_path).find(key, full)
+    assert checkpoint is not None and checkpoint.bars == len(short)
+    resumed = engine.run(full, make_strategy(), resume=checkpoint)
+    expected = BacktestEngine(initial_capital=100000.0, fee_rate=0.0003, slippage=0.001).run(full, make_strategy())
+    assert expected.total_trades > 0
+    assert resumed == expected
+
+
+@pytest.mark.parametrize("split", range(74, 81))
+def test_rsi_resume_across_flat_closes(make_bars, split):
+    # 连续 20 根收盘价不变时 RSI 无法计算, 续跑窗口需回溯到平盘之前的最后一个有效 RSI
+    data = make_bars(np.concatenate([np.linspace(20, 10, 60), np.full(20, 10.0), np.linspace(10.2, 14, 40)]))
+    engine = BacktestEngine()
+    engine.run(data[:split], RSIStrategy(), checkpoint=True)
+    resumed = engine.run(data, RSIStrategy(), resume=engine.last_checkpoint)
+    expected = BacktestEngine().run(data, RSIStrategy())
+    assert expected.total_trades > 0
+    assert resumed == expected
+
+
+def test_store_keeps_the_longer_checkpoint(tmp_path):
+    engine = BacktestEngine()
+    checkpoints = []
+    for end in (date(2022, 6, 30), date(2021, 6, 30)):
+        engine.run(make_data(end), MACrossStrategy(5, 20), checkpoint=True)
+        checkpoints.append(engine.last_checkpoint)
+    store = CheckpointStore(tmp_path)
+    for checkpoint in checkpoints:
+        store.put("k", checkpoint)
+    assert CheckpointStore(tmp_path).get("k") == checkpoints[0]
+    assert store.get("k") == checkpoints[0]
+
+
+def test_checkpoint_rejected_when_history_changes(tmp_path):
+    engine = BacktestEngine()
+    strategy = MACrossStrategy(5, 20)
+    data = make_data(date(2021, 12, 31))
+    engine.run(data, strategy, checkpoint=True)
+    store = CheckpointStore(tmp_path)
+    store.put("k", engine.last_checkpoint)
+
+    adjusted = data.model_copy(update={"close_prices": data.close_prices * 0.9})
+    assert store.find("k", adjusted) is None
+    with pytest.raises(ValueError):
+        BacktestEngine().run(adjusted, strategy, resume=engine.last_checkpoint)
+    with pytest.raises(ValueError):
+        BacktestEngine(fee_rate=0.001).run(data, strategy, resume=engine.last_checkpoint)
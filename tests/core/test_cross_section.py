@@ -0,0 +1,72 @@
+import pytest
+import numpy as np
+from src.core.cross_section import CrossSectionEngine, rebalance_rows
+from src.strategy.factors import low_volatility, momentum, rank_cross_section
+
+
+@pytest.fixture
+def create_bars(make_bars):
+    def create(symbol: str, drift: float, vol: float, seed: int, keep=None):
+        return make_bars(seed=seed, drift=drift, vol=vol, symbol=symbol, first_date="2023-01-02", keep=keep)
+    return create
+
+
+def test_rebalance_rows():
+    dates = np.arange(np.datetime64("2024-01-29"), np.datetime64("2024-04-03"))
+    assert dates[rebalance_rows(dates, "monthly")].astype(str).tolist() == [
+        "2024-01-29", "2024-02-01", "2024-03-01", "2024-04-01"
+    ]
+    assert dates[rebalance_rows(dates, "quarterly")].astype(str).tolist() == ["2024-01-29", "2024-04-01"]
+    weekly = dates[rebalance_rows(dates, "weekly")]
+    assert (weekly[1:].astype("datetime64[D]").view("int64") % 7 == 4).all()
+    assert rebalance_rows(dates, 20).tolist() == [0, 20, 40, 60]
+
+
+def test_factor_scores_and_ranks():
+    marks = np.array([[10.0, 10.0, np.nan], [11.0, 9.0, 5.0], [12.1, 9.9, 5.5]])
+    scores = momentum(marks, np.array([0, 2]), lookback=2)
+    assert np.isnan(scores[0]).all()
+    np.testing.assert_allclose(scores[1], [0.21, -0.01, np.nan])
+    ranks = rank_cross_section(np.array([[0.1, np.nan, 0.3, 0.1]]))
+    np.testing.assert_array_equal(ranks, [[2, np.nan, 1, 3]])
+
+    vol = low_volatility(marks, np.array([2]), window=1)
+    np.testing.assert_allclose(vol, [[0.0, 0.0, 0.0]])
+
+
+def test_momentum_top_n_holds_strongest_names(create_bars):
+    universe = [
+        create_bars("000001", 0.004, 0.002, 1),
+        create_bars("000002", -0.003, 0.002, 2),
+        create_bars("000003", 0.002, 0.002, 3),
+        create_bars("000004", -0.001, 0.002, 4),
+    ]
+    engine = CrossSectionEngine(initial_capital=1000000.0, top_n=2, rebalance=20)
+    result = engine.run(universe, "momentum", {"lookback": 40})
+    assert len(result.equity_curve) == 251
+    assert result.rebalances[0].selected == []
+    assert all(set(r.selected) == {"000001", "000003"} for r in result.rebalances[3:])
+    assert result.total_return > 0
+    assert result.total_commission == pytest.approx(sum(r.commission for r in result.rebalances))
+    assert 0 < result.metrics.exposure < 1
+
+
+def test_suspended_holding_is_kept_and_float32_matches(create_bars):
+    keep = np.ones(250, dtype=bool)
+    keep[95:130] = False
+    universe = [
+        create_bars("000001", 0.004, 0.01, 1, keep=keep),
+        create_bars("000002", -0.003, 0.01, 2),
+        create_bars("000003", 0.001, 0.01, 3),
+    ]
+    engine = CrossSectionEngine(initial_capital=1000000.0, top_n=1, rebalance=20)
+    result = engine.run(universe, "momentum", {"lookback": 40})
+    # 停牌期间的调仓日无法卖出, 组合继续持有停牌股票
+    suspended = [r for r in result.rebalances if str(r.trade_date) in ("2023-04-12", "2023-05-02")]
+    assert len(suspended) == 2
+    assert all("000001" not in r.selected for r in suspended)
+    assert "000001" in result.rebalances[4].selected
+    assert min(result.equity_curve) > 0
+
+    compact = engine.run(universe, "momentum", {"lookback": 40}, dtype=np.float32)
+    assert compact.final_value == pytest.approx(result.final_value, rel=1e-4)
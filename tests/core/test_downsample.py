@@ -0,0 +1,31 @@
+import numpy as np
+from src.core.downsample import aggregate_ohlc, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_size():
+    y = np.sin(np.linspace(0, 20, 5000))
+    indices = lttb_indices(y, 200)
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == 4999
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_preserves_spike():
+    y = np.zeros(1000)
+    y[537] = 10.0
+    assert 537 in lttb_indices(y, 50)
+
+
+def test_lttb_returns_all_points_when_small():
+    assert lttb_indices(np.arange(10.0), 20).tolist() == list(range(10))
+
+
+def test_aggregate_ohlc():
+    prices = np.arange(1.0, 11.0)
+    buckets = aggregate_ohlc(prices, prices + 0.5, prices - 0.5, prices, np.ones(10, dtype=np.int64), 5)
+    assert buckets["index"].tolist() == [0, 2, 4, 6, 8]
+    assert buckets["open"].tolist() == [1.0, 3.0, 5.0, 7.0, 9.0]
+    assert buckets["close"].tolist() == [2.0, 4.0, 6.0, 8.0, 10.0]
+    assert buckets["high"].tolist() == [2.5, 4.5, 6.5, 8.5, 10.5]
+    assert buckets["low"].tolist() == [0.5, 2.5, 4.5, 6.5, 8.5]
+    assert buckets["volume"].tolist() == [2, 2, 2, 2, 2]
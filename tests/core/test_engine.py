@@ -1,6 +1,8 @@
 import pytest
+import numpy as np
 from datetime import date, timedelta
 from src.core.engine import BacktestEngine
+from src.strategy.ma_cross import MACrossStrategy
 from src.strategy.base import Strategy, Signal, SignalType
 from src.models.ohlcv import OHLCV, BarData
 
@@ -72,3 +74,64 @@ def test_engine_calculates_metrics():
     result = engine.run(data, strategy)
     assert result.metrics is not None
     assert result.metrics.sharpe_ratio is not None
+
+
+class ArraySignalStrategy(Strategy):
+    def generate_signals(self, data: BarData) -> list[Signal]:
+        return []
+
+    def generate_signal_array(self, data: BarData) -> np.ndarray:
+        targets = np.zeros(len(data))
+        targets[5] = 0.5
+        targets[20] = 1.0
+        targets[40] = -0.5
+        targets[60] = -1.0
+        return targets
+
+
+def assert_same_result(expected, actual):
+    assert actual.final_value == expected.final_value
+    assert actual.equity_curve == expected.equity_curve
+    assert actual.metrics == expected.metrics
+    assert len(actual.trades) == len(expected.trades)
+    for a, b in zip(actual.trades, expected.trades):
+        assert a.model_dump(exclude={"reason"}) == b.model_dump(exclude={"reason"})
+
+
+def test_vectorized_run_matches_event_loop():
+    data = create_simple_bars()
+    strategy = DummyStrategy(name="dummy")
+    expected = BacktestEngine(initial_capital=100000.0, fee_rate=0.0003).run(data, strategy)
+    actual = BacktestEngine(initial_capital=100000.0, fee_rate=0.0003).run_vectorized(data, strategy)
+    assert_same_result(expected, actual)
+
+
+def test_vectorized_run_matches_event_loop_for_ma_cross(make_bars):
+    prices = 10 + np.sin(np.arange(200) / 7.0) + np.arange(200) * 0.01
+    data = make_bars(prices, first_date="2024-01-01")
+    engine = BacktestEngine(initial_capital=100000.0, fee_rate=0.0003, slippage=0.001)
+    expected = engine.run(data, MACrossStrategy(short_window=5, long_window=20, position_ratio=0.6))
+    actual = engine.run_vectorized(data, MACrossStrategy(short_window=5, long_window=20, position_ratio=0.6))
+    assert expected.total_trades > 0
+    assert_same_result(expected, actual)
+
+
+def test_vectorized_run_with_array_strategy():
+    data = create_simple_bars()
+    result = BacktestEngine().run_vectorized(data, ArraySignalStrategy(name="array"))
+    assert len(result.equity_curve) == len(data) + 1
+    assert result.total_trades > 0
+    assert all(t.quantity % 100 == 0 for t in result.trades)
+
+
+def test_iter_run_chunks_rebuild_result():
+    data = create_simple_bars()
+    engine = BacktestEngine()
+    events = list(engine.iter_run(data, DummyStrategy(name="dummy"), chunk_size=30))
+    kind, result = events[-1]
+    assert kind == "result"
+    equity = [v for kind, payload in events if kind == "equity" for v in payload["values"]]
+    trades = [t for kind, payload in events if kind == "trades" for t in payload]
+    assert equity == result.equity_curve
+    assert trades == result.trades
+    assert [p["processed"] for kind, p in events if kind == "progress"] == [30, 60, 90, 100]
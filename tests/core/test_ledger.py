@@ -0,0 +1,38 @@
+import pytest
+from datetime import date
+from src.core.ledger import PositionLedger
+
+
+def test_fifo_partial_close_keeps_running_cost_basis():
+    ledger = PositionLedger(fee_rate=0.0)
+    ledger.open("000001", date(2024, 1, 2), 10.0, 100, "买入1")
+    ledger.open("000001", date(2024, 1, 3), 12.0, 200, "买入2")
+    assert ledger.quantity("000001") == 300
+    assert ledger.positions["000001"].avg_cost == pytest.approx(34 / 3)
+
+    ledger.close("000001", date(2024, 1, 4), 13.0, 200, 0.5, "卖出", ("sell", 0.5, 300, 200))
+    assert [(c.entry_price, c.quantity) for c in ledger.closed] == [(10.0, 100), (12.0, 100)]
+    assert ledger.quantity("000001") == 100
+    assert ledger.open_quantity == 100
+    assert ledger.positions["000001"].avg_cost == pytest.approx(12.0)
+
+    ledger.close_all_lots("000001", date(2024, 1, 5), 11.0)
+    assert ledger.quantity("000001") == 0
+    assert ledger.open_quantity == 0
+    assert len(ledger) == 3
+
+
+def test_records_are_built_lazily_and_memoized():
+    ledger = PositionLedger(fee_rate=0.001)
+    ledger.open("000001", date(2024, 1, 2), 10.0, 100, "金叉")
+    ledger.close("000001", date(2024, 1, 3), 11.0, 100, 1.0, None, ("sell", 1.0, 100, 100))
+    records = ledger.records()
+    assert [r.trade_id for r in records] == ["t1"]
+    assert records[0].reason.startswith("金叉 | 仓位管理")
+    assert records[0].pnl == round(1100 - 1000 - 1.0 - 1.1, 2)
+
+    ledger.open("000001", date(2024, 1, 4), 10.0, 100)
+    ledger.close_all_lots("000001", date(2024, 1, 5), 10.0)
+    assert ledger.records()[0] is records[0]
+    assert [r.trade_id for r in ledger.records(1)] == ["t2"]
+    assert "强制平仓" in ledger.records(1)[0].reason
@@ -0,0 +1,50 @@
+import pytest
+import numpy as np
+from src.core.metrics import MetricsAccumulator
+
+
+def test_accumulator_matches_batch_statistics():
+    rng = np.random.default_rng(0)
+    equity = 100000 * np.cumprod(1 + rng.normal(0.0005, 0.01, 500))
+    accumulator = MetricsAccumulator(100000.0)
+    accumulator.extend(equity.tolist(), (np.arange(500) % 4 == 0).tolist())
+    metrics = accumulator.result()
+
+    curve = np.concatenate(([100000.0], equity))
+    returns = np.diff(curve) / curve[:-1]
+    peak = np.maximum.accumulate(curve)
+    assert metrics.annual_return == pytest.approx(returns.mean() * 252)
+    assert metrics.volatility == pytest.approx(returns.std() * 252 ** 0.5)
+    assert metrics.max_drawdown == pytest.approx(((peak - curve) / peak).max())
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2)) * 252 ** 0.5
+    assert metrics.sortino_ratio == pytest.approx(returns.mean() * 252 / downside)
+    assert metrics.calmar_ratio == pytest.approx(metrics.annual_return / metrics.max_drawdown)
+    assert metrics.exposure == pytest.approx(0.25)
+
+
+def test_drawdown_duration_and_trade_tallies():
+    accumulator = MetricsAccumulator(100.0)
+    accumulator.extend([110.0, 105.0, 100.0, 108.0, 111.0, 109.0])
+    for pnl in (10.0, -5.0, 20.0, 0.0):
+        accumulator.record_trade(pnl)
+    metrics = accumulator.result()
+    assert metrics.max_drawdown_duration == 3
+    assert metrics.win_rate == pytest.approx(0.5)
+    assert metrics.profit_loss_ratio == pytest.approx(15.0 / 5.0)
+    assert metrics.return_rate == pytest.approx(0.09)
+
+
+def test_batch_extend_matches_streaming_updates_exactly():
+    rng = np.random.default_rng(3)
+    steps = rng.choice([0.0, 0.0, 0.01, -0.01, 0.02], 400)
+    values = 100 * np.cumprod(1 + steps)
+    exposed = rng.random(400) < 0.5
+    streaming = MetricsAccumulator(100.0)
+    for value, flag in zip(values.tolist(), exposed.tolist()):
+        streaming.update(value, flag)
+
+    batched = MetricsAccumulator(100.0)
+    for lo, hi in ((0, 1), (1, 150), (150, 151), (151, 400)):
+        batched.extend(values[lo:hi], exposed[lo:hi])
+    assert batched.snapshot() == streaming.snapshot()
+    assert batched.result() == streaming.result()
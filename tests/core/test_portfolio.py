@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+from src.core.engine import BacktestEngine
+from src.core.portfolio import PortfolioEngine
+from src.models.panel import BarPanel
+from src.strategy.ma_cross import MACrossStrategy
+
+
+@pytest.fixture
+def create_bars(make_bars):
+    def create(symbol: str, seed: int, n: int = 300, keep=None):
+        return make_bars(n=n, seed=seed, symbol=symbol, first_date="2022-01-03", keep=keep)
+    return create
+
+
+def test_panel_aligns_suspended_symbols(create_bars):
+    keep = np.ones(10, dtype=bool)
+    keep[[0, 4, 5]] = False
+    a = create_bars("000001", 1, n=10)
+    b = create_bars("000002", 2, n=10, keep=keep)
+    panel = BarPanel.from_bars([a, b])
+    assert len(panel) == 10
+    assert panel.tradable[:, 1].sum() == 7
+    assert np.isnan(panel.marks[0, 1])
+    assert panel.marks[4, 1] == panel.close_prices[3, 1]
+    assert panel.marks[5, 1] == panel.close_prices[3, 1]
+
+
+def test_single_symbol_portfolio_matches_engine(create_bars):
+    data = create_bars("000001", 3)
+    strategy = MACrossStrategy(short_window=5, long_window=20)
+    expected = BacktestEngine().run_vectorized(data, strategy)
+    result = PortfolioEngine().run({"000001": data}, strategy)
+    assert result.equity_curve == expected.equity_curve
+    assert result.total_trades == expected.total_trades
+
+
+def test_portfolio_shares_cash_across_symbols(create_bars):
+    keep = np.ones(300, dtype=bool)
+    keep[100:130] = False
+    universe = [create_bars(f"00000{i}", i, keep=keep if i == 2 else None) for i in range(1, 6)]
+    engine = PortfolioEngine(initial_capital=1000000.0)
+    result = engine.run(universe, MACrossStrategy(short_window=5, long_window=20))
+    assert len(result.equity_curve) == 301
+    assert {t.symbol for t in result.trades} == {data.symbol for data in universe}
+    assert engine.account.cash >= 0
+    assert result.final_value == pytest.approx(result.equity_curve[-1])
@@ -0,0 +1,68 @@
+import os
+from datetime import date
+from src.core.engine import BacktestEngine
+from src.core.result_cache import ResultCache, result_cache_key
+from src.data.synthetic import SyntheticProvider
+from src.strategy.ma_cross import MACrossStrategy
+
+
+def make_data(seed: int = 0):
+    return SyntheticProvider(seed=seed).fetch_stock_daily("000001", date(2023, 1, 1), date(2023, 12, 31))
+
+
+def test_key_depends_on_data_params_and_engine_config():
+    data = make_data()
+    key = result_cache_key(data, MACrossStrategy(5, 20), initial_capital=100000.0, fee_rate=0.0003)
+    assert key == result_cache_key(make_data(), MACrossStrategy(5, 20), initial_capital=100000.0, fee_rate=0.0003)
+    assert key != result_cache_key(make_data(seed=1), MACrossStrategy(5, 20), initial_capital=100000.0, fee_rate=0.0003)
+    assert key != result_cache_key(data, MACrossStrategy(5, 30), initial_capital=100000.0, fee_rate=0.0003)
+    assert key != result_cache_key(data, MACrossStrategy(5, 20), initial_capital=100000.0, fee_rate=0.001)
+
+
+def test_key_depends_on_requested_window():
+    data = make_data()
+    weekend = data.model_copy(update={"start_date": date(2022, 12, 31)})
+    assert len(weekend) == len(data)
+    assert result_cache_key(weekend, MACrossStrategy(5, 20)) != result_cache_key(data, MACrossStrategy(5, 20))
+
+
+def test_disk_tier_survives_new_cache_instance(tmp_path):
+    data = make_data()
+    strategy = MACrossStrategy(5, 20)
+    key = result_cache_key(data, strategy, initial_capital=100000.0)
+    result = BacktestEngine().run(data, strategy)
+    ResultCache(tmp_path).put(key, result)
+
+    cache = ResultCache(tmp_path)
+    cached = cache.get(key)
+    assert cache.hits == 1
+    assert cached == result
+    assert cache.get("0" * 32) is None
+    assert cache.misses == 1
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    result = BacktestEngine().run(make_data(), MACrossStrategy(5, 20))
+    calls = []
+    for key in ["a", "b", "a", "c"]:
+        cache.get_or_run(key, lambda: calls.append(key) or result)
+    assert calls == ["a", "b", "c"]
+    assert cache.get("b") is None
+    assert cache.get("a") is result
+
+
+def test_disk_tier_prunes_least_recently_used(tmp_path):
+    result = BacktestEngine().run(make_data(), MACrossStrategy(5, 20))
+    size = len(result.model_dump_json().encode())
+    cache = ResultCache(tmp_path, max_entries=1, max_disk_bytes=int(size * 2.5))
+    for age, key in enumerate(["a" * 32, "b" * 32]):
+        cache.put(key, result)
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+    cache.put("c" * 32, result)
+
+    fresh = ResultCache(tmp_path)
+    assert fresh.get("a" * 32) is None
+    assert fresh.get("b" * 32) == result
+    assert fresh.get("c" * 32) == result
+    assert fresh._disk_bytes == size * 2
@@ -0,0 +1,63 @@
+import itertools
+import pytest
+import numpy as np
+from datetime import date
+from src.core.engine import BacktestEngine
+from src.core.robustness import analyze_robustness, bootstrap_returns, shuffle_trades
+from src.data.synthetic import SyntheticProvider
+from src.strategy.ma_cross import MACrossStrategy
+
+
+def brute_force_paths(returns: np.ndarray, samples: int, block_size: int, seed: int) -> np.ndarray:
+    # 按与 bootstrap_returns 相同的随机数顺序逐样本展开循环块
+    rng = np.random.default_rng(seed)
+    n = len(returns)
+    lengths = [block_size] * (n // block_size) + ([n % block_size] if n % block_size else [])
+    starts = np.stack([rng.integers(0, n, size=samples) for _ in lengths], axis=1)
+    return np.stack([
+        np.concatenate([returns[(s + np.arange(length)) % n] for s, length in zip(row, lengths)])
+        for row in starts
+    ])
+
+
+@pytest.mark.parametrize("block_size", [1, 4])
+def test_bootstrap_matches_explicit_paths(block_size):
+    returns = np.random.default_rng(1).normal(0.001, 0.02, 50)
+    resampled = bootstrap_returns(returns, samples=200, block_size=block_size, seed=5)
+    paths = brute_force_paths(returns, 200, block_size, 5)
+
+    equity = np.cumprod(1 + paths, axis=1)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    np.testing.assert_allclose(resampled["total_return"], equity[:, -1] - 1, rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(resampled["max_drawdown"], ((peak - equity) / peak).max(axis=1), atol=1e-5)
+    sharpe = paths.mean(axis=1) / paths.std(axis=1) * np.sqrt(252)
+    np.testing.assert_allclose(resampled["sharpe_ratio"], sharpe, rtol=1e-3, atol=1e-3)
+
+
+def test_shuffle_keeps_total_return_and_varies_drawdown():
+    pnls = np.array([500.0, -800.0, 300.0, -200.0, 900.0, -400.0])
+    resampled = shuffle_trades(pnls, 10000.0, samples=500, seed=0)
+    assert np.allclose(resampled["total_return"], pnls.sum() / 10000.0)
+    drawdowns = []
+    for order in itertools.permutations(pnls):
+        equity = 10000.0 + np.cumsum(order)
+        peak = np.maximum(np.maximum.accumulate(equity), 10000.0)
+        drawdowns.append(((peak - equity) / peak).max())
+    assert resampled["max_drawdown"].min() >= min(drawdowns) - 1e-6
+    assert resampled["max_drawdown"].max() == pytest.approx(max(drawdowns), rel=1e-5)
+
+
+def test_analyze_robustness_intervals():
+    data = SyntheticProvider(seed=2).fetch_stock_daily("000001", date(2018, 1, 1), date(2023, 12, 31))
+    result = BacktestEngine(initial_capital=10000000.0).run(data, MACrossStrategy(5, 20))
+    assert result.total_trades > 0
+    bootstrap = analyze_robustness(result, samples=2000)
+    for interval in (bootstrap.total_return, bootstrap.max_drawdown, bootstrap.sharpe_ratio):
+        assert interval.lower <= interval.mean <= interval.upper
+    assert bootstrap.max_drawdown.lower <= result.max_drawdown <= bootstrap.max_drawdown.upper
+
+    shuffle = analyze_robustness(result, method="shuffle", samples=2000)
+    assert shuffle.sharpe_ratio is None
+    assert shuffle.total_return.mean == pytest.approx(sum(t.pnl for t in result.trades) / result.initial_capital, rel=1e-5)
+    with pytest.raises(ValueError):
+        analyze_robustness(result, method="jackknife")
@@ -0,0 +1,63 @@
+import pytest
+from src.core.engine import BacktestEngine
+from src.core.sweep import expand_grid, run_sweep, worker_count
+from src.strategy.ma_cross import MACrossStrategy
+
+
+@pytest.fixture
+def data(make_bars):
+    return make_bars(n=400, seed=7)
+
+
+def test_expand_grid():
+    grid = expand_grid({"short_window": [5, 10], "long_window": [20, 30, 60]})
+    assert len(grid) == 6
+    assert {"short_window": 10, "long_window": 60} in grid
+
+
+def test_sweep_skips_invalid_params_and_ranks(data):
+    results = run_sweep(
+        data,
+        "ma_cross",
+        {"short_window": [5, 10, 30], "long_window": [10, 30]},
+        max_workers=1
+    )
+    assert all(r.params["short_window"] < r.params["long_window"] for r in results)
+    assert len(results) == 3
+    sharpes = [r.metrics.sharpe_ratio for r in results]
+    assert sharpes == sorted(sharpes, reverse=True)
+    assert [r.rank for r in results] == [1, 2, 3]
+
+
+def test_sweep_matches_single_runs(data):
+    results = run_sweep(data, "ma_cross", {"short_window": [5], "long_window": [20]}, max_workers=1)
+    expected = BacktestEngine().run(data, MACrossStrategy(short_window=5, long_window=20))
+    assert results[0].final_value == expected.final_value
+    assert results[0].metrics == expected.metrics
+
+
+def test_worker_count_is_bounded_by_cpus_and_tasks(monkeypatch):
+    monkeypatch.setattr("src.core.sweep.os.cpu_count", lambda: 4)
+    assert worker_count(None, 100) == 4
+    assert worker_count(5000, 100) == 4
+    assert worker_count(8, 3) == 3
+    assert worker_count(2, 0) == 1
+
+
+def test_sweep_process_pool_matches_serial(monkeypatch, data):
+    monkeypatch.setattr("src.core.sweep.os.cpu_count", lambda: 2)
+    grid = {"period": [7, 14], "oversold": [25, 30], "overbought": [70, 75]}
+    serial = run_sweep(data, "rsi", grid, sort_by="final_value", max_workers=1)
+    parallel = run_sweep(data, "rsi", grid, sort_by="final_value", max_workers=2)
+    assert [r.model_dump() for r in parallel] == [r.model_dump() for r in serial]
+
+
+def test_sweep_rejects_oversized_grid_before_expanding(data):
+    grid = {"short_window": range(1000), "long_window": range(1000), "position_ratio": [0.5, 1.0]}
+    with pytest.raises(ValueError, match="2000000"):
+        run_sweep(data, "ma_cross", grid)
+
+
+def test_sweep_rejects_unknown_metric(data):
+    with pytest.raises(ValueError):
+        run_sweep(data, "ma_cross", {"short_window": [5]}, sort_by="foo")
@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+from src.core.engine import BacktestEngine
+from src.core.walk_forward import run_walk_forward, walk_forward_windows
+from src.strategy.ma_cross import MACrossStrategy
+
+
+@pytest.fixture
+def data(make_bars):
+    return make_bars(n=600, seed=11)
+
+
+def test_windows_roll_and_cover_history():
+    assert walk_forward_windows(10, 4, 3) == [(0, 4, 7), (3, 7, 10)]
+    assert walk_forward_windows(11, 4, 3, anchored=True) == [(0, 4, 7), (0, 7, 10), (0, 10, 11)]
+    assert walk_forward_windows(4, 4, 3) == []
+    with pytest.raises(ValueError):
+        walk_forward_windows(10, 0, 3)
+
+
+def test_walk_forward_picks_best_in_sample_params_and_stitches(data):
+    grid = {"short_window": [5, 10], "long_window": [20, 40]}
+    result = run_walk_forward(data, "ma_cross", grid, train_bars=200, test_bars=100, max_workers=1)
+    assert len(result.windows) == 4
+    assert len(result.equity_curve) == len(result.equity_dates) + 1 == 401
+
+    # 第一个窗口从头开始, 样本内结果与直接在切片上回测一致
+    first = result.windows[0]
+    candidates = [{"short_window": s, "long_window": l} for s in (5, 10) for l in (20, 40)]
+    sharpes = [BacktestEngine().run(data[0:200], MACrossStrategy(**p)).metrics.sharpe_ratio for p in candidates]
+    assert first.params == candidates[int(np.argmax(sharpes))]
+    assert first.in_sample.sharpe_ratio == pytest.approx(max(sharpes))
+
+    # 拼接曲线的每段收益率与对应窗口独立回测一致
+    curve = np.asarray(result.equity_curve)
+    assert curve[100] / curve[0] == pytest.approx(1 + first.out_of_sample.return_rate)
+    assert result.final_value == pytest.approx(
+        result.initial_capital * np.prod([1 + w.out_of_sample.return_rate for w in result.windows])
+    )
+
+
+def test_walk_forward_process_pool_matches_serial(monkeypatch, data):
+    monkeypatch.setattr("src.core.sweep.os.cpu_count", lambda: 2)
+    grid = {"period": [7, 14], "oversold": [25, 30]}
+    serial = run_walk_forward(data, "rsi", grid, train_bars=150, test_bars=150, max_workers=1)
+    parallel = run_walk_forward(data, "rsi", grid, train_bars=150, test_bars=150, max_workers=2)
+    assert parallel.model_dump() == serial.model_dump()
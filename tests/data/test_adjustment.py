@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.data.adjustment import AdjustmentFactorStore, apply_adjustment, exchange_symbol, factors_on
+
+
+FACTOR_DATES = np.array(["2020-01-01", "2020-06-01", "2021-01-04"], dtype="datetime64[D]")
+FACTORS = np.array([1.0, 1.2, 1.5])
+
+
+def make_frame() -> pd.DataFrame:
+    dates = pd.to_datetime(["2019-12-31", "2020-03-02", "2020-06-01", "2021-02-01"])
+    return pd.DataFrame({
+        "date": dates,
+        "open": [10.0, 10.0, 10.0, 10.0],
+        "high": [11.0, 11.0, 11.0, 11.0],
+        "low": [9.0, 9.0, 9.0, 9.0],
+        "close": [10.0, 10.0, 10.0, 10.0],
+        "volume": np.full(4, 100, dtype=np.int64),
+        "turnover": np.full(4, 1000.0),
+    })
+
+
+def test_factors_apply_from_ex_date():
+    scale = factors_on(make_frame()["date"].to_numpy(), FACTOR_DATES, FACTORS)
+    np.testing.assert_allclose(scale, [1.0, 1.0, 1.2, 1.5])
+
+
+def test_apply_adjustment_modes():
+    frame = make_frame()
+    hfq = apply_adjustment(frame, FACTOR_DATES, FACTORS, "hfq")
+    qfq = apply_adjustment(frame, FACTOR_DATES, FACTORS, "qfq")
+    np.testing.assert_allclose(hfq["close"], [10.0, 10.0, 12.0, 15.0])
+    np.testing.assert_allclose(qfq["close"], [10 / 1.5, 10 / 1.5, 12 / 1.5, 10.0])
+    np.testing.assert_array_equal(qfq["volume"], frame["volume"])
+    assert apply_adjustment(frame, FACTOR_DATES, FACTORS, "") is frame
+    with pytest.raises(ValueError):
+        apply_adjustment(frame, FACTOR_DATES, FACTORS, "bad")
+
+
+def test_apply_adjustment_without_factors():
+    frame = make_frame().iloc[:1]
+    no_dates = np.array([], dtype="datetime64[D]")
+    for adjustment in ("qfq", "hfq"):
+        assert apply_adjustment(frame, no_dates, np.array([]), adjustment) is frame
+
+
+def test_exchange_symbol():
+    assert exchange_symbol("600000") == "sh600000"
+    assert exchange_symbol("000001") == "sz000001"
+    assert exchange_symbol("300750") == "sz300750"
+    assert exchange_symbol("830799") == "bj830799"
+
+
+def test_factor_store_refreshes_and_falls_back(tmp_path):
+    calls = []
+
+    def loader(symbol):
+        calls.append(symbol)
+        return FACTOR_DATES, FACTORS
+
+    store = AdjustmentFactorStore(tmp_path)
+    store.get("000001", loader)
+    dates, factors = store.get("000001", loader)
+    assert calls == ["000001"]
+    np.testing.assert_array_equal(dates, FACTOR_DATES)
+
+    def failing_loader(symbol):
+        raise ConnectionError("upstream")
+
+    stale = AdjustmentFactorStore(tmp_path, refresh_interval=0)
+    _, factors = stale.get("000001", failing_loader)
+    np.testing.assert_allclose(factors, FACTORS)
+    with pytest.raises(ConnectionError):
+        stale.get("600000", failing_loader)
@@ -0,0 +1,113 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import date
+from src.data import akshare_provider
+from src.data.adjustment import AdjustmentFactorStore
+from src.data.akshare_provider import AkshareProvider
+from src.data.bar_cache import BarCache
+
+
+def make_frame(start_date: date, end_date: date) -> pd.DataFrame:
+    dates = pd.bdate_range(start_date, end_date)
+    closes = np.linspace(10.0, 11.0, len(dates))
+    return pd.DataFrame({
+        "日期": dates.strftime("%Y-%m-%d"),
+        "开盘": closes,
+        "最高": closes * 1.01,
+        "最低": closes * 0.99,
+        "收盘": closes,
+        "成交量": np.full(len(dates), 1000),
+        "成交额": closes * 1000,
+    })
+
+
+@pytest.fixture
+def fake_hist(monkeypatch):
+    calls = []
+
+    def stock_zh_a_hist(symbol, start_date, end_date, adjust):
+        calls.append((start_date, end_date, adjust))
+        return make_frame(pd.Timestamp(start_date).date(), pd.Timestamp(end_date).date())
+
+    def stock_zh_a_daily(symbol, adjust):
+        calls.append((symbol, adjust))
+        return pd.DataFrame({"date": ["2024-01-01", "2024-02-15"], "hfq_factor": ["1.0", "1.1"]})
+
+    monkeypatch.setattr(akshare_provider.ak, "stock_zh_a_hist", stock_zh_a_hist)
+    monkeypatch.setattr(akshare_provider.ak, "stock_zh_a_daily", stock_zh_a_daily)
+    return calls
+
+
+def test_cache_fetches_only_missing_segments(tmp_path, fake_hist):
+    provider = AkshareProvider(cache=BarCache(tmp_path))
+    first = provider.fetch_stock_daily("000001", date(2024, 2, 1), date(2024, 2, 29), adjustment="")
+    assert len(fake_hist) == 1
+
+    again = provider.fetch_stock_daily("000001", date(2024, 2, 5), date(2024, 2, 20), adjustment="")
+    assert len(fake_hist) == 1
+    assert len(again.bars) < len(first.bars)
+
+    provider.fetch_stock_daily("000001", date(2024, 1, 15), date(2024, 3, 15), adjustment="")
+    assert fake_hist[1:] == [("20240115", "20240131", ""), ("20240301", "20240315", "")]
+
+
+def test_gapped_request_keeps_cached_history(tmp_path, fake_hist):
+    provider = AkshareProvider(cache=BarCache(tmp_path))
+    provider.fetch_stock_daily("000001", date(2024, 1, 1), date(2024, 1, 31), adjustment="")
+    later = provider.fetch_stock_daily("000001", date(2024, 4, 1), date(2024, 4, 30), adjustment="")
+    assert fake_hist[1] == ("20240201", "20240430", "")
+    assert str(later.trade_dates[0]) == "2024-04-01"
+
+    provider.fetch_stock_daily("000001", date(2024, 1, 1), date(2024, 4, 30), adjustment="")
+    assert len(fake_hist) == 2
+
+
+def test_switching_adjustment_reuses_raw_bars(tmp_path, fake_hist):
+    provider = AkshareProvider(
+        cache=BarCache(tmp_path),
+        factor_store=AdjustmentFactorStore(tmp_path)
+    )
+    raw = provider.fetch_stock_daily("000001", date(2024, 2, 1), date(2024, 2, 29), adjustment="")
+    qfq = provider.fetch_stock_daily("000001", date(2024, 2, 1), date(2024, 2, 29), adjustment="qfq")
+    hfq = provider.fetch_stock_daily("000001", date(2024, 2, 1), date(2024, 2, 29), adjustment="hfq")
+    assert fake_hist == [("20240201", "20240229", ""), ("sz000001", "hfq-factor")]
+
+    before = raw.trade_dates < np.datetime64("2024-02-15")
+    np.testing.assert_allclose(qfq.close_prices[~before], raw.close_prices[~before])
+    np.testing.assert_allclose(qfq.close_prices[before], raw.close_prices[before] / 1.1)
+    np.testing.assert_allclose(hfq.close_prices[~before], raw.close_prices[~before] * 1.1)
+    np.testing.assert_array_equal(hfq.volumes, raw.volumes)
+
+
+def test_none_adjustment_returns_raw_bars(tmp_path, fake_hist):
+    provider = AkshareProvider(
+        cache=BarCache(tmp_path),
+        factor_store=AdjustmentFactorStore(tmp_path)
+    )
+    raw = provider.fetch_stock_daily("000001", date(2024, 2, 1), date(2024, 2, 29), adjustment="")
+    none = provider.fetch_stock_daily("000001", date(2024, 2, 1), date(2024, 2, 29), adjustment="none")
+    assert fake_hist == [("20240201", "20240229", "")]
+    np.testing.assert_array_equal(none.close_prices, raw.close_prices)
+    assert none.adjustment == "none"
+
+
+def test_cache_merge_keeps_dates_sorted_and_unique(tmp_path):
+    cache = BarCache(tmp_path)
+    frame = make_frame(date(2024, 1, 1), date(2024, 1, 31))
+    normalized = pd.DataFrame({
+        "date": pd.to_datetime(frame["日期"]),
+        "open": frame["开盘"],
+        "high": frame["最高"],
+        "low": frame["最低"],
+        "close": frame["收盘"],
+        "volume": frame["成交量"],
+        "turnover": frame["成交额"],
+    })
+    cache.merge("000001", "qfq", normalized.iloc[10:], date(2024, 1, 15), date(2024, 1, 31))
+    cache.merge("000001", "qfq", normalized.iloc[:12], date(2024, 1, 1), date(2024, 1, 16))
+
+    result = cache.read("000001", "qfq", date(2024, 1, 1), date(2024, 1, 31))
+    assert len(result) == len(normalized)
+    assert result["date"].is_monotonic_increasing
+    assert cache.coverage("000001", "qfq") == (date(2024, 1, 1), date(2024, 1, 31))
@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+from datetime import date
+from src.data.bar_store import BarStore, write_bar_store
+from src.data.base import DataProvider
+from src.data.synthetic import SyntheticProvider, synthetic_symbols
+
+
+@pytest.fixture
+def universe():
+    provider = SyntheticProvider(seed=3)
+    return [provider.fetch_stock_daily(symbol, date(2020, 1, 1), date(2021, 12, 31)) for symbol in synthetic_symbols(5)]
+
+
+def test_store_round_trips_as_zero_copy_views(tmp_path, universe):
+    store = BarStore(write_bar_store(tmp_path / "store", universe))
+    assert isinstance(store, DataProvider)
+    assert store.symbols == [data.symbol for data in universe]
+
+    data = store.get("000003")
+    np.testing.assert_array_equal(data.close_prices, universe[2].close_prices)
+    np.testing.assert_array_equal(data.trade_dates, universe[2].trade_dates)
+    assert data.close_prices.base is not None
+    assert np.shares_memory(data.close_prices, store.arrays["close_prices"])
+
+
+def test_store_slices_by_date(tmp_path, universe):
+    store = BarStore(write_bar_store(tmp_path / "store", universe))
+    data = store.fetch_stock_daily("000002", date(2021, 3, 1), date(2021, 3, 31))
+    expected = universe[1].trade_dates
+    expected = expected[(expected >= np.datetime64("2021-03-01")) & (expected <= np.datetime64("2021-03-31"))]
+    np.testing.assert_array_equal(data.trade_dates, expected)
+    assert data.bars[0].symbol == "000002"
+
+    with pytest.raises(ValueError):
+        store.fetch_stock_daily("000002", date(2021, 3, 1), date(2021, 3, 31), adjustment="hfq")
+    with pytest.raises(KeyError):
+        store.get("600000")
+
+
+def test_rewrite_replaces_store(tmp_path, universe):
+    root = write_bar_store(tmp_path / "store", universe)
+    write_bar_store(root, universe[:2], adjustment="hfq")
+    store = BarStore(root)
+    assert len(store) == 2
+    assert store.adjustment == "hfq"
+    assert not (tmp_path / "store.tmp").exists()
@@ -0,0 +1,58 @@
+import time
+import numpy as np
+from datetime import date
+from src.data.bulk import BulkLoader, TokenBucket
+from src.models.ohlcv import BarData
+
+
+class StubProvider:
+    def __init__(self, failures: dict[str, int] = None):
+        self.failures = dict(failures or {})
+        self.calls: list[str] = []
+
+    def fetch_stock_daily(self, symbol, start_date, end_date, adjustment="qfq") -> BarData:
+        self.calls.append(symbol)
+        if self.failures.get(symbol, 0) > 0:
+            self.failures[symbol] -= 1
+            raise ConnectionError(f"获取股票数据失败: {symbol}")
+        dates = np.arange(start_date, end_date, dtype="datetime64[D]")
+        prices = np.full(len(dates), 10.0)
+        return BarData.from_arrays(
+            symbol=symbol,
+            trade_dates=dates,
+            open_prices=prices,
+            high_prices=prices,
+            low_prices=prices,
+            close_prices=prices,
+            volumes=np.full(len(dates), 100),
+            turnovers=prices * 100
+        )
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_fetch_many_retries_and_reports_partial_failures():
+    provider = StubProvider(failures={"000002": 1, "000003": 10})
+    loader = BulkLoader(provider, max_workers=4, rate=1000, max_retries=2, backoff=0.001)
+    result = loader.fetch_many(
+        ["000001", "000002", "000003", "000001"], date(2024, 1, 1), date(2024, 2, 1)
+    )
+    assert list(result.data) == ["000001", "000002"]
+    assert result.attempts == {"000001": 1, "000002": 2, "000003": 3}
+    assert "000003" in result.errors
+    assert not result.ok
+    assert provider.calls.count("000001") == 1
+
+
+def test_fetch_many_builds_panel():
+    loader = BulkLoader(StubProvider(), rate=1000)
+    result = loader.fetch_many(["000001", "600000"], date(2024, 1, 1), date(2024, 1, 11))
+    panel = result.to_panel(dtype=np.float32)
+    assert panel.close_prices.shape == (10, 2)
+    assert panel.close_prices.dtype == np.float32
@@ -0,0 +1,89 @@
+import pytest
+import threading
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from src.data.coalescing import CoalescingProvider, bar_data_nbytes
+from src.models.ohlcv import BarData
+
+
+class SlowProvider:
+    def __init__(self, delay: float = 0.05, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def fetch_stock_daily(self, symbol, start_date, end_date, adjustment="qfq") -> BarData:
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("获取股票数据失败: upstream")
+        dates = np.arange(start_date, end_date, dtype="datetime64[D]")
+        prices = np.full(len(dates), 10.0)
+        return BarData.from_arrays(
+            symbol=symbol,
+            trade_dates=dates,
+            open_prices=prices,
+            high_prices=prices,
+            low_prices=prices,
+            close_prices=prices,
+            volumes=np.full(len(dates), 100),
+            turnovers=prices * 100
+        )
+
+
+def fetch(provider, symbol="000001", end=date(2024, 2, 1)):
+    return provider.fetch_stock_daily(symbol, date(2024, 1, 1), end, "qfq")
+
+
+def test_concurrent_requests_share_one_fetch():
+    upstream = SlowProvider()
+    provider = CoalescingProvider(upstream)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: fetch(provider), range(8)))
+    assert upstream.calls == 1
+    assert all(result is results[0] for result in results)
+
+    fetch(provider)
+    assert upstream.calls == 1
+
+
+def test_errors_propagate_and_are_not_cached():
+    upstream = SlowProvider(fail=True)
+    provider = CoalescingProvider(upstream)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(fetch, provider) for _ in range(4)]
+    for future in futures:
+        with pytest.raises(ConnectionError):
+            future.result()
+
+    upstream.fail = False
+    assert len(fetch(provider)) == 31
+
+
+def test_lru_evicts_by_size():
+    upstream = SlowProvider(delay=0)
+    size = bar_data_nbytes(fetch(SlowProvider(delay=0)))
+    provider = CoalescingProvider(upstream, max_bytes=size * 2)
+    fetch(provider, "000001")
+    fetch(provider, "000002")
+    fetch(provider, "000001")
+    fetch(provider, "000003")
+    assert provider.cache_bytes == size * 2
+
+    calls = upstream.calls
+    fetch(provider, "000001")
+    assert upstream.calls == calls
+    fetch(provider, "000002")
+    assert upstream.calls == calls + 1
+
+
+def test_expired_entries_are_refetched():
+    upstream = SlowProvider(delay=0)
+    provider = CoalescingProvider(upstream, ttl=0)
+    fetch(provider)
+    fetch(provider)
+    assert upstream.calls == 2
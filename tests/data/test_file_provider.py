@@ -0,0 +1,71 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import date
+from src.data.base import DataProvider
+from src.data.file_provider import FileProvider
+from src.data.synthetic import SyntheticProvider
+
+
+@pytest.fixture
+def bars():
+    return SyntheticProvider(seed=1).fetch_stock_daily("000001", date(2024, 1, 1), date(2024, 3, 31))
+
+
+def export_columns(data) -> dict[str, np.ndarray]:
+    return {
+        "date": data.trade_dates,
+        "open": data.open_prices,
+        "high": data.high_prices,
+        "low": data.low_prices,
+        "close": data.close_prices,
+        "volume": data.volumes,
+        "turnover": data.turnovers,
+    }
+
+
+def test_reads_memory_mapped_npy_directory(tmp_path, bars):
+    directory = tmp_path / "000001"
+    directory.mkdir()
+    for column, values in export_columns(bars).items():
+        np.save(directory / f"{column}.npy", values)
+
+    provider = FileProvider(tmp_path)
+    assert isinstance(provider, DataProvider)
+    data = provider.fetch_stock_daily("000001", date(2024, 2, 1), date(2024, 2, 29))
+    assert isinstance(data.close_prices, np.memmap)
+    assert data.trade_dates[0] >= np.datetime64("2024-02-01")
+    assert data.trade_dates[-1] <= np.datetime64("2024-02-29")
+    np.testing.assert_array_equal(
+        data.close_prices,
+        bars.close_prices[(bars.trade_dates >= np.datetime64("2024-02-01")) & (bars.trade_dates <= np.datetime64("2024-02-29"))]
+    )
+
+
+def test_prefers_adjustment_specific_files(tmp_path, bars):
+    columns = export_columns(bars)
+    np.savez(tmp_path / "000001.npz", **columns)
+    frame = pd.DataFrame(columns)
+    frame["close"] = frame["close"] * 2
+    frame.to_csv(tmp_path / "000001_hfq.csv", index=False)
+
+    provider = FileProvider(tmp_path)
+    qfq = provider.fetch_stock_daily("000001", date(2024, 1, 1), date(2024, 3, 31))
+    hfq = provider.fetch_stock_daily("000001", date(2024, 1, 1), date(2024, 3, 31), adjustment="hfq")
+    np.testing.assert_allclose(hfq.close_prices, qfq.close_prices * 2)
+    np.testing.assert_array_equal(hfq.trade_dates, qfq.trade_dates)
+
+    with pytest.raises(FileNotFoundError):
+        provider.fetch_stock_daily("600000", date(2024, 1, 1), date(2024, 3, 31))
+
+
+def test_security_lookup(tmp_path, bars):
+    np.savez(tmp_path / "000001.npz", **export_columns(bars))
+    assert FileProvider(tmp_path).search_stocks("0000") == [{"code": "000001", "name": "000001"}]
+
+    pd.DataFrame({"code": ["000001"], "name": ["平安银行"], "market": ["A股"]}).to_csv(
+        tmp_path / "securities.csv", index=False
+    )
+    provider = FileProvider(tmp_path)
+    assert provider.get_stock_info("000001") == {"name": "平安银行", "market": "A股"}
+    assert provider.get_stock_info("600000")["market"] == "unknown"
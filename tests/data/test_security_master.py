@@ -0,0 +1,98 @@
+import pytest
+import time
+import pandas as pd
+from src.data import security_master as security_master_module
+from src.data.security_master import SecurityMaster
+
+
+def make_loader(calls: list):
+    def loader() -> pd.DataFrame:
+        calls.append(1)
+        return pd.DataFrame({
+            "code": ["000001", "000002", "600000", "601318", "000651"],
+            "name": ["平安银行", "万科A", "浦发银行", "中国平安", "格力电器"],
+        })
+    return loader
+
+
+def test_loads_once_and_looks_up_by_code():
+    calls = []
+    master = SecurityMaster(make_loader(calls))
+    assert master.get("600000") == {"name": "浦发银行", "market": "A股"}
+    assert master.get("999999") is None
+    master.search("平安")
+    assert len(calls) == 1
+
+
+def test_search_by_name_and_code():
+    master = SecurityMaster(make_loader([]))
+    assert [r["code"] for r in master.search("平安")] == ["000001", "601318"]
+    assert [r["code"] for r in master.search("银行")] == ["000001", "600000"]
+    assert [r["code"] for r in master.search("0006")] == ["000651"]
+    assert master.search("万科a")[0]["code"] == "000002"
+    assert master.search("不存在") == []
+
+
+def test_code_prefix_matches_rank_first():
+    master = SecurityMaster(make_loader([]))
+    assert [r["code"] for r in master.search("60")] == ["600000", "601318"]
+    assert master.search("0", limit=2) == [
+        {"code": "000001", "name": "平安银行"},
+        {"code": "000002", "name": "万科A"},
+    ]
+
+
+def test_search_by_pinyin_initials():
+    if security_master_module.lazy_pinyin is None:
+        pytest.skip("pypinyin not installed")
+    master = SecurityMaster(make_loader([]))
+    assert [r["code"] for r in master.search("payh")] == ["000001"]
+    assert [r["code"] for r in master.search("GLDQ")] == ["000651"]
+
+
+def test_stale_index_refreshes_in_background():
+    calls = []
+    master = SecurityMaster(make_loader(calls), refresh_interval=0.0)
+    master.search("平安")
+    master.search("平安")
+    for _ in range(100):
+        if len(calls) >= 2:
+            break
+        time.sleep(0.01)
+    assert len(calls) == 2
+
+
+def test_failed_refresh_backs_off():
+    calls = []
+    fresh_loader = make_loader(calls)
+
+    def loader() -> pd.DataFrame:
+        if calls:
+            calls.append(1)
+            raise ConnectionError("upstream down")
+        return fresh_loader()
+
+    master = SecurityMaster(loader, refresh_interval=0.0, retry_backoff=60.0)
+    master.search("平安")
+    master.search("平安")
+    for _ in range(100):
+        if len(calls) >= 2 and not master._refreshing:
+            break
+        time.sleep(0.01)
+    for _ in range(5):
+        assert master.get("000001")["name"] == "平安银行"
+    assert len(calls) == 2
+
+
+def test_failed_first_load_backs_off():
+    calls = []
+
+    def loader() -> pd.DataFrame:
+        calls.append(1)
+        raise ConnectionError("upstream down")
+
+    master = SecurityMaster(loader, retry_backoff=60.0)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            master.search("平安")
+    assert len(calls) == 1
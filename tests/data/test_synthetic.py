@@ -0,0 +1,41 @@
+import pytest
+import numpy as np
+from datetime import date
+from src.config import Settings
+from src.data.base import DataProvider
+from src.data.factory import create_data_provider
+from src.data.synthetic import SyntheticProvider, synthetic_symbols
+
+
+def test_synthetic_bars_are_deterministic_and_range_independent():
+    provider = SyntheticProvider(seed=7)
+    full = provider.fetch_stock_daily("000001", date(2020, 1, 1), date(2020, 12, 31))
+    part = provider.fetch_stock_daily("000001", date(2020, 3, 1), date(2020, 6, 30))
+    again = SyntheticProvider(seed=7).fetch_stock_daily("000001", date(2020, 1, 1), date(2020, 12, 31))
+
+    np.testing.assert_array_equal(full.close_prices, again.close_prices)
+    mask = np.isin(full.trade_dates, part.trade_dates)
+    np.testing.assert_array_equal(full.close_prices[mask], part.close_prices)
+    assert np.is_busday(full.trade_dates).all()
+
+    other = provider.fetch_stock_daily("000002", date(2020, 1, 1), date(2020, 12, 31))
+    assert not np.array_equal(full.close_prices, other.close_prices)
+
+
+def test_synthetic_bars_are_valid_ohlc():
+    data = SyntheticProvider().fetch_stock_daily("600000", date(2000, 1, 1), date(2024, 12, 31))
+    assert len(data) > 6000
+    assert (data.high_prices >= np.maximum(data.open_prices, data.close_prices)).all()
+    assert (data.low_prices <= np.minimum(data.open_prices, data.close_prices)).all()
+    assert (data.low_prices > 0).all()
+    assert (data.volumes > 0).all()
+
+
+def test_factory_selects_provider(tmp_path):
+    provider = create_data_provider(Settings(data_source="synthetic", synthetic_seed=3))
+    assert isinstance(provider, SyntheticProvider)
+    assert isinstance(provider, DataProvider)
+    assert create_data_provider(Settings(data_source="file", data_dir=str(tmp_path))).root == tmp_path
+    assert synthetic_symbols(3) == ["000001", "000002", "000003"]
+    with pytest.raises(ValueError):
+        create_data_provider(Settings(data_source="unknown"))
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from datetime import date
 from src.models.ohlcv import OHLCV, BarData
 
@@ -55,3 +56,59 @@ def test_price_range():
         adjustment="qfq"
     )
     assert bar.price_range == pytest.approx(1.5)
+
+
+def test_bar_data_columns_from_bars():
+    bars = [
+        OHLCV(
+            symbol="000001",
+            trade_date=date(2024, 1, i + 1),
+            open_price=10.0,
+            high_price=10.5,
+            low_price=9.5,
+            close_price=10.0 + i,
+            volume=1000 * (i + 1),
+            turnover=10000.0,
+            adjustment="hfq"
+        )
+        for i in range(3)
+    ]
+    data = BarData(symbol="000001", bars=bars)
+    assert data.close_prices.dtype == np.float64
+    assert data.volumes.dtype == np.int64
+    assert data.close_prices.tolist() == [10.0, 11.0, 12.0]
+    assert data.adjustment == "hfq"
+    assert data[2].trade_date == date(2024, 1, 3)
+    assert data[2].volume == 3000
+
+
+def test_bar_data_from_arrays_slices_are_views():
+    closes = np.array([10.0, 10.5, 11.0, 11.5])
+    data = BarData.from_arrays(
+        symbol="000001",
+        trade_dates=np.arange("2024-01-01", "2024-01-05", dtype="datetime64[D]"),
+        open_prices=closes,
+        high_prices=closes,
+        low_prices=closes,
+        close_prices=closes,
+        volumes=np.full(4, 100),
+        turnovers=closes * 100
+    )
+    window = data[1:3]
+    assert len(window) == 2
+    assert np.shares_memory(window.close_prices, data.close_prices)
+    assert window.bars[0].close_price == 10.5
+
+
+def test_bar_data_rejects_mismatched_columns():
+    with pytest.raises(ValueError):
+        BarData.from_arrays(
+            symbol="000001",
+            trade_dates=np.arange("2024-01-01", "2024-01-03", dtype="datetime64[D]"),
+            open_prices=np.ones(2),
+            high_prices=np.ones(2),
+            low_prices=np.ones(2),
+            close_prices=np.ones(3),
+            volumes=np.ones(2),
+            turnovers=np.ones(2)
+        )
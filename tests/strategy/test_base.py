@@ -0,0 +1,22 @@
+import pytest
+from src.models.ohlcv import BarData
+from src.strategy.base import IncrementalStrategy, Signal, Strategy
+from src.strategy.ma_cross import MACrossStrategy
+
+
+def test_strategy_must_implement_signal_generation():
+    with pytest.raises(TypeError):
+        Strategy("base")
+
+    with pytest.raises(TypeError):
+        class Incomplete(Strategy):
+            pass
+
+
+def test_on_bar_is_an_optional_capability():
+    class BatchOnly(Strategy):
+        def generate_signals(self, data: BarData) -> list[Signal]:
+            return []
+
+    assert not isinstance(BatchOnly("batch"), IncrementalStrategy)
+    assert isinstance(MACrossStrategy(), IncrementalStrategy)
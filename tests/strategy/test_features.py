@@ -0,0 +1,82 @@
+import pytest
+import numpy as np
+from datetime import date
+from src.core.sweep import run_sweep
+from src.data.synthetic import SyntheticProvider
+from src.strategy.base import Strategy
+from src.strategy.features import FeatureCache
+from src.strategy.ma_cross import MACrossStrategy
+
+
+@pytest.fixture
+def data():
+    return SyntheticProvider(seed=5).fetch_stock_daily("000001", date(2015, 1, 1), date(2020, 12, 31))
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = FeatureCache()
+    monkeypatch.setattr(Strategy, "features", cache)
+    return cache
+
+
+def test_fingerprint_tracks_content(data):
+    again = SyntheticProvider(seed=5).fetch_stock_daily("000001", date(2015, 1, 1), date(2020, 12, 31))
+    assert data.fingerprint == again.fingerprint
+    assert data.slice(0, 100).fingerprint != data.fingerprint
+    assert data.slice(0, 100).fingerprint == again[0:100].fingerprint
+
+    other = SyntheticProvider(seed=6).fetch_stock_daily("000001", date(2015, 1, 1), date(2020, 12, 31))
+    assert other.fingerprint != data.fingerprint
+
+
+def test_fingerprint_guards_against_mutation_and_copies(data):
+    fingerprint = data.fingerprint
+    with pytest.raises(ValueError):
+        data.close_prices[0] = 0.0
+    doubled = data.model_copy(update={"close_prices": data.close_prices * 2})
+    assert doubled.fingerprint != fingerprint
+    assert data.model_copy().fingerprint == fingerprint
+
+
+def test_features_are_computed_once_and_read_only(data, cache):
+    first = cache.get(data, "sma", window=20)
+    second = cache.get(data, "sma", window=20)
+    assert first is second
+    assert (cache.hits, cache.misses) == (1, 1)
+    with pytest.raises(ValueError):
+        first[0] = 1.0
+
+    upper_mid_lower = cache.get(data, "bollinger", window=20, num_std=2.0)
+    assert len(upper_mid_lower) == 3
+    with pytest.raises(ValueError):
+        cache.get(data, "unknown")
+
+
+def test_eviction_is_bounded_by_bytes(data):
+    cache = FeatureCache(max_bytes=len(data) * 8 * 2)
+    for window in (5, 10, 20):
+        cache.get(data, "sma", window=window)
+    assert len(cache) == 2
+    assert cache.nbytes <= cache.max_bytes
+
+    cache.get(data, "sma", window=20)
+    assert cache.hits == 1
+    cache.get(data, "sma", window=5)
+    assert cache.misses == 4
+
+
+def test_sweep_computes_each_window_once(data, cache):
+    results = run_sweep(
+        data,
+        "ma_cross",
+        {"short_window": [5, 10, 20], "long_window": [30, 60]},
+        max_workers=1
+    )
+    assert len(results) == 6
+    assert cache.misses == 5
+    assert cache.hits == 7
+
+    signals = MACrossStrategy(5, 30).generate_signals(data)
+    assert cache.misses == 5
+    assert np.all([signal.symbol == "000001" for signal in signals])
@@ -0,0 +1,92 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.strategy import indicators
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, 300)))
+    return close * 1.01, close * 0.99, close
+
+
+def as_array(values) -> np.ndarray:
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def test_batch_indicators_match_pandas(prices):
+    _, _, close = prices
+    series = pd.Series(close)
+    np.testing.assert_allclose(indicators.sma(close, 20), series.rolling(20).mean(), equal_nan=True)
+    np.testing.assert_allclose(indicators.ema(close, 12), series.ewm(span=12, adjust=False).mean())
+
+    mid, upper, lower = indicators.bollinger(close, 20, 2.0)
+    std = series.rolling(20).std(ddof=0)
+    np.testing.assert_allclose(upper, series.rolling(20).mean() + 2 * std, equal_nan=True)
+    np.testing.assert_allclose(lower, mid - 2 * std, equal_nan=True)
+
+    line, signal, hist = indicators.macd(close)
+    np.testing.assert_allclose(hist, line - signal)
+
+    delta = series.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = (-delta).where(delta < 0, 0)
+    expected = 100 - 100 / (1 + gain.rolling(14).mean() / loss.rolling(14).mean())
+    np.testing.assert_allclose(indicators.rsi(close, 14, "sma"), expected, equal_nan=True)
+
+
+def test_wilder_rsi_and_atr_warmup(prices):
+    high, low, close = prices
+    rsi = indicators.rsi(close, 14)
+    assert np.isnan(rsi[:14]).all() and not np.isnan(rsi[14:]).any()
+    assert ((rsi[14:] >= 0) & (rsi[14:] <= 100)).all()
+
+    atr = indicators.atr(high, low, close, 14)
+    assert np.isnan(atr[:13]).all()
+    assert atr[13] == pytest.approx(indicators.true_range(high, low, close)[:14].mean())
+
+    rising = indicators.rsi(np.arange(1.0, 31.0), 14)
+    assert rising[-1] == 100.0
+    with pytest.raises(ValueError):
+        indicators.rsi(close, 14, "ema")
+
+
+@pytest.mark.parametrize("make, batch, columns", [
+    (lambda: indicators.SMA(20), lambda h, l, c: indicators.sma(c, 20), 1),
+    (lambda: indicators.EMA(12), lambda h, l, c: indicators.ema(c, 12), 1),
+    (lambda: indicators.RSI(14), lambda h, l, c: indicators.rsi(c, 14), 1),
+    (lambda: indicators.RSI(14, "sma"), lambda h, l, c: indicators.rsi(c, 14, "sma"), 1),
+    (lambda: indicators.Bollinger(20), lambda h, l, c: np.column_stack(indicators.bollinger(c, 20)), 3),
+    (lambda: indicators.MACD(), lambda h, l, c: np.column_stack(indicators.macd(c)), 3),
+])
+def test_incremental_matches_batch_with_snapshot(prices, make, batch, columns):
+    high, low, close = prices
+    indicator = make()
+    values = [indicator.update(value) for value in close[:150]]
+
+    restored = make()
+    restored.restore(indicator.snapshot())
+    values += [restored.update(value) for value in close[150:]]
+
+    expected = batch(high, low, close)
+    if columns == 1:
+        actual = as_array(values)
+    else:
+        actual = np.array([value if value is not None else (np.nan,) * columns for value in values])
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_incremental_atr_matches_batch(prices):
+    high, low, close = prices
+    indicator = indicators.ATR(14)
+    values = as_array(indicator.update(h, l, c) for h, l, c in zip(high, low, close))
+    np.testing.assert_allclose(values, indicators.atr(high, low, close, 14), equal_nan=True)
+
+
+def test_snapshot_is_detached():
+    indicator = indicators.SMA(3)
+    indicator.update(1.0)
+    state = indicator.snapshot()
+    indicator.update(2.0)
+    assert state["_window_values"] == [1.0]
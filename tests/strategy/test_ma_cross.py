@@ -45,3 +45,30 @@ def test_ma_cross_insufficient_data():
     strategy = MACrossStrategy(short_window=5, long_window=20)
     signals = strategy.generate_signals(data)
     assert len(signals) == 0
+
+
+def test_ma_cross_on_bar_matches_batch_signals():
+    prices = [10.0] * 10 + [10.5] * 10 + [9.5] * 10 + [11.0] * 10
+    data = create_test_bars(prices)
+    batch = MACrossStrategy(short_window=5, long_window=10).generate_signals(data)
+
+    live_strategy = MACrossStrategy(short_window=5, long_window=10)
+    live = [signal for bar in data.bars[:25] if (signal := live_strategy.on_bar(bar))]
+    resumed = MACrossStrategy(short_window=5, long_window=10)
+    resumed.restore(live_strategy.snapshot())
+    live += [signal for bar in data.bars[25:] if (signal := resumed.on_bar(bar))]
+    assert live == batch
+
+
+def test_ma_cross_signal_arrays_are_stateless():
+    prices = [10.0] * 10 + [10.5] * 10 + [9.5] * 10 + [11.0] * 10
+    data = create_test_bars(prices)
+    strategy = MACrossStrategy(short_window=5, long_window=10)
+    arrays = strategy.generate_signal_arrays(data)
+    signals = strategy.generate_signals(data)
+
+    assert strategy.generate_signals(data) == signals
+    assert len(arrays) == len(signals)
+    assert arrays.directions.tolist() == [1 if s.signal_type.value == "buy" else -1 for s in signals]
+    assert [strategy.describe(arrays, k) for k in range(len(arrays))] == [s.reason for s in signals]
+    assert signals[0].reason.startswith("金叉")
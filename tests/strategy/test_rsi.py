@@ -53,3 +53,38 @@ def test_rsi_no_signal_in_stable_market():
     strategy = RSIStrategy(period=14, oversold=30, overbought=70)
     signals = strategy.generate_signals(data)
     assert len(signals) == 0
+
+
+def test_rsi_wilder_smoothing_and_on_bar():
+    prices = [10.0] * 20 + [8.0] * 5 + [10.0] * 10 + [12.0] * 5 + [10.0] * 10
+    data = create_test_bars(prices)
+    for smoothing in ("sma", "wilder"):
+        batch = RSIStrategy(period=14, smoothing=smoothing).generate_signals(data)
+        live_strategy = RSIStrategy(period=14, smoothing=smoothing)
+        live = [signal for bar in data.bars if (signal := live_strategy.on_bar(bar))]
+        assert live == batch
+        assert batch
+
+    assert not RSIStrategy(smoothing="ema").validate_params()
+
+
+def test_rsi_reasons_are_formatted_only_for_trades():
+    from src.core.engine import BacktestEngine
+
+    class CountingRSI(RSIStrategy):
+        described = 0
+
+        def describe(self, signals, position):
+            CountingRSI.described += 1
+            return super().describe(signals, position)
+
+    prices = ([10.0] * 20 + [8.0] * 5 + [10.0] * 10 + [12.0] * 5 + [10.0] * 10) * 3
+    data = create_test_bars(prices)
+    strategy = CountingRSI(period=14)
+    arrays = strategy.generate_signal_arrays(data)
+    assert CountingRSI.described == 0
+
+    result = BacktestEngine().run(data, strategy)
+    assert 0 < CountingRSI.described <= 2 * len(result.trades)
+    assert len(arrays) > len(result.trades)
+    assert "RSI超买死叉" in result.trades[0].reason